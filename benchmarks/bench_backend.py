@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+copyright (c) 2016-2017 Earth Advantage. All rights reserved.
+..codeauthor::Paul Munday <paul@paulmunday.net>
+
+Benchmarks comparing Record storage backends.
+
+Run with: python benchmarks/bench_backend.py
+"""
+# Imports from Standard Library
+import timeit
+
+# Imports from Third Party Modules
+
+# Local Imports
+from dubplate import Record
+
+# Constants
+RECORDS = 100000
+REPEAT = 3
+FIELDS = ('name', 'address', 'city', 'state', 'postal_code', 'score')
+
+
+class FrozenBuilding(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = FIELDS
+
+
+class NativeBuilding(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = FIELDS
+    record_backend = 'native'
+
+
+class TupleBuilding(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = FIELDS
+    record_backend = 'tuple'
+
+
+def make_rows(num):
+    """Return num rows as dicts"""
+    return [
+        dict(zip(FIELDS, (
+            'Building {}'.format(idx), '{} Main St'.format(idx), 'Portland',
+            'OR', '97201', idx % 100
+        )))
+        for idx in range(num)
+    ]
+
+
+def report(name, seconds, num):
+    """Print benchmark result"""
+    print('{:<40} {:>8.3f}s {:>12.0f} ops/s'.format(
+        name, seconds, num / seconds
+    ))
+
+
+def best_of(func):
+    """Return the best time for func over REPEAT runs"""
+    return min(timeit.repeat(func, number=1, repeat=REPEAT))
+
+
+def bench_backend(record_cls, rows):
+    """Benchmark construction, item access and iteration"""
+    name = record_cls.__name__
+    records = record_cls.from_rows(rows)
+
+    def construct():
+        return [record_cls(**row) for row in rows]
+
+    def getitem():
+        for record in records:
+            # pylint:disable=pointless-statement
+            record['name']
+            record['city']
+            record['score']
+
+    def iterate():
+        for record in records:
+            for _ in record.items():
+                pass
+
+    report('{} construction'.format(name), best_of(construct), len(rows))
+    report('{} 3 x getitem'.format(name), best_of(getitem), len(rows))
+    report('{} items()'.format(name), best_of(iterate), len(rows))
+
+
+def main():
+    """Run benchmarks"""
+    rows = make_rows(RECORDS)
+    for record_cls in (FrozenBuilding, NativeBuilding, TupleBuilding):
+        bench_backend(record_cls, rows)
+
+
+if __name__ == '__main__':
+    main()
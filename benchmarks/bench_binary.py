@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+copyright (c) 2016-2017 Earth Advantage. All rights reserved.
+..codeauthor::Paul Munday <paul@paulmunday.net>
+
+Benchmarks for binary serialization vs JSON.
+
+Run with: python benchmarks/bench_binary.py
+"""
+# Imports from Standard Library
+import datetime
+import io
+import timeit
+
+# Imports from Third Party Modules
+
+# Local Imports
+from dubplate import Record
+from dubplate.binary import dump_records, encode_record, load_records
+from dubplate.streaming import (
+    dump_records as dump_json, load_records as load_json
+)
+
+# Constants
+RECORDS = 20000
+REPEAT = 3
+
+
+class Building(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = (
+        'name', 'address', 'city', 'state', 'postal_code', 'score',
+        'created', 'year_built', 'floor_area', 'certified'
+    )
+
+
+def make_records(num):
+    """Return num Building records"""
+    created = datetime.datetime(2017, 1, 1, 12, 30, 15)
+    return [
+        Building(
+            name=u'Building {}'.format(idx),
+            address=u'{} Main St'.format(idx), city=u'Portland', state=u'OR',
+            postal_code=u'97201', score=idx % 100, created=created,
+            year_built=1990, floor_area=10000.5, certified=idx % 2 == 0
+        )
+        for idx in range(num)
+    ]
+
+
+def report(name, seconds, num):
+    """Print benchmark result"""
+    print('{:<40} {:>8.3f}s {:>12.0f} records/s'.format(
+        name, seconds, num / seconds
+    ))
+
+
+def best_of(func):
+    """Return the best time for func over REPEAT runs"""
+    return min(timeit.repeat(func, number=1, repeat=REPEAT))
+
+
+def bench_single(records):
+    """Compare encoding single records"""
+    json_size = sum(len(record.json().encode('utf-8')) for record in records)
+    binary_size = sum(len(encode_record(record)) for record in records)
+    print('{:<40} {:>9} bytes/record'.format(
+        'record.json() size', json_size // len(records)
+    ))
+    print('{:<40} {:>9} bytes/record'.format(
+        'encode_record size', binary_size // len(records)
+    ))
+    report('record.json()',
+           best_of(lambda: [record.json() for record in records]),
+           len(records))
+    report('encode_record',
+           best_of(lambda: [encode_record(record) for record in records]),
+           len(records))
+
+
+def bench_stream(records):
+    """Compare writing and reading streams of records"""
+    json_file = io.StringIO()
+    dump_json(records, json_file)
+    json_data = json_file.getvalue()
+    binary_file = io.BytesIO()
+    dump_records(records, binary_file)
+    binary_data = binary_file.getvalue()
+    print('{:<40} {:>9} bytes/record'.format(
+        'jsonl stream size', len(json_data.encode('utf-8')) // len(records)
+    ))
+    print('{:<40} {:>9} bytes/record'.format(
+        'binary stream size', len(binary_data) // len(records)
+    ))
+    report('jsonl dump',
+           best_of(lambda: dump_json(records, io.StringIO())), len(records))
+    report('binary dump',
+           best_of(lambda: dump_records(records, io.BytesIO())),
+           len(records))
+    report('jsonl load',
+           best_of(lambda: list(load_json(Building, io.StringIO(json_data)))),
+           len(records))
+    report('binary load',
+           best_of(
+               lambda: list(load_records(Building, io.BytesIO(binary_data)))
+           ),
+           len(records))
+
+
+def main():
+    """Run benchmarks"""
+    records = make_records(RECORDS)
+    bench_single(records)
+    bench_stream(records)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+copyright (c) 2016-2017 Earth Advantage. All rights reserved.
+..codeauthor::Paul Munday <paul@paulmunday.net>
+
+Benchmarks for generic vs generated (compile_record) constructors.
+
+Run with: python benchmarks/bench_codegen.py
+"""
+# Imports from Standard Library
+import timeit
+
+# Imports from Third Party Modules
+
+# Local Imports
+from dubplate import Record
+from dubplate.codegen import compile_record
+
+# Constants
+ROWS = 50000
+REPEAT = 3
+SMALL_FIELDS = ('name', 'address', 'city', 'state', 'postal_code', 'score')
+WIDE_FIELDS = tuple('field_{}'.format(idx) for idx in range(100))
+
+
+class Building(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    __slots__ = ['source']
+
+    def __init__(self, source, *args, **kwargs):
+        self.source = source
+        super(Building, self).__init__(*args, **kwargs)
+
+
+def make_classes(fields, backend):
+    """Return generic and compiled Building subclasses for fields"""
+    attrs = {
+        '__slots__': (), 'fields': fields, 'non_null_fields': fields[:2],
+        'record_backend': backend
+    }
+    generic = type('Generic', (Building,), dict(attrs))
+    compiled = compile_record(
+        type('Compiled', (Building,), dict(attrs)), replace_init=True
+    )
+    return generic, compiled
+
+
+def make_rows(fields, num):
+    """Return num rows as dicts"""
+    return [
+        {field: '{}'.format(idx) for field in fields} for idx in range(num)
+    ]
+
+
+def report(name, seconds, num):
+    """Print benchmark result"""
+    print('{:<40} {:>8.3f}s {:>12.0f} records/s'.format(
+        name, seconds, num / seconds
+    ))
+
+
+def best_of(func):
+    """Return the best time for func over REPEAT runs"""
+    return min(timeit.repeat(func, number=1, repeat=REPEAT))
+
+
+def bench_constructors(name, fields, backend):
+    """Compare generic and generated constructors"""
+    generic, compiled = make_classes(fields, backend)
+    rows = make_rows(fields, ROWS)
+
+    def generic_loop():
+        return [generic('api', **row) for row in rows]
+
+    def compiled_loop():
+        return [compiled('api', **row) for row in rows]
+
+    assert generic_loop() == compiled_loop()
+    report('{} {} generic'.format(name, backend), best_of(generic_loop),
+           len(rows))
+    report('{} {} generated'.format(name, backend), best_of(compiled_loop),
+           len(rows))
+
+
+def main():
+    """Run benchmarks"""
+    for backend in ('frozendict', 'native', 'tuple'):
+        bench_constructors('small', SMALL_FIELDS, backend)
+        bench_constructors('wide', WIDE_FIELDS, backend)
+
+
+if __name__ == '__main__':
+    main()
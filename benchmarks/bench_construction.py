@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+copyright (c) 2016-2017 Earth Advantage. All rights reserved.
+..codeauthor::Paul Munday <paul@paulmunday.net>
+
+Benchmarks for Record construction.
+
+Run with: python benchmarks/bench_construction.py
+"""
+# Imports from Standard Library
+import datetime
+import decimal
+import timeit
+
+# Imports from Third Party Modules
+
+# Local Imports
+from dubplate import Record
+
+# Constants
+ROWS = 100000
+REPEAT = 3
+
+
+class Building(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    __slots__ = ['source']
+    fields = ('name', 'address', 'city', 'state', 'postal_code', 'score')
+    non_null_fields = ('name', 'address')
+
+    def __init__(self, source, *args, **kwargs):
+        self.source = source
+        super(Building, self).__init__(*args, **kwargs)
+
+
+class SlotsBuilding(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    __slots__ = ['source', 'owner', 'fetched', 'version', 'batch']
+    fields = ('name', 'address', 'city', 'state', 'postal_code', 'score')
+    non_null_fields = ('name', 'address')
+
+    def __init__(self, source, owner, fetched, version, batch, *args,
+                 **kwargs):
+        # pylint:disable=too-many-arguments
+        self.source = source
+        self.owner = owner
+        self.fetched = fetched
+        self.version = version
+        self.batch = batch
+        super(SlotsBuilding, self).__init__(*args, **kwargs)
+
+
+class Sale(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = ('building', 'price', 'area', 'sold', 'units')
+    non_null_fields = ('building', 'price')
+
+
+class TypedSale(Sale):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    field_types = {
+        'price': decimal.Decimal, 'area': float, 'sold': datetime.date,
+        'units': int
+    }
+
+
+def make_rows(num):
+    """Return num rows as tuples in field order"""
+    return [
+        (
+            'Building {}'.format(idx), '{} Main St'.format(idx), 'Portland',
+            'OR', '97201', idx % 100
+        )
+        for idx in range(num)
+    ]
+
+
+def report(name, seconds, num):
+    """Print benchmark result"""
+    print('{:<40} {:>8.3f}s {:>12.0f} records/s'.format(
+        name, seconds, num / seconds
+    ))
+
+
+def best_of(func):
+    """Return the best time for func over REPEAT runs"""
+    return min(timeit.repeat(func, number=1, repeat=REPEAT))
+
+
+def bench_from_rows(rows):
+    """Compare a loop of constructors with from_rows"""
+    dicts = [dict(zip(Building.fields, row)) for row in rows]
+    attrs = {'source': 'api'}
+
+    def constructor_loop():
+        return [Building('api', **row) for row in dicts]
+
+    def from_rows_dicts():
+        return Building.from_rows(dicts, attrs=attrs)
+
+    def from_rows_tuples():
+        return Building.from_rows(rows, attrs=attrs)
+
+    report('Building(**row) loop', best_of(constructor_loop), len(rows))
+    report('Building.from_rows (dicts)', best_of(from_rows_dicts), len(rows))
+    report('Building.from_rows (tuples)', best_of(from_rows_tuples), len(rows))
+
+
+def bench_replace(rows):
+    """Compare copy_record with replace"""
+    records = Building.from_rows(rows, attrs={'source': 'api'})
+
+    def copy_record():
+        return [record.copy_record(score=1) for record in records]
+
+    def copy_record_new():
+        return [
+            Building(record.source, **record.copy_record(score=1))
+            for record in records
+        ]
+
+    def replace():
+        return [record.replace(score=1) for record in records]
+
+    report('record.copy_record(score=1)', best_of(copy_record), len(rows))
+    report('Building(**record.copy_record(score=1))',
+           best_of(copy_record_new), len(rows))
+    report('record.replace(score=1)', best_of(replace), len(rows))
+
+
+def bench_slots(rows):
+    """Compare __init__ with from_dict for a class with 5 slots"""
+    dicts = [dict(zip(SlotsBuilding.fields, row)) for row in rows]
+
+    def constructor_loop():
+        return [
+            SlotsBuilding('api', 'owner', 'today', 1, 2, **row)
+            for row in dicts
+        ]
+
+    def from_dict():
+        return [
+            SlotsBuilding.from_dict(
+                row, source='api', owner='owner', fetched='today',
+                version=1, batch=2
+            )
+            for row in dicts
+        ]
+
+    report('SlotsBuilding(5 attrs, **row) loop', best_of(constructor_loop),
+           len(rows))
+    report('SlotsBuilding.from_dict', best_of(from_dict), len(rows))
+
+
+def bench_coerce(num):
+    """
+    Compare coercing string values by hand before creating records,
+    with field_types.
+    """
+    rows = [
+        {
+            'building': 'Building {}'.format(idx),
+            'price': '{}.50'.format(100000 + idx), 'area': '1250.5',
+            'sold': '2017-06-{:02d}'.format(idx % 28 + 1),
+            'units': str(idx % 10)
+        }
+        for idx in range(num)
+    ]
+    columns = {field: [row[field] for row in rows] for field in Sale.fields}
+
+    def by_hand():
+        return [
+            Sale(
+                building=row['building'],
+                price=decimal.Decimal(row['price']),
+                area=float(row['area']),
+                sold=datetime.datetime.strptime(
+                    row['sold'], '%Y-%m-%d'
+                ).date(),
+                units=int(row['units'])
+            )
+            for row in rows
+        ]
+
+    def typed():
+        return [TypedSale(**row) for row in rows]
+
+    def from_rows():
+        return TypedSale.from_rows(rows)
+
+    def from_columns():
+        return TypedSale.from_columns(columns)
+
+    assert by_hand() == typed() == from_rows() == from_columns()
+    report('coerce by hand, Sale(**row)', best_of(by_hand), num)
+    report('TypedSale(**row)', best_of(typed), num)
+    report('TypedSale.from_rows(rows)', best_of(from_rows), num)
+    report('TypedSale.from_columns(columns)', best_of(from_columns), num)
+
+
+def main():
+    """Run benchmarks"""
+    rows = make_rows(ROWS)
+    bench_from_rows(rows)
+    bench_replace(rows)
+    bench_slots(rows)
+    bench_coerce(ROWS)
+
+
+if __name__ == '__main__':
+    main()
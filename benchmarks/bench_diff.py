@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+copyright (c) 2016-2017 Earth Advantage. All rights reserved.
+..codeauthor::Paul Munday <paul@paulmunday.net>
+
+Benchmarks for Record.diff.
+
+Run with: python benchmarks/bench_diff.py
+"""
+# Imports from Standard Library
+import timeit
+
+# Imports from Third Party Modules
+
+# Local Imports
+from dubplate import Record
+
+# Constants
+ROWS = 100000
+REPEAT = 3
+FIELDS = ('name', 'address', 'city', 'state', 'postal_code', 'score')
+
+
+class Building(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = FIELDS
+
+
+class NativeBuilding(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = FIELDS
+    record_backend = 'native'
+
+
+class TupleBuilding(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = FIELDS
+    record_backend = 'tuple'
+
+
+def make_rows(num):
+    """Return num rows as tuples in field order"""
+    return [
+        (
+            'Building {}'.format(idx), '{} Main St'.format(idx), 'Portland',
+            'OR', '97201', idx % 100
+        )
+        for idx in range(num)
+    ]
+
+
+def report(name, seconds, num):
+    """Print benchmark result"""
+    print('{:<40} {:>8.3f}s {:>12.0f} records/s'.format(
+        name, seconds, num / seconds
+    ))
+
+
+def best_of(func):
+    """Return the best time for func over REPEAT runs"""
+    return min(timeit.repeat(func, number=1, repeat=REPEAT))
+
+
+def bench_diff(record_cls, rows):
+    """
+    Compare finding changed fields by hand with diff, for pairs of
+    records where 1 in 10 has a changed score.
+    """
+    old = record_cls.from_rows(rows)
+    new = record_cls.from_rows(
+        row[:-1] + (-1,) if idx % 10 == 0 else row
+        for idx, row in enumerate(rows)
+    )
+    pairs = list(zip(old, new))
+
+    def compare():
+        return [
+            {
+                field: value for field, value in new_record.items()
+                if old_record[field] != value
+            }
+            for old_record, new_record in pairs if old_record != new_record
+        ]
+
+    def diff():
+        return [
+            old_record.diff(new_record) for old_record, new_record in pairs
+        ]
+
+    name = record_cls.__name__
+    report('{} == and compare fields'.format(name), best_of(compare),
+           len(pairs))
+    report('{} diff'.format(name), best_of(diff), len(pairs))
+
+
+def main():
+    """Run benchmarks"""
+    rows = make_rows(ROWS)
+    for record_cls in (Building, NativeBuilding, TupleBuilding):
+        bench_diff(record_cls, rows)
+
+
+if __name__ == '__main__':
+    main()
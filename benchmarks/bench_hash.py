@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+copyright (c) 2016-2017 Earth Advantage. All rights reserved.
+..codeauthor::Paul Munday <paul@paulmunday.net>
+
+Benchmarks for Record hashing.
+
+Run with: python benchmarks/bench_hash.py
+"""
+# Imports from Standard Library
+import timeit
+
+# Imports from Third Party Modules
+
+# Local Imports
+from dubplate import (
+    Record, generate_hash_index_key, generate_hash_index_keys
+)
+
+# Constants
+RECORDS = 1000000
+UNIQUE = 100000
+KEYS = 100000
+
+
+class Building(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = ('name', 'address', 'city', 'state', 'postal_code', 'score')
+
+
+def make_records(num, unique):
+    """Return num Building records, with unique distinct values"""
+    return Building.from_rows(
+        (
+            'Building {}'.format(idx % unique),
+            '{} Main St'.format(idx % unique), 'Portland', 'OR', '97201',
+            idx % 100
+        )
+        for idx in range(num)
+    )
+
+
+def report(name, seconds, num):
+    """Print benchmark result"""
+    print('{:<40} {:>8.3f}s {:>12.0f} records/s'.format(
+        name, seconds, num / seconds
+    ))
+
+
+def bench_dedupe(records):
+    """Deduplicate records using a set"""
+    def dedupe():
+        return set(records)
+
+    # first run computes and caches hashes
+    report('set(records) (hash not cached)', timeit.timeit(dedupe, number=1),
+           len(records))
+    report('set(records) (hash cached)', timeit.timeit(dedupe, number=1),
+           len(records))
+    assert len(dedupe()) == UNIQUE
+
+
+def bench_hash_index_keys(num):
+    """Compare generate_hash_index_key loop with generate_hash_index_keys"""
+    fields = Building.fields
+    rows = [
+        dict(zip(fields, row)) for row in make_records(num, num)
+    ]
+    columns = {field: [row[field] for row in rows] for field in fields}
+
+    def key_loop():
+        return [
+            generate_hash_index_key('Building', fields, row) for row in rows
+        ]
+
+    def batch_rows():
+        return generate_hash_index_keys('Building', fields, rows)
+
+    def batch_columns():
+        return generate_hash_index_keys('Building', fields, columns)
+
+    assert key_loop() == batch_rows() == batch_columns()
+    report('generate_hash_index_key loop', timeit.timeit(key_loop, number=1),
+           num)
+    report('generate_hash_index_keys (rows)',
+           timeit.timeit(batch_rows, number=1), num)
+    report('generate_hash_index_keys (columns)',
+           timeit.timeit(batch_columns, number=1), num)
+
+
+def main():
+    """Run benchmarks"""
+    records = make_records(RECORDS, UNIQUE)
+    bench_dedupe(records)
+    bench_hash_index_keys(KEYS)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+copyright (c) 2016-2017 Earth Advantage. All rights reserved.
+..codeauthor::Paul Munday <paul@paulmunday.net>
+
+Benchmarks for Record JSON serialization.
+
+Run with: python benchmarks/bench_json.py
+"""
+# Imports from Standard Library
+import datetime
+import json
+import timeit
+
+# Imports from Third Party Modules
+
+# Local Imports
+from dubplate import Record, RecordJSONEncoder
+
+# Constants
+RECORDS = 20000
+REPEAT = 3
+WIDE_FIELDS = tuple('field_{}'.format(idx) for idx in range(200))
+
+
+class Owner(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = ('name', 'since')
+    field_types = {'since': datetime.date}
+
+
+class Building(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = (
+        'name', 'address', 'city', 'state', 'postal_code', 'score',
+        'created', 'year_built', 'ratings', 'owner'
+    )
+    field_types = {'created': datetime.datetime, 'owner': Owner}
+
+
+class Flat(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = ('name', 'address', 'city', 'state', 'postal_code', 'score')
+
+
+class Wide(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = WIDE_FIELDS
+
+
+class WideDated(Wide):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    convert_fields = ('field_0',)
+
+
+class Nested(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = ('name', 'ratings', 'owner')
+
+
+def make_records(num):
+    """Return num Building records"""
+    created = datetime.datetime(2017, 1, 1, 12, 30, 15, 500)
+    since = datetime.date(2010, 6, 1)
+    return [
+        Building(
+            name='Building {}'.format(idx), address='{} Main St'.format(idx),
+            city='Portland', state='OR', postal_code='97201',
+            score=idx % 100, created=created, year_built=1990,
+            ratings=[{'year': 2016, 'score': 75}, {'year': 2017, 'score': 80}],
+            owner=Owner(name='Owner {}'.format(idx), since=since)
+        )
+        for idx in range(num)
+    ]
+
+
+def report(name, seconds, num):
+    """Print benchmark result"""
+    print('{:<40} {:>8.3f}s {:>12.0f} records/s'.format(
+        name, seconds, num / seconds
+    ))
+
+
+def best_of(func):
+    """Return the best time for func over REPEAT runs"""
+    return min(timeit.repeat(func, number=1, repeat=REPEAT))
+
+
+def bench_json(records):
+    """Compare RecordJSONEncoder with Record.json()"""
+    def record_json_encoder():
+        return [RecordJSONEncoder().encode(record) for record in records]
+
+    def record_json():
+        return [record.json() for record in records]
+
+    assert record_json_encoder() == record_json()
+    report('RecordJSONEncoder().encode(record)', best_of(record_json_encoder),
+           len(records))
+    report('record.json()', best_of(record_json), len(records))
+
+
+def bench_encoder(name, records):
+    """Time RecordJSONEncoder on records"""
+    def record_json_encoder():
+        encoder = RecordJSONEncoder()
+        return [encoder.encode(record) for record in records]
+
+    report(name, best_of(record_json_encoder), len(records))
+
+
+def bench_convert():
+    """Time RecordJSONEncoder on flat, wide and nested records"""
+    created = datetime.datetime(2017, 1, 1, 12, 30, 15, 500)
+    num = RECORDS // 4
+    bench_encoder('flat (6 fields)', [
+        Flat(name='Building {}'.format(idx), address='1 Main St',
+             city='Portland', state='OR', postal_code='97201', score=idx)
+        for idx in range(num)
+    ])
+    for record_cls in (Wide, WideDated):
+        bench_encoder('{} (200 fields, 1 datetime)'.format(
+            record_cls.__name__.lower()
+        ), [
+            record_cls(field_0=created, **{
+                field: idx for field in WIDE_FIELDS[1:]
+            })
+            for idx in range(num)
+        ])
+    bench_encoder('nested (records, lists & dicts)', [
+        Nested(
+            name='Building {}'.format(idx),
+            ratings=[{'year': 2016, 'score': 75, 'history': [1, 2, 3]}] * 5,
+            owner=Owner(name='Owner {}'.format(idx), since=None)
+        )
+        for idx in range(num)
+    ])
+
+
+def parse_building(data):
+    """Parse a Building by hand, walking the dict returned by json.loads"""
+    row = json.loads(data)
+    row['created'] = datetime.datetime.strptime(
+        row['created'], '%Y-%m-%dT%H:%M:%S'
+    )
+    owner = row['owner']
+    owner['since'] = datetime.datetime.strptime(
+        owner['since'], '%Y-%m-%d'
+    ).date()
+    row['owner'] = Owner(**owner)
+    return Building(**row)
+
+
+def bench_from_json(records):
+    """Compare parsing JSON by hand with from_json and the bulk methods"""
+    lines = [record.json() for record in records]
+    array = '[{}]'.format(', '.join(lines))
+
+    def by_hand():
+        return [parse_building(line) for line in lines]
+
+    def from_json():
+        return [Building.from_json(line) for line in lines]
+
+    def from_json_lines():
+        return Building.from_json_lines(lines)
+
+    def from_json_array():
+        return Building.from_json_array(array)
+
+    # N.B. json() drops microseconds, so records don't round trip exactly
+    expected = by_hand()
+    assert from_json() == from_json_lines() == from_json_array() == expected
+    report('json.loads, strptime & Building()', best_of(by_hand),
+           len(records))
+    report('Building.from_json(data)', best_of(from_json), len(records))
+    report('Building.from_json_lines(lines)', best_of(from_json_lines),
+           len(records))
+    report('Building.from_json_array(data)', best_of(from_json_array),
+           len(records))
+
+
+def main():
+    """Run benchmarks"""
+    records = make_records(RECORDS)
+    bench_json(records)
+    bench_convert()
+    bench_from_json(records)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+copyright (c) 2016-2017 Earth Advantage. All rights reserved.
+..codeauthor::Paul Munday <paul@paulmunday.net>
+
+Benchmarks for Record memory use, requires Python 3 (tracemalloc).
+
+Run with: python benchmarks/bench_memory.py
+"""
+# Imports from Standard Library
+import gc
+import tracemalloc
+
+# Imports from Third Party Modules
+
+# Local Imports
+from dubplate import INTERN_POOL, Record, RecordCache
+
+# Constants
+RECORDS = 100000
+FIELDS = ('name', 'address', 'city', 'state', 'postal_code', 'score')
+
+
+class FrozenBuilding(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = FIELDS
+
+
+class NativeBuilding(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = FIELDS
+    record_backend = 'native'
+
+
+class TupleBuilding(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = FIELDS
+    record_backend = 'tuple'
+
+
+class InternedBuilding(TupleBuilding):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    intern_fields = ('city', 'state', 'postal_code')
+
+
+class CachedBuilding(TupleBuilding):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    record_cache = RecordCache()
+
+
+CITIES = [
+    ('Portland', 'OR', '97201'), ('Salem', 'OR', '97301'),
+    ('Seattle', 'WA', '98101'), ('Boise', 'ID', '83701'),
+]
+
+
+def make_rows(num):
+    """Return num rows as tuples in field order"""
+    return [
+        (
+            'Building {}'.format(idx), '{} Main St'.format(idx), 'Portland',
+            'OR', '97201', idx % 100
+        )
+        for idx in range(num)
+    ]
+
+
+def parsed_rows(num):
+    """
+    Yield num rows where every value is a new object, as if parsed from
+    a file, with low cardinality city, state and postal_code.
+    """
+    for idx in range(num):
+        city, state, postal_code = CITIES[idx % len(CITIES)]
+        yield (
+            'Building {}'.format(idx), '{} Main St'.format(idx),
+            ''.join(list(city)), ''.join(list(state)),
+            ''.join(list(postal_code)), idx % 100
+        )
+
+
+def measure(func):
+    """Return (result, bytes allocated) by calling func"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        result = func()
+        gc.collect()
+        end = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, end - start
+
+
+def bench_memory(record_cls, rows):
+    """Report bytes per record, excluding the values themselves"""
+    records, size = measure(lambda: record_cls.from_rows(rows))
+    # exclude the list holding the records
+    size -= len(records) * 8
+    print('{:<40} {:>8.0f} bytes/record'.format(
+        record_cls.__name__, float(size) / len(records)
+    ))
+
+
+def bench_intern(record_cls):
+    """Report bytes per record, including values, for parsed rows"""
+    INTERN_POOL.clear()
+    records, size = measure(
+        lambda: record_cls.from_rows(parsed_rows(RECORDS))
+    )
+    size -= len(records) * 8
+    print('{:<40} {:>8.0f} bytes/record'.format(
+        record_cls.__name__ + ' (with values)',
+        float(size) / len(records)
+    ))
+
+
+def bench_cache(record_cls, rows):
+    """
+    Report bytes per record, creating records by calling the class
+    from rows with many duplicates.
+    """
+    dicts = [dict(zip(FIELDS, row)) for row in rows]
+    records, size = measure(lambda: [record_cls(**row) for row in dicts])
+    size -= len(records) * 8
+    print('{:<40} {:>8.0f} bytes/record'.format(
+        record_cls.__name__ + ' (duplicates)', float(size) / len(records)
+    ))
+
+
+def main():
+    """Run benchmarks"""
+    rows = make_rows(RECORDS)
+    for record_cls in (FrozenBuilding, NativeBuilding, TupleBuilding):
+        bench_memory(record_cls, rows)
+    for record_cls in (TupleBuilding, InternedBuilding):
+        bench_intern(record_cls)
+    print('InternedBuilding pool: {}'.format(INTERN_POOL))
+    # 1000 distinct records, each repeated 100 times
+    rows = make_rows(1000) * (RECORDS // 1000)
+    for record_cls in (TupleBuilding, CachedBuilding):
+        bench_cache(record_cls, rows)
+    print('CachedBuilding cache: {}'.format(CachedBuilding.record_cache))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+copyright (c) 2016-2017 Earth Advantage. All rights reserved.
+..codeauthor::Paul Munday <paul@paulmunday.net>
+
+Benchmarks for map_records.
+
+Run with: python benchmarks/bench_parallel.py
+"""
+# Imports from Standard Library
+import timeit
+
+# Imports from Third Party Modules
+
+# Local Imports
+from dubplate import Record
+from dubplate.parallel import _cpu_count, map_records
+
+# Constants
+RECORDS = 200000
+REPEAT = 3
+
+
+class Building(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    __slots__ = ['source']
+    fields = ('name', 'address', 'city', 'state', 'postal_code', 'score')
+    non_null_fields = ('name', 'address')
+    record_backend = 'tuple'
+
+
+def make_rows(num):
+    """Return num rows as tuples in field order"""
+    return [
+        (
+            'Building {}'.format(idx), '{} Main St'.format(idx), 'Portland',
+            'OR', '97201', idx % 100
+        )
+        for idx in range(num)
+    ]
+
+
+def enrich(record):
+    """Example enrichment, a little CPU work per record"""
+    score = sum(ord(char) for char in record['name'] * 20) % 100
+    return record.replace(score=score)
+
+
+def report(name, seconds, num):
+    """Print benchmark result"""
+    print('{:<40} {:>8.3f}s {:>12.0f} records/s'.format(
+        name, seconds, num / seconds
+    ))
+
+
+def best_of(func):
+    """Return the best time for func over REPEAT runs"""
+    return min(timeit.repeat(func, number=1, repeat=REPEAT))
+
+
+def main():
+    """Run benchmarks"""
+    records = Building.from_rows(make_rows(RECORDS), attrs={'source': 'api'})
+    print('{} CPUs'.format(_cpu_count()))
+    report('in process', best_of(lambda: [enrich(rec) for rec in records]),
+           len(records))
+    for workers in (2, 4):
+        report(
+            'map_records(workers={})'.format(workers),
+            best_of(lambda: map_records(enrich, records, workers=workers)),
+            len(records)
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+copyright (c) 2016-2017 Earth Advantage. All rights reserved.
+..codeauthor::Paul Munday <paul@paulmunday.net>
+
+Benchmarks for pickling records, and passing them through a process pool.
+
+Run with: python benchmarks/bench_pickle.py
+"""
+# Imports from Standard Library
+import multiprocessing
+import pickle
+import timeit
+
+# Imports from Third Party Modules
+
+# Local Imports
+from dubplate import Record
+
+# Constants
+RECORDS = 1000000
+REPEAT = 3
+WORKERS = 4
+CHUNKSIZE = 10000
+
+
+class Building(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    __slots__ = ['source']
+    fields = ('name', 'address', 'city', 'state', 'postal_code', 'score')
+    non_null_fields = ('name', 'address')
+
+
+class TupleBuilding(Building):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    record_backend = 'tuple'
+
+
+def make_rows(num):
+    """Return num rows as tuples in field order"""
+    return [
+        (
+            'Building {}'.format(idx), '{} Main St'.format(idx), 'Portland',
+            'OR', '97201', idx % 100
+        )
+        for idx in range(num)
+    ]
+
+
+def identity(obj):
+    """Return obj, used to round trip objects through a pool"""
+    return obj
+
+
+def report(name, seconds, num):
+    """Print benchmark result"""
+    print('{:<40} {:>8.3f}s {:>12.0f} records/s'.format(
+        name, seconds, num / seconds
+    ))
+
+
+def best_of(func):
+    """Return the best time for func over REPEAT runs"""
+    return min(timeit.repeat(func, number=1, repeat=REPEAT))
+
+
+def bench_pickle(name, objs):
+    """Time pickling and unpickling objs, and report the size"""
+    protocol = pickle.HIGHEST_PROTOCOL
+    data = pickle.dumps(objs, protocol)
+    print('{:<40} {:>9} bytes/record'.format(
+        name + ' size', len(data) // len(objs)
+    ))
+    report(name + ' dumps', best_of(lambda: pickle.dumps(objs, protocol)),
+           len(objs))
+    report(name + ' loads', best_of(lambda: pickle.loads(data)), len(objs))
+
+
+def bench_pool(name, objs, pool):
+    """Time a round trip of objs through pool"""
+    def round_trip():
+        return pool.map(identity, objs, chunksize=CHUNKSIZE)
+
+    assert round_trip() == objs
+    report(name + ' pool round trip', best_of(round_trip), len(objs))
+
+
+def main():
+    """Run benchmarks"""
+    rows = make_rows(RECORDS)
+    records = Building.from_rows(rows, attrs={'source': 'api'})
+    tuple_records = TupleBuilding.from_rows(rows, attrs={'source': 'api'})
+    dicts = [dict(zip(Building.fields, row)) for row in rows]
+    bench_pickle('tuples', rows)
+    bench_pickle('dicts', dicts)
+    bench_pickle('Building', records)
+    bench_pickle('TupleBuilding', tuple_records)
+    pool = multiprocessing.Pool(WORKERS)
+    try:
+        bench_pool('tuples', rows, pool)
+        bench_pool('dicts', dicts, pool)
+        bench_pool('Building', records, pool)
+        bench_pool('TupleBuilding', tuple_records, pool)
+    finally:
+        pool.close()
+        pool.join()
+
+
+if __name__ == '__main__':
+    main()
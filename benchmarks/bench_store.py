@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+copyright (c) 2016-2017 Earth Advantage. All rights reserved.
+..codeauthor::Paul Munday <paul@paulmunday.net>
+
+Benchmarks for RecordStore vs loading records from JSON lines.
+
+Run with: python benchmarks/bench_store.py
+"""
+# Imports from Standard Library
+import datetime
+import io
+import os
+import random
+import shutil
+import tempfile
+import timeit
+
+# Imports from Third Party Modules
+
+# Local Imports
+from dubplate import Record
+from dubplate.store import RecordStore, write_store
+from dubplate.streaming import dump_records, load_records
+
+# Constants
+RECORDS = 200000
+LOOKUPS = 10000
+REPEAT = 3
+
+
+class Building(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = (
+        'name', 'address', 'city', 'state', 'postal_code', 'score',
+        'created', 'year_built'
+    )
+    record_backend = 'tuple'
+
+
+def make_records(num):
+    """Return num Building records"""
+    created = datetime.datetime(2017, 1, 1, 12, 30, 15)
+    return Building.from_rows(
+        (
+            u'Building {}'.format(idx), u'{} Main St'.format(idx),
+            u'Portland', u'OR', u'97201', idx % 100, created, 1990
+        )
+        for idx in range(num)
+    )
+
+
+def report(name, seconds):
+    """Print benchmark result"""
+    print('{:<40} {:>10.6f}s'.format(name, seconds))
+
+
+def best_of(func):
+    """Return the best time for func over REPEAT runs"""
+    return min(timeit.repeat(func, number=1, repeat=REPEAT))
+
+
+def main():
+    """Run benchmarks"""
+    records = make_records(RECORDS)
+    tmpdir = tempfile.mkdtemp()
+    try:
+        json_path = os.path.join(tmpdir, 'buildings.jsonl')
+        store_path = os.path.join(tmpdir, 'buildings.dub')
+        with io.open(json_path, 'w', encoding='utf-8') as fileobj:
+            dump_records(records, fileobj)
+        write_store(records, store_path)
+        print('{} records, jsonl {} bytes, store {} bytes'.format(
+            RECORDS, os.path.getsize(json_path), os.path.getsize(store_path)
+        ))
+        indexes = [random.randrange(RECORDS) for _ in range(LOOKUPS)]
+
+        def load_json():
+            with io.open(json_path, encoding='utf-8') as fileobj:
+                return list(load_records(Building, fileobj))
+
+        def open_store():
+            RecordStore(Building, store_path).close()
+
+        def store_lookups():
+            with RecordStore(Building, store_path) as store:
+                return [store[idx] for idx in indexes]
+
+        def store_iterate():
+            with RecordStore(Building, store_path) as store:
+                return list(store)
+
+        report('load all records from jsonl', best_of(load_json))
+        report('open store', best_of(open_store))
+        report('open store + {} lookups'.format(LOOKUPS),
+               best_of(store_lookups))
+        report('open store + iterate all', best_of(store_iterate))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
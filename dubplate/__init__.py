@@ -7,12 +7,23 @@ copyright (c) 2016 Earth Advantage. All rights reserved.
 
 # Imports from Standard Library
 try:
-    from typing import Sequence, Mapping, Optional
+    from typing import Any, List, Sequence, Mapping, Optional
 except ImportError:
     pass
 
 import datetime
+import decimal
+import itertools
 import json
+import operator
+import sys
+from collections import OrderedDict
+from functools import reduce
+
+try:
+    from collections.abc import KeysView, Sequence as SequenceABC
+except ImportError:
+    from collections import KeysView, Sequence as SequenceABC
 
 # Imports from Third Party Modules
 from frozendict import FrozenOrderedDict, frozendict
@@ -20,6 +31,54 @@ from frozendict import FrozenOrderedDict, frozendict
 # Local Imports
 
 # Constants
+# the type of an unset __slots__ member accessed via the class,
+# see empty_slot below
+_member_descriptor = type(
+    type('_Slotted', (object,), {'__slots__': ['slot']}).slot
+)
+RECORD_BACKENDS = ('frozendict', 'native', 'tuple')
+# slots used internally by Record, rather than to store attributes
+_INTERNAL_SLOTS = frozenset(
+    ['_initialized', '_Record__record', '_hash', '_hash_index_key']
+)
+# sentinel for missing keys, where None is a valid value
+_MISSING = object()
+# default maximum number of values in the shared InternPool
+INTERN_POOL_SIZE = 100000
+# default maximum number of records in a RecordCache
+RECORD_CACHE_SIZE = 10000
+# dicts preserve insertion order from Python 3.7
+_ORDERED_DICT_BASE = dict if sys.version_info >= (3, 7) else OrderedDict
+# common types usable in hash index keys, checked before (slow) isinstance
+# N.B. type(2 ** 64) is long on Python 2
+_ORDERED_TYPES = frozenset(
+    [type(b''), type(u''), int, type(2 ** 64), bool, tuple, list]
+)
+# strings accepted for bool field_types
+_BOOLEAN_STRINGS = {
+    'true': True, 'false': False, '1': True, '0': False,
+    'yes': True, 'no': False
+}
+# field_types whose columns can be coerced with map(), these raise
+# TypeError for None (unlike str) so None values fall back to coerce
+_COLUMN_TYPES = frozenset([int, type(2 ** 64), float, decimal.Decimal])
+# integer field_types, and the types int() truncates for them
+_INTEGER_TYPES = frozenset([int, type(2 ** 64)])
+_TRUNCATED_TYPES = (float, decimal.Decimal)
+# field_types for which subclasses (bool, datetime) are converted
+# rather than used as they are
+_EXACT_TYPES = frozenset([int, type(2 ** 64), datetime.date])
+# types map() mishandles for _COLUMN_TYPES, coerced value by value:
+# int() truncates floats and Decimal(float) is inexact
+_COLUMN_FALLBACK_TYPES = {
+    int: frozenset(_TRUNCATED_TYPES),
+    type(2 ** 64): frozenset(_TRUNCATED_TYPES),
+    decimal.Decimal: frozenset([float]),
+}
+# scalar types that never need converting to JSON
+_PLAIN_TYPES = frozenset(
+    [type(b''), type(u''), int, type(2 ** 64), float, bool, type(None)]
+)
 
 
 # Private Functions
@@ -32,26 +91,343 @@ def _convert_datetime(val):
     return val
 
 
+def _convert_value(val):
+    """
+    Convert date/times to string in val, recursing into lists, tuples,
+    dicts and records. Returns val itself if there is nothing to convert.
+    """
+    if type(val) in _PLAIN_TYPES:
+        return val
+    elif isinstance(val, (list, tuple)):
+        return _convert_list_datetime(val)
+    elif isinstance(val, dict):
+        return _convert_dict_datetime(val)
+    elif isinstance(val, Record):
+        return _convert_record(val)
+    return _convert_datetime(val)
+
+
 def _convert_list_datetime(lst):
-    """Convert  date/times to string in a list"""
-    return [_convert_datetime(val) for val in lst]
-
-
-def _convert_dict_datetime(inputdict):
-    """Recursively convert  dat/times to string in a dict-like"""
-    rdict = dict()
-    for key, val in inputdict.items():
-        if isinstance(val, list):
-            rdict[key] = _convert_list_datetime(val)
-        elif isinstance(val, tuple):
-            rdict[key] = _convert_list_datetime(list(val))
-        elif isinstance(val, dict):
-            rdict[key] = _convert_dict_datetime(val)
-        elif isinstance(val, Record):
-            rdict[key] = _convert_dict_datetime(val.copy_record())
+    """
+    Convert date/times to string in a list (or tuple).
+
+    Returns lst itself if there is nothing to convert, otherwise a new list.
+    """
+    for idx, val in enumerate(lst):
+        if type(val) in _PLAIN_TYPES:
+            continue
+        converted = _convert_value(val)
+        if converted is not val:
+            rlist = list(lst[:idx])
+            rlist.append(converted)
+            rlist.extend(_convert_value(item) for item in lst[idx + 1:])
+            return rlist
+    return lst
+
+
+def _convert_dict_datetime(inputdict, keys=None):
+    """
+    Recursively convert date/times to string in a dict-like.
+
+    Only the values of keys are checked, if supplied. Returns inputdict
+    itself if there is nothing to convert, otherwise a new dict.
+    """
+    if keys is None:
+        items = inputdict.items()
+    else:
+        items = ((key, inputdict[key]) for key in keys if key in inputdict)
+    rdict = None
+    for key, val in items:
+        if type(val) in _PLAIN_TYPES:
+            continue
+        converted = _convert_value(val)
+        if converted is not val:
+            if rdict is None:
+                rdict = dict(inputdict)
+            rdict[key] = converted
+    return inputdict if rdict is None else rdict
+
+
+def _convert_record(record):
+    """
+    Return record data as a dict with date/times converted to string.
+
+    Only convert_fields are checked if the class defines them. The record
+    is not copied, or revalidated, so the dict returned may be the
+    underlying record data and must not be altered.
+    """
+    # pylint:disable=protected-access
+    return _convert_dict_datetime(
+        record._as_dict(), record._schema.convert_fields
+    )
+
+
+def _strptime_datetime(val):
+    """
+    Parse an ISO 8601 datetime string, as output by json(), including
+    a +HH:MM or -HH:MM UTC offset, as output for timezone aware datetimes.
+    """
+    tzinfo = None
+    if len(val) > 19 and val[-6] in '+-' and val[-3] == ':':
+        offset = datetime.timedelta(
+            hours=int(val[-5:-3]), minutes=int(val[-2:])
+        )
+        tzinfo = _timezone(-offset if val[-6] == '-' else offset)
+        val = val[:-6]
+    if len(val) == 10:
+        fmt = '%Y-%m-%d'
+    elif '.' in val:
+        fmt = '%Y-%m-%dT%H:%M:%S.%f'
+    else:
+        fmt = '%Y-%m-%dT%H:%M:%S'
+    parsed = datetime.datetime.strptime(val, fmt)
+    return parsed if tzinfo is None else parsed.replace(tzinfo=tzinfo)
+
+
+def _strptime_date(val):
+    """Parse an ISO 8601 date string, as output by json()"""
+    return datetime.datetime.strptime(val, '%Y-%m-%d').date()
+
+
+# use the (much faster) C parsers where available, i.e. Python 3.7+
+# pylint:disable=invalid-name,no-member
+if hasattr(datetime.datetime, 'fromisoformat'):
+    _parse_datetime = datetime.datetime.fromisoformat
+    _parse_date = datetime.date.fromisoformat
+else:
+    _parse_datetime = _strptime_datetime
+    _parse_date = _strptime_date
+# pylint:enable=invalid-name,no-member
+
+
+def _parse_bool(val):
+    """Parse a bool from a string (e.g. 'true', '0') or a number"""
+    if val == 0 or val == 1:
+        return bool(val)
+    try:
+        return _BOOLEAN_STRINGS[val.strip().lower()]
+    except (AttributeError, KeyError):
+        raise ValueError("Not a boolean: {!r}".format(val))
+
+
+def _integer_converter(field_type):
+    """
+    Return a function that converts a value to field_type (an integer
+    type), raising ValueError rather than truncating non-integral numbers.
+    """
+    def convert(val):
+        """Convert val to an integer"""
+        result = field_type(val)
+        if isinstance(val, _TRUNCATED_TYPES) and result != val:
+            raise ValueError("Not an integer: {!r}".format(val))
+        return result
+    return convert
+
+
+def _to_decimal(val):
+    """
+    Convert val to Decimal, floats via their repr, so 19.99 is
+    Decimal('19.99') rather than the exact binary value of the float.
+    """
+    if isinstance(val, float):
+        val = repr(val)
+    return decimal.Decimal(val)
+
+
+def _to_date(val):
+    """Convert val (a datetime or ISO 8601 string) to a date"""
+    if isinstance(val, datetime.datetime):
+        return val.date()
+    return _parse_date(val)
+
+
+def _coercer(field, field_type):
+    """
+    Return a function that coerces a value of field to field_type,
+    raising KeyError if it can't be.
+
+    Raises TypeError if field_type is not a type, or a list containing
+    a single type.
+    """
+    if isinstance(field_type, list):
+        if len(field_type) != 1:
+            raise TypeError(
+                "List field types must contain a single type: {}".format(
+                    field_type
+                )
+            )
+        coerce_item = _coercer(field, field_type[0])
+
+        def coerce_list(val):
+            """Coerce each item in a list"""
+            if val is None:
+                return None
+            if not isinstance(val, (list, tuple)):
+                raise _field_type_error(field, field_type, val)
+            return [coerce_item(item) for item in val]
+        return coerce_list
+    if not isinstance(field_type, type):
+        raise TypeError(
+            "field_types must map fields to types, or a list containing a "
+            "single type, not {!r} (for {})".format(field_type, field)
+        )
+    if isinstance(field_type, RecordMeta):
+        def convert(val):
+            """Create a nested record from a dict-like"""
+            if not hasattr(val, 'items'):
+                raise TypeError("Not a dict-like")
+            return field_type.from_dict(val)
+    elif field_type is datetime.datetime:
+        convert = _parse_datetime
+    elif field_type is datetime.date:
+        convert = _to_date
+    elif field_type is bool:
+        convert = _parse_bool
+    elif field_type in _INTEGER_TYPES:
+        convert = _integer_converter(field_type)
+    elif field_type is decimal.Decimal:
+        convert = _to_decimal
+    else:
+        convert = field_type
+
+    if field_type in _EXACT_TYPES:
+        def coerce(val):
+            """Coerce val unless it is None or exactly field_type"""
+            # pylint:disable=unidiomatic-typecheck
+            if val is None or type(val) is field_type:
+                return val
+            try:
+                return convert(val)
+            except (TypeError, ValueError, ArithmeticError):
+                raise _field_type_error(field, field_type, val)
+    else:
+        def coerce(val):
+            """Coerce val unless it is None or already of field_type"""
+            if val is None or isinstance(val, field_type):
+                return val
+            try:
+                return convert(val)
+            except (TypeError, ValueError, ArithmeticError):
+                raise _field_type_error(field, field_type, val)
+    return coerce
+
+
+def _column_coercer(field_type, coerce):
+    """
+    Return a function that coerces a column (sequence) of values, using
+    map with field_type directly where possible, so the loop runs in C.
+    """
+    if isinstance(field_type, type) and field_type in _COLUMN_TYPES:
+        fallback_types = _COLUMN_FALLBACK_TYPES.get(field_type)
+
+        def coerce_column(column):
+            """Coerce a column, value by value if there are None values"""
+            if fallback_types and not fallback_types.isdisjoint(
+                    map(type, column)):
+                return [coerce(val) for val in column]
+            try:
+                return list(map(field_type, column))
+            except (TypeError, ValueError, ArithmeticError):
+                return [coerce(val) for val in column]
+    else:
+        def coerce_column(column):
+            """Coerce a column value by value"""
+            return [coerce(val) for val in column]
+    return coerce_column
+
+
+def _json_object(value):
+    """Return value, raise TypeError if it is not a decoded JSON object"""
+    if not isinstance(value, dict):
+        raise TypeError(
+            "Expected a JSON object, got {}".format(type(value).__name__)
+        )
+    return value
+
+
+def _collect_records(records):
+    """
+    Return a list of the records yielded by Record._iter_rows. If any
+    rows fail validation the records created from the valid rows are
+    attached to the BatchValidationError, rather than being discarded.
+    """
+    collected = []
+    append = collected.append
+    try:
+        for record in records:
+            append(record)
+    except BatchValidationError as err:
+        err.records = collected
+        raise
+    return collected
+
+
+def _is_ordered(value):
+    """Can value be used in a hash index key?"""
+    return (
+        type(value) in _ORDERED_TYPES or
+        isinstance(value, (SequenceABC, int))
+    )
+
+
+def _null_fields_error(null_fields):
+    """Return KeyError for non-null fields set to None"""
+    msg = "The following field{} can not be None: {}".format(
+        's' if len(null_fields) > 1 else '',
+        ", ".join(null_fields)
+    )
+    return KeyError(msg)
+
+
+def _extra_keys_error(extra, fields):
+    """Return KeyError for keys not in fields"""
+    msg = (
+        "Extra keys: {}. Only the following keys can "
+        "be used in the record: {}".format(
+            ", ".join(extra), ", ".join(fields)
+        )
+    )
+    return KeyError(msg)
+
+
+def _field_type_error(field, field_type, value):
+    """Return KeyError for a value that can not be coerced to field_type"""
+    msg = "Field {} can not be converted to {}: {!r}".format(
+        field, getattr(field_type, '__name__', field_type), value
+    )
+    return KeyError(msg)
+
+
+def _unordered_value_error(field):
+    """Return ValueError for a field with an unordered value"""
+    msg = (
+        "Fields that return unordered value types cannot be used "
+        "to create hash keys. field: {}".format(field)
+    )
+    return ValueError(msg)
+
+
+def _hash_index_key_parts(field, column):
+    """
+    Return a list containing 'field:value' for each value in column,
+    or None if it is null.
+    """
+    prefix = '{}:'.format(field)
+    template = prefix.replace('{', '{{').replace('}', '}}') + '{}'
+    text_type = type(u'')
+    ordered_types = _ORDERED_TYPES
+    parts = []
+    append = parts.append
+    for value in column:
+        if not value:
+            append(None)
+        elif type(value) is text_type:
+            append(prefix + value)
+        elif type(value) in ordered_types or _is_ordered(value):
+            append(template.format(value))
         else:
-            rdict[key] = _convert_datetime(val)
-    return rdict
+            raise _unordered_value_error(field)
+    return parts
 
 
 # Public Classes
@@ -86,12 +462,8 @@ def generate_hash_index_key(obj_type, fields, values_dict, obj_id=None):
             value = values_dict.get(field)
             if not value:
                 continue
-            elif not isinstance(value, (Sequence, int)):
-                msg = (
-                    "Fields that return unordered value types cannot be used "
-                    "to create hash keys. field: {}".format(field)
-                )
-                raise ValueError(msg)
+            elif not _is_ordered(value):
+                raise _unordered_value_error(field)
             else:
                 field_values.append('{}:{}'.format(field, value))
         if field_values:
@@ -100,20 +472,1067 @@ def generate_hash_index_key(obj_type, fields, values_dict, obj_id=None):
     return hash_index_key
 
 
+def generate_hash_index_keys(obj_type, fields, values, obj_ids=None):
+    # type: (str, Sequence[str], Any, Optional[Sequence[int]]) -> List[str]
+    """Generate keys suitable for use in hash indexes in bulk.
+
+    Equivalent to calling generate_hash_index_key for each set of values,
+    but the values are processed a field (column) at a time.
+
+    values can be either a sequence of dict like objects, one per key, or
+    a 'columnar' dict like object mapping field names to sequences of values,
+    one per key, e.g. {'field1': [value1, value2], 'field2': [...]}.
+    Columns that are present and not empty must all be the same length.
+
+    :param obj_type: str name representing object to be hashed (ie class name)
+    :type obj_type: str
+    :param fields: sequence of field names to be used in key string
+    :type fields: Sequence
+    :param values: dict like objects or dict of sequences
+    :type values: Sequence or Mapping
+    :param obj_ids: optional. sequence of ints representing id numbers of
+        relevant objects, one per key
+    :type obj_ids: Sequence
+    :return: list of hash key suitable strings (or None)
+    :rtype: list
+    """
+    if hasattr(values, 'keys'):
+        columns = [values.get(field) for field in fields]
+        lengths = set(len(column) for column in columns if column)
+        if len(lengths) > 1:
+            raise ValueError("Columns must all be the same length")
+        num = lengths.pop() if lengths else 0
+        columns = [column or [None] * num for column in columns]
+    else:
+        values = list(values)
+        num = len(values)
+        columns = [
+            [row.get(field) if row else None for row in values]
+            for field in fields
+        ]
+    obj_type = '{}'.format(obj_type)
+    if obj_ids is None:
+        obj_strs = [obj_type] * num
+    else:
+        if len(obj_ids) != num:
+            raise ValueError(
+                "Expected {} obj_ids, got {}".format(num, len(obj_ids))
+            )
+        obj_strs = [
+            '{}:{}'.format(obj_type, obj_id) if obj_id else obj_type
+            for obj_id in obj_ids
+        ]
+    if not fields:
+        return [None] * num
+    part_columns = [
+        _hash_index_key_parts(field, column)
+        for field, column in zip(fields, columns)
+    ]
+    hash_index_keys = []
+    append = hash_index_keys.append
+    for obj_str, parts in zip(obj_strs, zip(*part_columns)):
+        if None in parts:
+            parts = [part for part in parts if part is not None]
+        if parts:
+            append(obj_str + ':' + ':'.join(parts))
+        else:
+            append(None)
+    return hash_index_keys
+
+
+class BatchValidationError(KeyError):
+    """
+    Raised when one or more rows in a batch fail validation.
+
+    errors maps the index of each failing row to the KeyError raised for it.
+    records is a list of the records created from the rows that passed,
+    in order, or None if they have already been yielded (i.e. lazy=True).
+    """
+
+    def __init__(self, errors, records=None):
+        self.errors = errors
+        self.records = records
+        msg = "Validation failed for row{}: {}".format(
+            's' if len(errors) > 1 else '',
+            ", ".join(str(idx) for idx in sorted(errors))
+        )
+        super(BatchValidationError, self).__init__(msg)
+
+
+class ImmutableDict(_ORDERED_DICT_BASE):
+    """
+    An immutable, insertion ordered, dict.
+
+    Used to store record data when a Record subclass sets
+    record_backend = 'native'. Unlike frozendict this is a dict (on Python
+    versions before 3.7 an OrderedDict) so lookups, iteration and views
+    need no extra wrapper layer. Methods that would mutate it raise
+    TypeError.
+
+    Hashes the same way as frozendict, so equal records hash the same
+    whichever backend they use.
+    """
+    __slots__ = ['_hash']
+
+    if _ORDERED_DICT_BASE is not dict:
+        def __init__(self, *args, **kwargs):
+            # OrderedDict.__init__ populates the dict using __setitem__
+            _ORDERED_DICT_BASE.__init__(self)
+            setitem = _ORDERED_DICT_BASE.__setitem__
+            for key, value in _ORDERED_DICT_BASE(*args, **kwargs).items():
+                setitem(self, key, value)
+
+    def _immutable(self, *args, **kwargs):
+        """Prevent mutation"""
+        msg = "'{}' object does not support mutation".format(
+            self.__class__.__name__
+        )
+        raise TypeError(msg)
+
+    def __setitem__(self, name, value):
+        """Prevent setting of items"""
+        msg = "'{}' object does not support item assignment".format(
+            self.__class__.__name__
+        )
+        raise TypeError(msg)
+
+    def __delitem__(self, name):
+        """Prevent deleting of items"""
+        msg = "'{}' object does not support item deletion".format(
+            self.__class__.__name__
+        )
+        raise TypeError(msg)
+
+    clear = pop = popitem = setdefault = update = __ior__ = _immutable
+
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = reduce(operator.xor, map(hash, self.items()), 0)
+            return self._hash
+
+    def __reduce__(self):
+        return (self.__class__, (_ORDERED_DICT_BASE(self),))
+
+    @classmethod
+    def fromkeys(cls, keys, value=None):
+        return cls(_ORDERED_DICT_BASE.fromkeys(keys, value))
+
+    def copy(self, **add_or_replace):
+        """Return a copy, updated with values from add_or_replace"""
+        return self.__class__(self, **add_or_replace)
+
+
+def _record_tuple(fields, values):
+    """Recreate a RecordTuple, used for pickling"""
+    return RecordTuple.for_fields(fields)._make(values)
+
+
+class RecordTuple(tuple):
+    """
+    A compact, immutable, mapping stored as a tuple of values.
+
+    Used to store record data when a Record subclass with fields sets
+    record_backend = 'tuple'. Like namedtuple, a subclass is created for
+    each set of fields (see for_fields), holding the fields and a
+    field -> position map, so instances need no more memory than a tuple.
+
+    It behaves as a mapping, not a sequence: iterating over it returns the
+    fields, and values are accessed by field name. keys() returns a
+    KeysView, values() and items() return tuples. As it is still a tuple,
+    copies handed out by Record.copy_record are ImmutableDicts instead.
+
+    Hashes the same way as frozendict, so equal records hash the same
+    whichever backend they use.
+    """
+    __slots__ = ()
+    _fields = ()
+    _index = {}
+
+    def __new__(cls, *args, **kwargs):
+        """Create from a mapping or (field, value) pairs, like dict"""
+        values = dict(*args, **kwargs)
+        extra = set(values) - set(cls._fields)
+        if extra:
+            raise KeyError(
+                "Extra keys: {}".format(", ".join(sorted(extra)))
+            )
+        return tuple.__new__(
+            cls, [values.get(field) for field in cls._fields]
+        )
+
+    @classmethod
+    def _make(cls, values):
+        """Create from a sequence of values in the order of fields"""
+        return tuple.__new__(cls, values)
+
+    @classmethod
+    def for_fields(cls, fields):
+        """Return the RecordTuple subclass for fields"""
+        fields = tuple(fields)
+        try:
+            return _RECORD_TUPLE_CLASSES[fields]
+        except KeyError:
+            tuple_cls = type(cls.__name__, (cls,), {
+                '__slots__': (),
+                '_fields': fields,
+                '_index': {field: idx for idx, field in enumerate(fields)},
+            })
+            _RECORD_TUPLE_CLASSES[fields] = tuple_cls
+            return tuple_cls
+
+    @property
+    def _dict(self):
+        """Return a new dict (ordered by fields) of the data"""
+        return _ORDERED_DICT_BASE(zip(self._fields, tuple.__iter__(self)))
+
+    def __getitem__(self, key):
+        return tuple.__getitem__(self, self._index[key])
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __eq__(self, other):
+        if type(other) is type(self):
+            return tuple.__eq__(self, other)
+        elif hasattr(other, 'items'):
+            return dict(self.items()) == dict(other.items())
+        # not a mapping, so never equal, even to a tuple of the same values
+        return False
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        return reduce(operator.xor, map(hash, self.items()), 0)
+
+    def __reduce__(self):
+        return (_record_tuple, (self._fields, tuple(tuple.__iter__(self))))
+
+    def __repr__(self):
+        return '<{} {!r}>'.format(self.__class__.__name__, self._dict)
+
+    def get(self, key, default=None):
+        """Return value for key if key is present, else default"""
+        index = self._index.get(key)
+        return default if index is None else tuple.__getitem__(self, index)
+
+    def keys(self):
+        """Return a view of the fields, as with dict.keys()"""
+        return KeysView(self)
+
+    def values(self):
+        """Return values"""
+        return tuple(tuple.__iter__(self))
+
+    def items(self):
+        """Return (field, value) pairs"""
+        return tuple(zip(self._fields, tuple.__iter__(self)))
+
+    def copy(self, **add_or_replace):
+        """Return a copy, as a dict, updated with values from add_or_replace"""
+        copy = self._dict
+        copy.update(add_or_replace)
+        return copy
+
+
+# RecordTuple subclasses, by fields
+_RECORD_TUPLE_CLASSES = {}
+
+
+def _attr_slots(record_cls):
+    """
+    Return member descriptors for slots, on record_cls and its parents,
+    used to store attributes (rather than internally by Record).
+    """
+    descriptors = []
+    for klass in record_cls.__mro__:
+        slots = klass.__dict__.get('__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            if name.startswith('__') and not name.endswith('__'):
+                name = '_{}{}'.format(klass.__name__.lstrip('_'), name)
+            if name in _INTERNAL_SLOTS:
+                continue
+            descriptor = klass.__dict__.get(name)
+            # slots overridden by class variables (e.g. fields) can't be set
+            if (isinstance(descriptor, _member_descriptor) and
+                    getattr(record_cls, name, None) is descriptor):
+                descriptors.append(descriptor)
+    return tuple(descriptors)
+
+
+class InternPool(object):
+    """
+    A size bounded pool of values, used to intern (deduplicate) values.
+
+    intern(value) returns an equal value from the pool, if there is one,
+    so values that are repeated across many records are only stored once.
+    Once the pool holds maxsize values new values are no longer added.
+    Values are pooled by type and value, so e.g. 1 and True are distinct.
+    Unhashable values are returned unchanged.
+
+    hits and misses count the number of values that were, and were not,
+    found in the pool.
+    """
+
+    def __init__(self, maxsize=INTERN_POOL_SIZE):
+        self.maxsize = maxsize
+        self._values = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return "<{}, {} values, hit rate {:.1%}>".format(
+            self.__class__.__name__, len(self._values), self.hit_rate
+        )
+
+    @property
+    def hit_rate(self):
+        """Proportion of values interned that were found in the pool"""
+        total = self.hits + self.misses
+        return float(self.hits) / total if total else 0.0
+
+    def intern(self, value):
+        """Return the pooled value equal to value, or value itself"""
+        if value is None:
+            return value
+        key = (value.__class__, value)
+        try:
+            pooled = self._values.get(key, _MISSING)
+        except TypeError:
+            return value
+        if pooled is _MISSING:
+            self.misses += 1
+            if len(self._values) < self.maxsize:
+                self._values[key] = value
+            return value
+        self.hits += 1
+        return pooled
+
+    def stats(self):
+        """Return a dict of pool statistics"""
+        return {
+            'size': len(self._values), 'maxsize': self.maxsize,
+            'hits': self.hits, 'misses': self.misses,
+            'hit_rate': self.hit_rate,
+        }
+
+    def clear(self):
+        """Empty the pool and reset the statistics"""
+        self._values.clear()
+        self.hits = self.misses = 0
+
+
+# shared by all Record subclasses that set intern_fields
+INTERN_POOL = InternPool()
+
+
+class RecordCache(object):
+    """
+    A bounded, least recently used, cache of records used to canonicalize
+    them.
+
+    Setting record_cache = RecordCache() on a Record subclass means
+    creating a record that is equal to one in the cache, and has the same
+    type and (slot) attributes, returns the cached record instead.
+    Duplicate records then share memory, and compare equal by identity.
+    Once it holds maxsize records the least recently used is evicted.
+    Records with unhashable values or attributes are not cached.
+
+    N.B. record_cache must be set in the class body, setting it on a
+    class after it has been created has no effect.
+
+    hits, misses and evictions count the records found in, and added to,
+    the cache, and those removed from it.
+
+    N.B. Only records created by calling the class are cached,
+    canonical() can be used to canonicalize others (e.g. from from_rows).
+    Attributes not stored in slots are not compared.
+    """
+
+    def __init__(self, maxsize=RECORD_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._records = _ORDERED_DICT_BASE()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._records)
+
+    def __repr__(self):
+        return "<{}, {} records, {} hits, {} misses, {} evictions>".format(
+            self.__class__.__name__, len(self._records), self.hits,
+            self.misses, self.evictions
+        )
+
+    def canonical(self, record):
+        """
+        Return the cached record equal to record, with the same type and
+        attributes, if there is one, otherwise cache and return record.
+        """
+        # pylint:disable=protected-access
+        cls = record.__class__
+        attrs = tuple([
+            getattr(record, name, _UNSET) for name in cls._schema.attr_names
+        ])
+        records = self._records
+        try:
+            cached = records.pop((cls, record, attrs), None)
+        except TypeError:
+            return record
+        if cached is not None:
+            self.hits += 1
+            # move to the end, as most recently used
+            records[(cls, cached, attrs)] = cached
+            return cached
+        self.misses += 1
+        records[(cls, record, attrs)] = record
+        if len(records) > self.maxsize:
+            del records[next(iter(records))]
+            self.evictions += 1
+        return record
+
+    def stats(self):
+        """Return a dict of cache statistics"""
+        return {
+            'size': len(self._records), 'maxsize': self.maxsize,
+            'hits': self.hits, 'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def clear(self):
+        """Empty the cache and reset the statistics"""
+        self._records.clear()
+        self.hits = self.misses = self.evictions = 0
+
+
+class RecordSchema(object):
+    """
+    Validation schema for a Record subclass.
+
+    Holds the frozen field sets, field order and null check list derived from
+    'fields' and 'non_null_fields' so they are computed once per class rather
+    than once per record. RecordMeta attaches one to every Record subclass
+    as _schema.
+    """
+    __slots__ = [
+        'fields', 'field_set', 'field_index', 'non_null_fields',
+        'non_null_set', 'non_null_index', 'require_all_fields', 'dynamic',
+        'hash_key_fields', 'hash_slot_fields', 'hash_dynamic',
+        'record_backend', 'ordered_cls', 'unordered_cls', 'compact',
+        'attr_slots', 'attr_names', 'intern_fields', 'intern_index',
+        'convert_fields', 'field_types', 'coercers', 'coerce_index',
+        'column_coercers'
+    ]
+
+    def __init__(self, fields=None, non_null_fields=None,
+                 require_all_fields=None, dynamic=(),
+                 hash_index_fields=None, slots=(), hash_dynamic=False,
+                 record_backend='frozendict', attr_slots=(),
+                 intern_fields=None, convert_fields=None, field_types=None):
+        self.fields = tuple(fields or ())
+        self.field_set = frozenset(self.fields)
+        self.field_index = {
+            field: idx for idx, field in enumerate(self.fields)
+        }
+        self.non_null_set = frozenset(non_null_fields or ())
+        self.non_null_fields = tuple(sorted(self.non_null_set))
+        # positions of non_null_fields in rows supplied in field order,
+        # None if they can't all be found that way.
+        if self.non_null_set <= self.field_set:
+            self.non_null_index = tuple(
+                self.field_index[field] for field in self.non_null_fields
+            )
+        else:
+            self.non_null_index = None
+        # None if not set as a class variable.
+        self.require_all_fields = require_all_fields
+        # those of fields/non_null_fields that are not class variables and
+        # so may be set on the instance
+        self.dynamic = tuple(dynamic)
+        self.hash_key_fields, self.hash_slot_fields = self.hash_key_layout(
+            hash_index_fields, fields, slots
+        )
+        # True if fields/hash_index_fields may be set on the instance
+        self.hash_dynamic = hash_dynamic
+        # member descriptors for attributes stored in slots
+        self.attr_slots = attr_slots
+        self.attr_names = tuple(
+            descriptor.__name__ for descriptor in attr_slots
+        )
+        # fields whose values are interned via INTERN_POOL,
+        # and their positions in fields
+        self.intern_fields = tuple(intern_fields or ())
+        self.intern_index = tuple(
+            self.field_index[field] for field in self.intern_fields
+            if field in self.field_index
+        )
+        # fields that may need converting to JSON, None if not known
+        self.convert_fields = (
+            None if convert_fields is None else tuple(convert_fields)
+        )
+        # declared field types, (field, function) pairs that coerce
+        # values to them, and the positions of those in fields
+        self.field_types = dict(field_types or {})
+        self.coercers = tuple(
+            (field, _coercer(field, field_type))
+            for field, field_type in sorted(self.field_types.items())
+        )
+        self.coerce_index = tuple(
+            (self.field_index[field], coerce)
+            for field, coerce in self.coercers
+            if field in self.field_index
+        )
+        self.column_coercers = {
+            field: _column_coercer(self.field_types[field], coerce)
+            for field, coerce in self.coercers
+        }
+        # immutable mappings used to store the record,
+        # with and without fields
+        self.record_backend = record_backend
+        self.compact = False
+        if record_backend == 'frozendict':
+            self.ordered_cls = FrozenOrderedDict
+            self.unordered_cls = frozendict
+        elif record_backend == 'native':
+            self.ordered_cls = self.unordered_cls = ImmutableDict
+        elif record_backend == 'tuple':
+            # records without fields can't be stored as tuples
+            self.unordered_cls = ImmutableDict
+            if self.fields:
+                self.ordered_cls = RecordTuple.for_fields(self.fields)
+                self.compact = True
+            else:
+                self.ordered_cls = ImmutableDict
+        else:
+            raise ValueError(
+                "record_backend must be one of: {}".format(
+                    ", ".join(RECORD_BACKENDS)
+                )
+            )
+
+    @classmethod
+    def from_class(cls, record_cls):
+        """Create schema from class variables on a Record subclass"""
+        fields = getattr(record_cls, 'fields', None)
+        non_null_fields = getattr(record_cls, 'non_null_fields', None)
+        require_all_fields = getattr(record_cls, 'require_all_fields', None)
+        hash_index_fields = getattr(record_cls, 'hash_index_fields', None)
+        record_backend = getattr(record_cls, 'record_backend', 'frozendict')
+        intern_fields = getattr(record_cls, 'intern_fields', None)
+        convert_fields = getattr(record_cls, 'convert_fields', None)
+        field_types = getattr(record_cls, 'field_types', None)
+        slots = getattr(record_cls, '__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        dynamic = []
+        hash_dynamic = False
+        if isinstance(fields, _member_descriptor):
+            fields, hash_dynamic = None, True
+            dynamic.append('fields')
+        if isinstance(non_null_fields, _member_descriptor):
+            non_null_fields = None
+            dynamic.append('non_null_fields')
+        if isinstance(require_all_fields, _member_descriptor):
+            require_all_fields = None
+        if isinstance(hash_index_fields, _member_descriptor):
+            hash_index_fields, hash_dynamic = None, True
+        if isinstance(convert_fields, _member_descriptor):
+            convert_fields = None
+        if isinstance(field_types, _member_descriptor):
+            field_types = None
+        return cls(
+            fields, non_null_fields, require_all_fields, dynamic=dynamic,
+            hash_index_fields=hash_index_fields, slots=slots,
+            hash_dynamic=hash_dynamic, record_backend=record_backend,
+            attr_slots=_attr_slots(record_cls), intern_fields=intern_fields,
+            convert_fields=convert_fields, field_types=field_types
+        )
+
+    @staticmethod
+    def hash_key_layout(hash_index_fields, fields, slots):
+        """
+        Return the fields used to create hash index keys, and those of them
+        that are slots rather than record fields.
+        """
+        key_fields = hash_index_fields or fields or []
+        return key_fields, tuple(
+            field for field in key_fields if field in slots
+        )
+
+    def for_instance(self, record):
+        """
+        Return schema for a Record instance.
+
+        This is the class schema unless fields or non_null_fields have been
+        set as instance attributes, in which case a new schema is created.
+        """
+        if not self.dynamic:
+            return self
+        attrs = {}
+        for name in self.dynamic:
+            value = getattr(record, name, None)
+            if value is not None:
+                attrs[name] = value
+        if not attrs:
+            return self
+        return self.__class__(
+            attrs.get('fields', self.fields),
+            attrs.get('non_null_fields', self.non_null_fields),
+            record_backend=self.record_backend,
+            intern_fields=self.intern_fields,
+            convert_fields=self.convert_fields,
+            field_types=self.field_types
+        )
+
+    def validate(self, record, require_all_fields=False):
+        """
+        Check record (a dict-like) is valid, raise KeyError if not.
+
+        See Record for the rules applied.
+        """
+        keys = set(record.keys())
+        # Check non_null_fields are present and not null
+        if self.non_null_set:
+            missing = ", ".join(sorted(self.non_null_set - keys))
+            if missing:
+                msg = "The following field{} required: {}".format(
+                    's are' if len(missing) > 1 else ' is',
+                    missing
+                )
+                raise KeyError(msg)
+            else:
+                null_fields = [
+                    field for field in self.non_null_fields
+                    if record[field] is None
+                ]
+                if null_fields:
+                    raise _null_fields_error(null_fields)
+        if self.fields:
+            # check there aren't things present not in fields
+            if keys > self.field_set:
+                raise _extra_keys_error(keys - self.field_set, self.fields)
+            elif keys < self.field_set and require_all_fields:
+                msg = (
+                    "Missing keys: {}. The following keys must "
+                    "be used in the record: {}".format(
+                        ", ".join(self.field_set - keys),
+                        ", ".join(self.fields)
+                    )
+                )
+                raise KeyError(msg)
+
+    def validate_changes(self, changes):
+        """
+        Check changes (a dict) to an existing, valid, record are valid,
+        raise KeyError if not.
+        """
+        if self.fields:
+            extra = [key for key in changes if key not in self.field_set]
+            if extra:
+                raise _extra_keys_error(extra, self.fields)
+        if self.non_null_set:
+            null_fields = sorted(
+                key for key, value in changes.items()
+                if value is None and key in self.non_null_set
+            )
+            if null_fields:
+                raise _null_fields_error(null_fields)
+
+    def update(self, record, changes):
+        """
+        Return a new immutable mapping of the same type as record (as
+        returned by build), updated with changes.
+
+        N.B. changes are not validated. Values are not copied.
+        """
+        if self.coercers:
+            changes = self.coerce_record(changes)
+        if self.intern_fields:
+            changes = self.intern_record(changes)
+        if self.compact and isinstance(record, RecordTuple):
+            values = list(tuple.__iter__(record))
+            field_index = self.field_index
+            for key, value in changes.items():
+                values[field_index[key]] = value
+            return record._make(values)
+        # pylint:disable=protected-access
+        data = record if isinstance(record, dict) else record._dict
+        return record.__class__(data, **changes)
+
+    def build(self, record, require_all_fields=False):
+        """
+        Validate record and return it as an immutable mapping.
+
+        This will be ordered by fields if fields is set, i.e. a
+        FrozenOrderedDict rather than a frozendict, for the default backend.
+        """
+        self.validate(record, require_all_fields)
+        if self.fields:
+            get = record.get
+            values = [get(field, None) for field in self.fields]
+            if self.coerce_index:
+                values = self.coerce_values(values)
+            return self.from_values(values)
+        if self.coercers:
+            record = self.coerce_record(record)
+        if self.intern_fields:
+            record = self.intern_record(record)
+        return self.unordered_cls(record)
+
+    def build_row(self, row, require_all_fields=False, coerce=True):
+        """
+        Validate row and return it as an immutable mapping.
+
+        Like build, but row may also be a tuple or list of values
+        in the order of fields, these are not coerced to field_types
+        if coerce is False.
+        """
+        if not isinstance(row, (tuple, list)):
+            return self.build(row, require_all_fields)
+        values = self.row_values(row, require_all_fields)
+        if coerce and self.coerce_index:
+            values = self.coerce_values(values)
+        return self.from_values(values)
+
+    def row_values(self, row, require_all_fields=False):
+        """
+        Validate row and return its values in the order of fields.
+
+        row may be a dict-like or a tuple or list of values in the order
+        of fields.
+        """
+        fields = self.fields
+        if not isinstance(row, (tuple, list)):
+            self.validate(row, require_all_fields)
+            get = row.get
+            return [get(field, None) for field in fields]
+        if not fields:
+            raise TypeError(
+                "Rows can only be supplied as sequences if fields is set"
+            )
+        if len(row) != len(fields):
+            msg = "Expected {} values in the order: {}, got {}".format(
+                len(fields), ", ".join(fields), len(row)
+            )
+            raise KeyError(msg)
+        non_null_index = self.non_null_index
+        if non_null_index is None or any(
+                row[idx] is None for idx in non_null_index):
+            # use validate to raise the appropriate error
+            self.validate(dict(zip(fields, row)), require_all_fields)
+        return row
+
+    def from_values(self, values):
+        """
+        Return an immutable mapping from values in the order of fields.
+
+        N.B. values are not validated.
+        """
+        if self.intern_index:
+            values = self.intern_values(values)
+        if self.compact:
+            return self.ordered_cls._make(values)
+        return self.ordered_cls(zip(self.fields, values))
+
+    def coerce_values(self, values):
+        """
+        Return a list of values (in the order of fields) with the values
+        of field_types coerced to them.
+        """
+        values = list(values)
+        for idx, coerce in self.coerce_index:
+            values[idx] = coerce(values[idx])
+        return values
+
+    def coerce_record(self, record):
+        """Return a dict of record with the values of field_types coerced"""
+        record = dict(record)
+        for field, coerce in self.coercers:
+            if field in record:
+                record[field] = coerce(record[field])
+        return record
+
+    def intern_values(self, values):
+        """
+        Return a list of values (in the order of fields) with the values
+        of intern_fields interned.
+        """
+        values = list(values)
+        intern = INTERN_POOL.intern
+        for idx in self.intern_index:
+            values[idx] = intern(values[idx])
+        return values
+
+    def intern_record(self, record):
+        """Return a dict of record with the values of intern_fields interned"""
+        record = dict(record)
+        intern = INTERN_POOL.intern
+        for field in self.intern_fields:
+            if field in record:
+                record[field] = intern(record[field])
+        return record
+
+
+class RecordMeta(type):
+    """Metaclass for Record, attaches a RecordSchema to each class."""
+
+    def __init__(cls, name, bases, namespace):
+        super(RecordMeta, cls).__init__(name, bases, namespace)
+        cls._schema = RecordSchema.from_class(cls)
+        # only classes with a cache pay for CachedRecordMeta.__call__,
+        # subclasses of one that set record_cache = None don't
+        cached = isinstance(getattr(cls, 'record_cache', None), RecordCache)
+        meta = type(cls)
+        if cached and not isinstance(cls, CachedRecordMeta):
+            cls.__class__ = _cached_metaclass(meta)
+        elif not cached and isinstance(cls, CachedRecordMeta):
+            cls.__class__ = meta.uncached_metaclass
+
+
+class CachedRecordMeta(RecordMeta):
+    """
+    Metaclass for Record subclasses with a record_cache, returns
+    canonical records when the class is called.
+
+    RecordMeta switches classes to this, or to a subclass of this and
+    their own metaclass if that is a subclass of RecordMeta, see
+    _cached_metaclass. uncached_metaclass is the metaclass switched back
+    to by subclasses that set record_cache = None.
+    """
+    uncached_metaclass = RecordMeta
+
+    def __call__(cls, *args, **kwargs):
+        record = super(CachedRecordMeta, cls).__call__(*args, **kwargs)
+        cache = getattr(cls, 'record_cache', None)
+        if isinstance(cache, RecordCache):
+            record = cache.canonical(record)
+        return record
+
+
+# cached versions of RecordMeta subclasses, by metaclass
+_CACHED_METACLASSES = {RecordMeta: CachedRecordMeta}
+
+
+def _cached_metaclass(meta):
+    """
+    Return a metaclass combining CachedRecordMeta with meta (RecordMeta
+    or a subclass of it), so methods of custom metaclasses are kept.
+    """
+    try:
+        return _CACHED_METACLASSES[meta]
+    except KeyError:
+        cached_meta = type(
+            'Cached' + meta.__name__, (CachedRecordMeta, meta),
+            {'uncached_metaclass': meta}
+        )
+        _CACHED_METACLASSES[meta] = cached_meta
+        return cached_meta
+
+
+# Python 2 & 3 compatible equivalent of six.with_metaclass
+_RecordBase = RecordMeta('_RecordBase', (object,), {'__slots__': ()})
+
+
 class RecordJSONEncoder(json.JSONEncoder):
     """
     Encodes Record data to JSON, converting date & datetime objects.
 
+    Records are not copied or revalidated, and data without dates is
+    passed to the encoder as it is. If a Record subclass defines
+    convert_fields only those fields are checked.
+
     N.B. Encodes only record data (i.e. data accessible via dict like methods),
     not attributes (meta) data.
     """
     # pylint:disable=method-hidden
     def default(self, record):
-        rdict = record.copy_record()
-        return _convert_dict_datetime(rdict)
+        return _convert_record(record)
+
+
+class FastRecordJSONEncoder(json.JSONEncoder):
+    """
+    Encodes Record data to JSON, converting date & datetime objects.
+
+    Unlike RecordJSONEncoder record data is not checked for values to
+    convert up front, the underlying record data is passed straight to the
+    encoder and dates, datetimes, nested records and frozendicts are
+    converted as they are encountered. Instances hold no state so can be
+    reused.
+
+    N.B. Encodes only record data (i.e. data accessible via dict like methods),
+    not attributes (meta) data.
+    """
+    # pylint:disable=method-hidden,protected-access
+    def default(self, obj):
+        if isinstance(obj, Record):
+            return obj._as_dict()
+        elif isinstance(obj, frozendict):
+            return obj._dict
+        elif isinstance(obj, datetime.datetime):
+            return obj.replace(microsecond=0).isoformat()
+        elif isinstance(obj, datetime.date):
+            return obj.isoformat()
+        return super(FastRecordJSONEncoder, self).default(obj)
+
+
+_JSON_ENCODER = FastRecordJSONEncoder()
+
+
+class RecordPatch(object):
+    """
+    The changes between two versions of a record, as returned by
+    Record.diff().
+
+    changes is an ImmutableDict of the fields whose values differ, mapped to
+    their new values, removed is a tuple of keys not present in the new
+    version (only for records without fields). A patch is False if there
+    are no differences.
+
+    apply() can be used to create the new version from the old one.
+    """
+    __slots__ = ['changes', 'removed']
+
+    def __init__(self, changes=(), removed=()):
+        self.changes = ImmutableDict(changes)
+        self.removed = tuple(removed)
+
+    def __len__(self):
+        """Number of changed or removed keys"""
+        return len(self.changes) + len(self.removed)
+
+    def __bool__(self):
+        return bool(self.changes or self.removed)
+
+    __nonzero__ = __bool__
+
+    def __eq__(self, other):
+        if isinstance(other, RecordPatch):
+            return (
+                self.changes == other.changes and
+                set(self.removed) == set(other.removed)
+            )
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "<{}, changes={!r}, removed={!r}>".format(
+            self.__class__.__name__, dict(self.changes), self.removed
+        )
+
+    def apply(self, record):
+        """
+        Return a new record, of the same type and with the same
+        attributes as record, with the patch applied.
+
+        N.B. Changed values are validated as they would be for
+        record.replace().
+        """
+        if not self.removed:
+            return record.replace(**self.changes)
+        # pylint:disable=protected-access
+        data = {
+            key: value for key, value in record.items()
+            if key not in self.removed
+        }
+        data.update(self.changes)
+        return record._derive(record._set_record(data))
+
+
+# patches are immutable, so this can be shared
+_EMPTY_PATCH = RecordPatch()
+
+
+class _FixedOffset(datetime.tzinfo):
+    """A fixed offset from UTC, for Python 2 (i.e. datetime.timezone)"""
+
+    def __init__(self, offset):
+        # pylint:disable=super-init-not-called
+        self._offset = offset
+
+    def __getinitargs__(self):
+        return (self._offset,)
+
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, self._offset)
 
+    def utcoffset(self, dtime):
+        return self._offset
 
-class Record(object):
+    def dst(self, dtime):
+        return None
+
+    def tzname(self, dtime):
+        seconds = int(self._offset.total_seconds())
+        sign = '-' if seconds < 0 else '+'
+        hours, minutes = divmod(abs(seconds) // 60, 60)
+        return 'UTC{}{:02d}:{:02d}'.format(sign, hours, minutes)
+
+
+# pylint:disable=invalid-name
+_timezone = getattr(datetime, 'timezone', _FixedOffset)
+# pylint:enable=invalid-name
+
+
+class _Unset(object):
+    """Marks an unset slot when pickling records"""
+    __slots__ = ()
+
+    def __reduce__(self):
+        # pickled by reference, so unpickles as the same object
+        return '_UNSET'
+
+    def __repr__(self):
+        return '_UNSET'
+
+
+_UNSET = _Unset()
+
+
+def _restore_record(record_cls, values, attrs, instance_dict=None):
+    """
+    Recreate a record pickled by Record.__reduce__, bypassing __init__
+    and validation.
+
+    values are the record values in the order of fields, or (key, value)
+    pairs if fields is not set. attrs are the values of the attribute
+    slots (see RecordSchema.attr_slots) in order.
+    """
+    # pylint:disable=protected-access
+    instance = record_cls.__new__(record_cls)
+    for descriptor, value in zip(record_cls._schema.attr_slots, attrs):
+        if value is not _UNSET:
+            descriptor.__set__(instance, value)
+    if instance_dict:
+        instance.__dict__.update(instance_dict)
+    schema = record_cls._schema.for_instance(instance)
+    if schema.fields:
+        record = schema.from_values(values)
+    else:
+        record = schema.unordered_cls(values)
+    set_attr = object.__setattr__
+    set_attr(instance, '_Record__record', record)
+    set_attr(instance, '_initialized', True)
+    return instance
+
+
+class Record(_RecordBase):
     """
     An immutable dict-like structure, that stores extra attributes that are
     needed to process the data but are not part of the data itself.
@@ -179,6 +1598,38 @@ class Record(object):
     the record is represented by a FrozenOrderedDict so field will always
     be returned in order.
 
+    Setting 'record_backend' to 'native' on a subclass stores the record in
+    an ImmutableDict (an immutable dict subclass) rather than a frozendict,
+    this is faster to access and construct. The default is 'frozendict'.
+    If fields is set, 'tuple' stores it as a RecordTuple, i.e. as a tuple of
+    values, which uses much less memory.
+
+    'intern_fields' can be set to a tuple of fields that have relatively
+    few distinct values (e.g. city or state). Their values are interned
+    via a shared, size bounded, InternPool (INTERN_POOL) when the record is
+    created, so records with equal values share the same object.
+
+    'record_cache' can be set to a RecordCache, creating a record equal to
+    one already in the cache then returns the cached record, see
+    RecordCache. It must be set in the class body.
+
+    'convert_fields' can be set to a tuple of the fields that may hold
+    dates, datetimes, or lists, dicts or records that may contain them.
+    RecordJSONEncoder then only checks these fields for values to convert,
+    the values of other fields are passed to the encoder as they are.
+
+    'field_types' can be set to a dict mapping fields to types. Values
+    are coerced to these when a record is created (or replaced), so values
+    read as strings, e.g. from CSV or JSON, can be used directly: int,
+    float, Decimal etc. are called with the value (but numbers that are
+    not whole are not truncated to int), bool accepts strings
+    such as 'true' and '0', datetime.datetime and datetime.date parse
+    ISO 8601 strings, and a Record subclass is created from a dict-like.
+    A list containing a single type, e.g. [datetime.date], is a list of
+    values of that type. None, and values already of the type, are left
+    as they are; values that can't be coerced raise KeyError. The
+    functions that coerce values are created once per class.
+
     If you wish fields to have a different default value, overide init
     to add them (setdefault(kwargs, 'myfield', default_value)).
 
@@ -354,8 +1805,8 @@ class Record(object):
     """
     # pylint:disable=too-few-public-methods
     __slots__ = [
-        '_initialized', '__record', 'fields', 'non_null_fields',
-        'require_all_fields', 'hash_index_fields'
+        '_initialized', '__record', '_hash', '_hash_index_key', 'fields',
+        'non_null_fields', 'require_all_fields', 'hash_index_fields'
     ]
 
     def __init__(self, *args, **kwargs):
@@ -365,13 +1816,14 @@ class Record(object):
         # default to not requiring fields to be set explicitly
         if not getattr(self, 'require_all_fields', None):
             self.require_all_fields = False
-        # Set internal record values
-        self.__record = self._set_record(kwargs)
-        self._initialized = True
+        # Set internal record values, bypassing the check in __setattr__
+        set_attr = object.__setattr__
+        set_attr(self, '_Record__record', self._set_record(kwargs))
+        set_attr(self, '_initialized', True)
 
     def __repr__(self):
         # pylint:disable=protected-access
-        return "<{}, {}>".format(self.__class__.__name__, self.__record._dict)
+        return "<{}, {}>".format(self.__class__.__name__, self._as_dict())
 
     def __contains__(self, name):
         """Does name exist in db record?"""
@@ -379,10 +1831,28 @@ class Record(object):
 
     def __eq__(self, other):
         """Compare against db record"""
+        if other is self:
+            return True
+        if isinstance(other, Record):
+            # hashes are only compared if already computed, so records
+            # with unhashable values can still be compared
+            other_hash = getattr(other, '_hash', None)
+            if other_hash is not None:
+                own_hash = getattr(self, '_hash', None)
+                if own_hash is not None and own_hash != other_hash:
+                    return False
+            # pylint:disable=protected-access
+            record, other_record = self.__record, other.__record
+            if (type(record) is type(other_record) and
+                    isinstance(record, RecordTuple)):
+                return tuple.__eq__(record, other_record)
+            return dict.__eq__(self._as_dict(), other._as_dict())
         return other == self.__record
 
     def __ne__(self, other):
         """Compare against db record"""
+        if isinstance(other, Record):
+            return not self.__eq__(other)
         return other != self.__record
 
     def __len__(self):
@@ -390,8 +1860,47 @@ class Record(object):
         return len(self.__record)
 
     def __hash__(self):
-        """Hash of db record. Hashable because immutable."""
-        return hash(self.__record)
+        """
+        Hash of db record. Hashable because immutable.
+
+        Computed on first use and then cached.
+        """
+        try:
+            return self._hash
+        except AttributeError:
+            record_hash = hash(self.__record)
+            object.__setattr__(self, '_hash', record_hash)
+            return record_hash
+
+    def __reduce__(self):
+        """
+        Support pickling (and copy), used by multiprocessing etc.
+
+        The pickled state is the class, the attribute slot values and the
+        record values (in the order of fields, so field names are not
+        repeated for every record). Records are recreated without calling
+        __init__ or revalidating them. Cached hashes are not included as
+        they may differ between processes.
+        """
+        # pylint:disable=protected-access
+        schema = self._schema
+        attrs = tuple([
+            getattr(self, name, _UNSET) for name in schema.attr_names
+        ])
+        record = self.__record
+        if schema.dynamic:
+            schema = schema.for_instance(self)
+        if isinstance(record, RecordTuple):
+            values = tuple(tuple.__iter__(record))
+        elif schema.fields:
+            values = tuple(self._as_dict().values())
+        else:
+            values = tuple(self._as_dict().items())
+        args = (self.__class__, values, attrs)
+        instance_dict = getattr(self, '__dict__', None)
+        if instance_dict:
+            args += (instance_dict,)
+        return (_restore_record, args)
 
     def __iter__(self):
         """Iter for record (obivates the need for __next__)"""
@@ -439,56 +1948,363 @@ class Record(object):
 
     def _set_record(self, record):
         """Set record values"""
-        # pylint:disable=redefined-variable-type
-        fields = getattr(self, 'fields', [])
-        non_null_fields = set(getattr(self, 'non_null_fields', []))
-        keys = set(record.keys())
-        # Check non_null_fields are present and not null
-        if non_null_fields:
-            missing = ", ".join(sorted(non_null_fields - keys))
-            if missing:
-                msg = "The following field{} required: {}".format(
-                    's are' if len(missing) > 1 else ' is',
-                    missing
-                )
-                raise KeyError(msg)
-            else:
-                null_fields = [
-                    field for field in non_null_fields
-                    if record[field] is None
-                ]
-                if null_fields:
-                    msg = "The following field{} can not be None: {}".format(
-                        's' if len(null_fields) > 1 else '',
-                        ", ".join(sorted(null_fields))
-                    )
-                    raise KeyError(msg)
-        if fields:
-            # check there aren't things present not in fields
-            if keys > set(fields):
-                msg = (
-                    "Extra keys: {}. Only the following keys can "
-                    "be used in the record: {}".format(
-                        ", ".join(keys - set(fields)), ", ".join(fields)
-                    )
-                )
-                raise KeyError(msg)
-            elif keys < set(fields) and self.require_all_fields:
-                msg = (
-                    "Missing keys: {}. The following keys must "
-                    "be used in the record: {}".format(
-                        ", ".join(set(fields) - keys), ", ".join(fields)
-                    )
-                )
-                raise KeyError(msg)
+        schema = self._schema.for_instance(self)
+        return schema.build(record, self.require_all_fields)
+
+    @classmethod
+    def _from_record(cls, record, attrs=None):
+        """
+        Create an instance from an already validated frozendict,
+        bypassing __init__.
+        """
+        # pylint:disable=protected-access
+        instance = cls.__new__(cls)
+        set_attr = object.__setattr__
+        if attrs:
+            for name, value in attrs.items():
+                set_attr(instance, name, value)
+        if cls._schema.require_all_fields is None:
+            set_attr(instance, 'require_all_fields', False)
+        set_attr(instance, '_Record__record', record)
+        set_attr(instance, '_initialized', True)
+        return instance
+
+    @classmethod
+    def from_dict(cls, record, **attrs):
+        """
+        Create a record from record (a dict-like), bypassing __init__.
+
+        attrs are set directly as attributes (i.e. __slots__ values) without
+        going through __setattr__, so this is faster than calling a
+        subclass __init__ that sets them one at a time. The record is
+        validated in the same way.
 
-            # return FrozenOrderedDict
-            record_dict = FrozenOrderedDict(
-                [(field, record.get(field, None)) for field in fields]
+        N.B. As with from_rows, any logic in a subclass __init__ (e.g.
+        setting defaults) is not applied.
+
+        :Example:
+
+        >>> book = Book.from_dict(
+        ...     {'title': 'Moshi Moshi'}, supplier='Acme Inc', price=25,
+        ...     isbn='978-1-61902-786-2'
+        ... )
+        """
+        # pylint:disable=protected-access
+        instance = cls.__new__(cls)
+        set_attr = object.__setattr__
+        for name, value in attrs.items():
+            set_attr(instance, name, value)
+        schema = cls._schema
+        require_all_fields = schema.require_all_fields
+        if require_all_fields is None:
+            require_all_fields = attrs.get('require_all_fields') or False
+            set_attr(instance, 'require_all_fields', require_all_fields)
+        set_attr(
+            instance, '_Record__record',
+            schema.for_instance(instance).build(record, require_all_fields)
+        )
+        set_attr(instance, '_initialized', True)
+        return instance
+
+    @classmethod
+    def _iter_rows(cls, rows, attrs=None, coerce=True):
+        """Generator used by from_rows"""
+        # pylint:disable=protected-access
+        schema = cls._schema
+        build_row = schema.build_row
+        require_all_fields = schema.require_all_fields
+        from_record = cls._from_record
+        errors = {}
+        for idx, row in enumerate(rows):
+            try:
+                record = build_row(row, require_all_fields, coerce)
+            except KeyError as err:
+                errors[idx] = err
+                continue
+            yield from_record(record, attrs)
+        if errors:
+            raise BatchValidationError(errors)
+
+    @classmethod
+    def from_rows(cls, rows, attrs=None, lazy=False):
+        """
+        Create records in bulk.
+
+        rows is an iterable of dicts, or of tuples/lists with values in the
+        order of fields. Every row is validated against the class schema,
+        rows that fail are skipped and, once all rows have been processed,
+        a BatchValidationError (a KeyError) is raised, with the indexes
+        of every failing row in its errors attribute and (unless lazy)
+        the records created from the other rows in its records attribute.
+
+        attrs is an optional dict of attributes (i.e. __slots__ values)
+        to set on every record.
+
+        N.B. Records are created without calling __init__, so any logic in
+        a subclass __init__ (e.g. setting defaults) is not applied.
+
+        :param rows: iterable of dicts or sequences in the order of fields
+        :param attrs: attributes to set on each record
+        :type attrs: dict
+        :param lazy: return a generator rather than a list
+        :type lazy: bool
+        :return: list (or generator) of records
+        """
+        records = cls._iter_rows(rows, attrs)
+        return records if lazy else _collect_records(records)
+
+    @classmethod
+    def from_columns(cls, columns, attrs=None, lazy=False):
+        """
+        Create records in bulk from columns of values.
+
+        columns maps fields to sequences of values, one per record, which
+        must all be the same length. Fields without a column are None.
+        Columns in field_types are coerced a whole column at a time,
+        rather than value by value as rows are, then records are
+        validated and created as with from_rows.
+
+        :Example:
+
+        >>> class Building(Record):
+        ...     fields = ('name', 'score')
+        ...     field_types = {'score': int}
+        >>> buildings = Building.from_columns(
+        ...     {'name': ['Acme HQ', 'Bob Tower'], 'score': ['75', '90']}
+        ... )
+        >>> buildings[1]['score']
+        90
+
+        :param columns: dict of field: sequence of values
+        :type columns: dict
+        :param attrs: attributes to set on each record
+        :type attrs: dict
+        :param lazy: return a generator rather than a list
+        :type lazy: bool
+        :return: list (or generator) of records
+        """
+        schema = cls._schema
+        if not schema.fields:
+            raise ValueError(
+                "{} does not define fields".format(cls.__name__)
             )
+        extra = sorted(key for key in columns if key not in schema.field_set)
+        if extra:
+            raise _extra_keys_error(extra, schema.fields)
+        lengths = set(len(column) for column in columns.values())
+        if len(lengths) > 1:
+            raise ValueError("Columns must all be the same length")
+        length = lengths.pop() if lengths else 0
+        column_coercers = schema.column_coercers
+        coerce = False
+        values = []
+        for field in schema.fields:
+            column = columns.get(field)
+            if column is None:
+                column = itertools.repeat(None, length)
+            elif field in column_coercers:
+                try:
+                    column = column_coercers[field](column)
+                except KeyError:
+                    # coerce rows instead, so errors are reported by row
+                    coerce = True
+            values.append(column)
+        records = cls._iter_rows(zip(*values), attrs, coerce=coerce)
+        return records if lazy else _collect_records(records)
+
+    @classmethod
+    def from_json(cls, data, **attrs):
+        """
+        Create a record from a JSON object, as returned by json().
+
+        The record is validated, and created, as with from_dict, so
+        values are coerced to field_types, restoring dates, datetimes and
+        nested records (from ISO 8601 strings and objects) as the record
+        is created.
+
+        :Example:
+
+        >>> class Building(Record):
+        ...     fields = ('name', 'built', 'owner')
+        ...     field_types = {'built': datetime.date, 'owner': Owner}
+        >>> building = Building.from_json(
+        ...     '{"name": "Tower", "built": "1990-06-01", '
+        ...     '"owner": {"name": "Acme Inc"}}'
+        ... )
+        >>> building['built']
+        datetime.date(1990, 6, 1)
+
+        :param data: JSON object
+        :type data: str
+        :return: record
+        """
+        return cls.from_dict(_json_object(json.loads(data)), **attrs)
+
+    @classmethod
+    def from_json_array(cls, data, attrs=None, lazy=False):
+        """
+        Create records in bulk from a JSON array of objects.
+
+        Records are validated, and created, as with from_rows, so values
+        are coerced to field_types as with from_json.
+
+        :param data: JSON array of objects
+        :type data: str
+        :param attrs: attributes to set on each record
+        :type attrs: dict
+        :param lazy: return a generator rather than a list
+        :type lazy: bool
+        :return: list (or generator) of records
+        """
+        rows = json.loads(data)
+        if not isinstance(rows, list):
+            raise TypeError(
+                "Expected a JSON array, got {}".format(type(rows).__name__)
+            )
+        return cls.from_rows(
+            (_json_object(row) for row in rows), attrs=attrs, lazy=lazy
+        )
+
+    @classmethod
+    def from_json_lines(cls, lines, attrs=None, lazy=False):
+        """
+        Create records in bulk from JSON lines, i.e. one JSON object per
+        line, as written by writing record.json() and a newline for
+        each record.
+
+        Records are validated, and created, as with from_rows, so values
+        are coerced to field_types as with from_json. Blank lines are
+        skipped (and are not counted in the indexes of a
+        BatchValidationError).
+
+        :param lines: iterable of lines, e.g. a file object
+        :param attrs: attributes to set on each record
+        :type attrs: dict
+        :param lazy: return a generator rather than a list
+        :type lazy: bool
+        :return: list (or generator) of records
+        """
+        loads = json.loads
+        return cls.from_rows(
+            (_json_object(loads(line)) for line in lines if line.strip()),
+            attrs=attrs, lazy=lazy
+        )
+
+    def replace(self, **changes):
+        """
+        Return a new record of the same type updated with changes.
+
+        Attributes are copied from this record. Unlike creating a new
+        record from copy_record() only the changed values are validated,
+        the values that haven't changed are not copied.
+
+        :Example:
+
+        >>> book2 = book1.replace(type='paperback')
+        >>> book2.supplier == book1.supplier
+        True
+        """
+        # pylint:disable=protected-access
+        schema = self._schema.for_instance(self)
+        schema.validate_changes(changes)
+        record = self.__record
+        if changes:
+            record = schema.update(record, changes)
+        return self._derive(record)
+
+    def _derive(self, record):
+        """
+        Return a new record of the same type, with the same attributes,
+        using record (an already validated immutable mapping), bypassing
+        __init__.
+        """
+        # pylint:disable=protected-access
+        cls = self.__class__
+        new = cls.__new__(cls)
+        for descriptor in cls._schema.attr_slots:
+            try:
+                value = descriptor.__get__(self, cls)
+            except AttributeError:
+                continue
+            descriptor.__set__(new, value)
+        instance_dict = getattr(self, '__dict__', None)
+        if instance_dict:
+            new.__dict__.update(instance_dict)
+        set_attr = object.__setattr__
+        set_attr(new, '_Record__record', record)
+        set_attr(new, '_initialized', True)
+        return new
+
+    def diff(self, other):
+        """
+        Return a RecordPatch containing the changes needed to turn this
+        record into other (a record or dict-like).
+
+        Only the record data is compared, not attributes. If fields is set
+        keys missing from other are treated as None, otherwise they are
+        included in the patch as removed.
+
+        :Example:
+
+        >>> patch = old_book.diff(new_book)
+        >>> patch.changes
+        {'price': 20}
+        >>> patch.apply(old_book) == new_book
+        True
+        """
+        # pylint:disable=protected-access
+        record = self.__record
+        schema = self._schema
+        if isinstance(other, Record):
+            other_record = other.__record
+            if record is other_record:
+                return _EMPTY_PATCH
+            if (type(other) is type(self) and schema.fields and
+                    'fields' not in schema.dynamic):
+                # both have the same fields in the same order, so values
+                # can be compared position by position
+                if isinstance(record, RecordTuple):
+                    equal = tuple.__eq__
+                else:
+                    record, other_record = self._as_dict(), other._as_dict()
+                    equal = dict.__eq__
+                # hashes are only compared if already computed
+                own_hash = getattr(self, '_hash', None)
+                other_hash = getattr(other, '_hash', None)
+                if ((own_hash is None or other_hash is None or
+                     own_hash == other_hash) and equal(record, other_record)):
+                    return _EMPTY_PATCH
+                changes = [
+                    (field, new) for field, old, new in zip(
+                        schema.fields, record.values(), other_record.values()
+                    ) if new is not old and new != old
+                ]
+                return RecordPatch(changes) if changes else _EMPTY_PATCH
         else:
-            record_dict = frozendict(record)
-        return record_dict
+            other_record = other
+        fixed = bool(schema.for_instance(self).fields)
+        get = other_record.get
+        changes = []
+        removed = []
+        missing = 0
+        for key, old in record.items():
+            new = get(key, _MISSING)
+            if new is _MISSING:
+                missing += 1
+                if not fixed:
+                    removed.append(key)
+                    continue
+                new = None
+            if new is not old and new != old:
+                changes.append((key, new))
+        if len(other_record) > len(record) - missing:
+            changes.extend(
+                (key, other_record[key]) for key in other_record
+                if key not in record
+            )
+        if changes or removed:
+            return RecordPatch(changes, removed)
+        return _EMPTY_PATCH
 
     # public methods reflecting dict
     def get(self, key, default=None):
@@ -511,13 +2327,28 @@ class Record(object):
         """
         Return a copy of record, updated with values from kwargs.
 
-        Will return a frozendict or FrozenOrderedDict
+        Will return a frozendict or FrozenOrderedDict, or an ImmutableDict
+        if record_backend is 'native' or 'tuple'.
+        """
+        record = self._set_record(self.__record.copy(**kwargs))
+        if isinstance(record, RecordTuple):
+            # a tuple would serialize as, and compare equal to, a list
+            return ImmutableDict(record._dict)
+        return record
+
+    def _as_dict(self):
         """
-        return self._set_record(self.__record.copy(**kwargs))
+        Return the underlying record data as a dict.
+
+        N.B. This is not a copy, it must not be altered.
+        """
+        # pylint:disable=protected-access
+        record = self.__record
+        return record if isinstance(record, dict) else record._dict
 
     def json(self):
         """Return record data as a json string"""
-        return RecordJSONEncoder().encode(self)
+        return _JSON_ENCODER.encode(self)
 
     def get_hash_index_key(self):
         """
@@ -525,17 +2356,33 @@ class Record(object):
 
         Uses all fields in fields if hash_index_fields is not defined.
         Keys from slots can be included in hash_index_fields.
-        """
-        class_name = self.__class__.__name__
-        fields = getattr(self, 'fields', None)
-        key_fields = getattr(self, 'hash_index_fields', None) or fields or []
-        slots_dict = {
-            key: getattr(self, key, None)
-            for key in key_fields if key in self.__slots__
-        }
-        value_dict = self.copy_record(**slots_dict)
-        return generate_hash_index_key(class_name, key_fields, value_dict)
 
+        The key is computed on first use and then cached.
+        """
+        try:
+            return self._hash_index_key
+        except AttributeError:
+            pass
+        schema = self._schema
+        if schema.hash_dynamic:
+            key_fields, slot_fields = schema.hash_key_layout(
+                getattr(self, 'hash_index_fields', None),
+                getattr(self, 'fields', None), self.__slots__
+            )
+        else:
+            key_fields = schema.hash_key_fields
+            slot_fields = schema.hash_slot_fields
+        if slot_fields:
+            value_dict = {field: self.get(field) for field in key_fields}
+            for field in slot_fields:
+                value_dict[field] = getattr(self, field, None)
+        else:
+            value_dict = self
+        hash_index_key = generate_hash_index_key(
+            self.__class__.__name__, key_fields, value_dict
+        )
+        object.__setattr__(self, '_hash_index_key', hash_index_key)
+        return hash_index_key
 
 
 # calling getattr(Class, var, default) to read a class variable,
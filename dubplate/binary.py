@@ -0,0 +1,397 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+copyright (c) 2016-2017 Earth Advantage. All rights reserved.
+..codeauthor::Paul Munday <paul@paulmunday.net>
+
+Compact binary serialization of records.
+
+The format consists of a header, listing the fields of the record class
+once, followed by the records. Each record is prefixed by its length and
+is stored as its values in the order of the fields in the header
+(or as a map if the class does not define fields). Values are
+tagged, msgpack style, and dates, datetimes and Decimals are stored
+natively, so they decode as dates, datetimes and Decimals rather than
+strings (or floats).
+
+Only the standard library (struct) is used.
+
+N.B. Only record data is stored, not attributes, as with json().
+Nested records are stored, and decoded, as dicts. Timezone aware
+datetimes are not supported.
+"""
+
+# Imports from Standard Library
+import datetime
+import decimal
+import io
+import itertools
+import struct
+
+# Imports from Third Party Modules
+
+# Local Imports
+from dubplate import Record
+
+# Constants
+MAGIC = b'DUBR'
+VERSION = 1
+# value tags
+NONE, FALSE, TRUE, INT, BIGINT, FLOAT, TEXT, BYTES = range(8)
+DATE, DATETIME, LIST, TUPLE, MAP, DECIMAL = range(8, 14)
+
+_TEXT_TYPE = type(u'')
+_BYTES_TYPE = type(b'')
+_INTEGER_TYPES = tuple(set([int, type(2 ** 64)]))
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+_HEADER = struct.Struct('>4sBH')
+_LENGTH = struct.Struct('>I')
+_SHORT_LENGTH = struct.Struct('>H')
+_TAG = struct.Struct('>B')
+_TAG_LENGTH = struct.Struct('>BI')
+_TAG_INT = struct.Struct('>Bq')
+_TAG_FLOAT = struct.Struct('>Bd')
+_TAG_DATE = struct.Struct('>BHBB')
+_TAG_DATETIME = struct.Struct('>BHBBBBBI')
+_INT = struct.Struct('>q')
+_FLOAT = struct.Struct('>d')
+_DATE = struct.Struct('>HBB')
+_DATETIME = struct.Struct('>HBBBBBI')
+
+_NONE_BYTES = _TAG.pack(NONE)
+_FALSE_BYTES = _TAG.pack(FALSE)
+_TRUE_BYTES = _TAG.pack(TRUE)
+# encoded headers, by fields
+_HEADERS = {}
+
+
+# Private Functions
+def _encode_value(value, parts):
+    """Append the encoded value to parts (a list of bytes)"""
+    # pylint:disable=too-many-branches,unidiomatic-typecheck
+    value_type = type(value)
+    if value is None:
+        parts.append(_NONE_BYTES)
+    elif value_type is _TEXT_TYPE:
+        data = value.encode('utf-8')
+        parts.append(_TAG_LENGTH.pack(TEXT, len(data)))
+        parts.append(data)
+    elif value_type is bool:
+        parts.append(_TRUE_BYTES if value else _FALSE_BYTES)
+    elif isinstance(value, _INTEGER_TYPES):
+        if _INT64_MIN <= value <= _INT64_MAX:
+            parts.append(_TAG_INT.pack(INT, value))
+        else:
+            data = str(value).encode('ascii')
+            parts.append(_TAG_LENGTH.pack(BIGINT, len(data)))
+            parts.append(data)
+    elif value_type is float:
+        parts.append(_TAG_FLOAT.pack(FLOAT, value))
+    elif isinstance(value, decimal.Decimal):
+        # as a string, so the exact value (and exponent) is kept
+        data = str(value).encode('ascii')
+        parts.append(_TAG_LENGTH.pack(DECIMAL, len(data)))
+        parts.append(data)
+    elif isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            raise ValueError(
+                "Timezone aware datetimes can not be encoded: {}".format(
+                    value
+                )
+            )
+        parts.append(_TAG_DATETIME.pack(
+            DATETIME, value.year, value.month, value.day, value.hour,
+            value.minute, value.second, value.microsecond
+        ))
+    elif isinstance(value, datetime.date):
+        parts.append(_TAG_DATE.pack(DATE, value.year, value.month, value.day))
+    elif isinstance(value, _TEXT_TYPE):
+        _encode_value(_TEXT_TYPE(value), parts)
+    elif isinstance(value, _BYTES_TYPE):
+        parts.append(_TAG_LENGTH.pack(BYTES, len(value)))
+        parts.append(bytes(value))
+    elif isinstance(value, (list, tuple)):
+        parts.append(
+            _TAG_LENGTH.pack(TUPLE if isinstance(value, tuple) else LIST,
+                             len(value))
+        )
+        for item in value:
+            _encode_value(item, parts)
+    elif isinstance(value, Record) or hasattr(value, 'items'):
+        items = list(value.items())
+        parts.append(_TAG_LENGTH.pack(MAP, len(items)))
+        for key, item in items:
+            _encode_value(key, parts)
+            _encode_value(item, parts)
+    else:
+        raise TypeError(
+            "Values of type {} can not be encoded".format(
+                value_type.__name__
+            )
+        )
+
+
+def _decode_value(data, pos):
+    """
+    Decode the value at pos in data (a bytearray), return the value and
+    the position after it.
+    """
+    # pylint:disable=too-many-return-statements
+    tag = data[pos]
+    pos += 1
+    if tag == TEXT:
+        end = pos + 4 + _LENGTH.unpack_from(data, pos)[0]
+        return data[pos + 4:end].decode('utf-8'), end
+    elif tag == NONE:
+        return None, pos
+    elif tag == INT:
+        return _INT.unpack_from(data, pos)[0], pos + 8
+    elif tag == FALSE:
+        return False, pos
+    elif tag == TRUE:
+        return True, pos
+    elif tag == FLOAT:
+        return _FLOAT.unpack_from(data, pos)[0], pos + 8
+    elif tag == DATE:
+        return datetime.date(*_DATE.unpack_from(data, pos)), pos + 4
+    elif tag == DATETIME:
+        return (
+            datetime.datetime(*_DATETIME.unpack_from(data, pos)), pos + 11
+        )
+    length = _LENGTH.unpack_from(data, pos)[0]
+    pos += 4
+    if tag == BIGINT:
+        end = pos + length
+        return int(data[pos:end].decode('ascii')), end
+    elif tag == DECIMAL:
+        end = pos + length
+        return decimal.Decimal(data[pos:end].decode('ascii')), end
+    elif tag == BYTES:
+        end = pos + length
+        return bytes(data[pos:end]), end
+    elif tag == LIST or tag == TUPLE:
+        items = []
+        for _ in range(length):
+            item, pos = _decode_value(data, pos)
+            items.append(item)
+        return (tuple(items) if tag == TUPLE else items), pos
+    elif tag == MAP:
+        items = {}
+        for _ in range(length):
+            key, pos = _decode_value(data, pos)
+            items[key], pos = _decode_value(data, pos)
+        return items, pos
+    raise ValueError("Unknown tag {} at position {}".format(tag, pos - 5))
+
+
+def _encode_header(fields):
+    """Return the header for records with fields"""
+    try:
+        return _HEADERS[fields]
+    except KeyError:
+        pass
+    parts = [_HEADER.pack(MAGIC, VERSION, len(fields))]
+    for field in fields:
+        data = _TEXT_TYPE(field).encode('utf-8')
+        parts.append(_SHORT_LENGTH.pack(len(data)))
+        parts.append(data)
+    header = _HEADERS[fields] = b''.join(parts)
+    return header
+
+
+def _read_exactly(fileobj, size):
+    """Read size bytes from fileobj, raise ValueError if truncated"""
+    data = fileobj.read(size)
+    if len(data) != size:
+        raise ValueError("Unexpected end of data")
+    return data
+
+
+def _read_header(fileobj):
+    """Read the header from fileobj, return the fields"""
+    magic, version, num_fields = _HEADER.unpack(
+        _read_exactly(fileobj, _HEADER.size)
+    )
+    if magic != MAGIC:
+        raise ValueError("Not a binary record file")
+    if version != VERSION:
+        raise ValueError("Unsupported version: {}".format(version))
+    fields = []
+    for _ in range(num_fields):
+        length = _SHORT_LENGTH.unpack(_read_exactly(fileobj, 2))[0]
+        fields.append(_read_exactly(fileobj, length).decode('utf-8'))
+    return tuple(fields)
+
+
+def _record_fields(record):
+    """Return the fields used to encode record"""
+    # pylint:disable=protected-access
+    schema = record._schema
+    if schema.dynamic:
+        schema = schema.for_instance(record)
+    return schema.fields
+
+
+def _encode_payload(record, fields):
+    """Return the encoded record (without its length)"""
+    parts = []
+    if fields:
+        get = record.get
+        for field in fields:
+            _encode_value(get(field), parts)
+    else:
+        _encode_value(record, parts)
+    return b''.join(parts)
+
+
+def _decoder(record_cls, fields, attrs):
+    """Return a function that creates a record from an encoded payload"""
+    # pylint:disable=protected-access
+    schema = record_cls._schema
+    from_record = record_cls._from_record
+    require_all_fields = schema.require_all_fields
+    decode_value = _decode_value
+    num_fields = len(fields)
+
+    def decode_values(data):
+        """Return the list of values in data"""
+        values = []
+        append = values.append
+        pos = 0
+        for _ in range(num_fields):
+            value, pos = decode_value(data, pos)
+            append(value)
+        return values
+
+    if fields and fields == schema.fields:
+        build_row = schema.build_row
+
+        def decode(data):
+            """Decode positional values in the order of the class fields"""
+            return from_record(
+                build_row(decode_values(data), require_all_fields), attrs
+            )
+    elif fields:
+        build = schema.build
+
+        def decode(data):
+            """Decode positional values in the order of the header"""
+            row = dict(zip(fields, decode_values(data)))
+            return from_record(build(row, require_all_fields), attrs)
+    else:
+        build = schema.build
+
+        def decode(data):
+            """Decode a map"""
+            row = decode_value(data, 0)[0]
+            return from_record(build(row, require_all_fields), attrs)
+    return decode
+
+
+# Public Functions
+def encode_record(record):
+    """
+    Return record encoded as bytes, including a header.
+
+    :param record: Record to encode
+    :return: encoded record
+    :rtype: bytes
+    """
+    fields = _record_fields(record)
+    payload = _encode_payload(record, fields)
+    return b''.join(
+        [_encode_header(fields), _LENGTH.pack(len(payload)), payload]
+    )
+
+
+def decode_record(record_cls, data, attrs=None):
+    """
+    Return a record of record_cls decoded from data, as returned by
+    encode_record.
+
+    The record is validated, as with Record.from_rows, and attrs is an
+    optional dict of attributes to set on it.
+
+    :param record_cls: Record subclass
+    :param data: encoded record
+    :type data: bytes
+    :param attrs: attributes to set on the record
+    :type attrs: dict
+    :return: record
+    """
+    records = list(load_records(record_cls, io.BytesIO(data), attrs))
+    if len(records) != 1:
+        raise ValueError(
+            "Expected 1 record, found {}".format(len(records))
+        )
+    return records[0]
+
+
+def dump_records(records, fileobj, fields=None):
+    """
+    Write records to fileobj (opened in binary mode), with a header.
+
+    The header lists the fields, which are taken from the first record
+    unless supplied. All records should be of the same class.
+
+    :param records: iterable of records
+    :param fileobj: file like object to write to
+    :param fields: fields to encode
+    :type fields: Sequence
+    :return: number of records written
+    :rtype: int
+    """
+    records = iter(records)
+    count = 0
+    if fields is None:
+        try:
+            first = next(records)
+        except StopIteration:
+            fileobj.write(_encode_header(()))
+            return 0
+        fields = _record_fields(first)
+        records = itertools.chain([first], records)
+    fields = tuple(fields)
+    write = fileobj.write
+    write(_encode_header(fields))
+    pack_length = _LENGTH.pack
+    for record in records:
+        payload = _encode_payload(record, fields)
+        write(pack_length(len(payload)) + payload)
+        count += 1
+    return count
+
+
+def load_records(record_cls, fileobj, attrs=None):
+    """
+    Yield records of record_cls read from fileobj (opened in binary mode),
+    as written by dump_records.
+
+    Records are validated, and created, as with Record.from_rows and
+    attrs is an optional dict of attributes to set on each record.
+    If the fields in the header are not the same as those of record_cls,
+    values are matched to fields by name.
+
+    :param record_cls: Record subclass
+    :param fileobj: file like object to read from
+    :param attrs: attributes to set on each record
+    :type attrs: dict
+    """
+    fields = _read_header(fileobj)
+    decode = _decoder(record_cls, fields, attrs)
+    read = fileobj.read
+    length_size = _LENGTH.size
+    unpack_length = _LENGTH.unpack
+    while True:
+        length = read(length_size)
+        if not length:
+            break
+        if len(length) != length_size:
+            raise ValueError("Unexpected end of data")
+        data = bytearray(_read_exactly(fileobj, unpack_length(length)[0]))
+        try:
+            record = decode(data)
+        except (IndexError, struct.error):
+            raise ValueError("Invalid record data")
+        yield record
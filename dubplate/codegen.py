@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+copyright (c) 2016-2017 Earth Advantage. All rights reserved.
+..codeauthor::Paul Munday <paul@paulmunday.net>
+
+Generate specialised __init__ methods for Record subclasses.
+"""
+
+# Imports from Standard Library
+import functools
+import keyword
+import re
+
+# Imports from Third Party Modules
+
+# Local Imports
+from dubplate import Record
+
+# Constants
+# slots declared by Record itself, these are not __init__ parameters
+_RECORD_SLOTS = frozenset(
+    ['_initialized', '_Record__record', '_hash', '_hash_index_key', 'fields',
+     'non_null_fields', 'require_all_fields', 'hash_index_fields']
+)
+# names used by the generated __init__, so these can't be parameters
+_RESERVED_NAMES = frozenset(
+    ['self', 'args', 'kwargs', '_get', '_cls', '_schema', '_set_attr',
+     '_record_init', '_field_set', '_ordered_cls', '_unordered_cls', '_make']
+)
+_IDENTIFIER = re.compile(r'[A-Za-z_][A-Za-z0-9_]*$')
+# generated value (_v0) and coercer (_c0) names
+_GENERATED_NAME = re.compile(r'_[vc][0-9]+$')
+
+
+# Private Functions
+def _init_slots(record_cls):
+    """
+    Return (parameter name, attribute name) for each slot declared by
+    record_cls and its parents (apart from Record), base classes first.
+    """
+    slots = []
+    for klass in reversed(record_cls.__mro__):
+        declared = klass.__dict__.get('__slots__', ())
+        if isinstance(declared, str):
+            declared = (declared,)
+        for name in declared:
+            attr = name
+            if name.startswith('__') and not name.endswith('__'):
+                attr = '_{}{}'.format(klass.__name__.lstrip('_'), name)
+            if attr not in _RECORD_SLOTS:
+                slots.append((name, attr))
+    return slots
+
+
+def _check_init(record_cls):
+    """
+    Raise TypeError if record_cls, or a parent class below Record, defines
+    an __init__ (other than one generated by compile_record).
+    """
+    for klass in record_cls.__mro__:
+        if klass is Record:
+            break
+        if '__init__' in klass.__dict__ and (
+                '_init_source' not in klass.__dict__):
+            raise TypeError(
+                "compile_record would replace the __init__ defined by {}, "
+                "use compile_record(replace_init=True) if it only sets "
+                "attributes".format(klass.__name__)
+            )
+
+
+def _check_params(params):
+    """
+    Raise TypeError if a slot can't be used as a parameter of the generated
+    __init__ e.g. it is a keyword, or clashes with a generated name.
+    """
+    seen = set()
+    for name in params:
+        if (not _IDENTIFIER.match(name) or keyword.iskeyword(name) or
+                name in _RESERVED_NAMES or _GENERATED_NAME.match(name)):
+            raise TypeError(
+                "compile_record can not use the slot {!r} as a parameter "
+                "of __init__, rename it".format(name)
+            )
+        if name in seen:
+            raise TypeError(
+                "compile_record can not use the slot {!r} as a parameter "
+                "of __init__, it is declared more than once".format(name)
+            )
+        seen.add(name)
+
+
+def _init_source(record_cls):
+    """Return the source of __init__ for record_cls"""
+    # pylint:disable=protected-access
+    schema = record_cls._schema
+    slots = _init_slots(record_cls)
+    params = [name for name, _ in slots]
+    _check_params(params)
+    lines = [
+        'def __init__(self, {}):'.format(
+            ', '.join(params + ['*args', '**kwargs'])
+        )
+    ]
+    for name, attr in slots:
+        lines.append('    _set_attr(self, {!r}, {})'.format(attr, name))
+    # subclasses may have a different schema, so use the generic version
+    lines.extend([
+        '    if self.__class__ is not _cls:',
+        '        _record_init(self, *args, **kwargs)',
+        '        return',
+    ])
+    require_all_fields = schema.require_all_fields
+    if require_all_fields is None:
+        require_all_fields = False
+        lines.append("    _set_attr(self, 'require_all_fields', False)")
+    # errors are raised by validate, so messages are the same
+    checks = []
+    if schema.fields or schema.non_null_set:
+        lines.append('    _get = kwargs.get')
+    for idx, field in enumerate(schema.fields):
+        lines.append('    _v{} = _get({!r})'.format(idx, field))
+    for field in schema.non_null_fields:
+        if field in schema.field_set:
+            checks.append('_v{} is None'.format(schema.field_index[field]))
+        else:
+            checks.append('_get({!r}) is None'.format(field))
+    if schema.fields:
+        checks.append('not _field_set.issuperset(kwargs)')
+        if require_all_fields:
+            checks.append('len(kwargs) != {}'.format(len(schema.fields)))
+    if checks:
+        lines.append('    if {}:'.format(' or '.join(checks)))
+        lines.append(
+            '        _schema.validate(kwargs, {!r})'.format(require_all_fields)
+        )
+    for idx, _ in schema.coerce_index:
+        lines.append('    _v{0} = _c{0}(_v{0})'.format(idx))
+    values = ', '.join(
+        '_v{}'.format(idx) for idx in range(len(schema.fields))
+    )
+    if schema.intern_index:
+        # from_values interns the values of intern_fields
+        record = '_schema.from_values(({},))'.format(values)
+    elif schema.compact:
+        record = '_make(({},))'.format(values)
+    elif schema.fields:
+        record = '_ordered_cls(({},))'.format(', '.join(
+            '({!r}, _v{})'.format(field, idx)
+            for idx, field in enumerate(schema.fields)
+        ))
+    else:
+        record = 'kwargs'
+        if schema.coercers:
+            record = '_schema.coerce_record({})'.format(record)
+        if schema.intern_fields:
+            record = '_schema.intern_record({})'.format(record)
+        record = '_unordered_cls({})'.format(record)
+    lines.extend([
+        "    _set_attr(self, '_Record__record', {})".format(record),
+        "    _set_attr(self, '_initialized', True)",
+    ])
+    return '\n'.join(lines) + '\n'
+
+
+# Public Functions
+def compile_record(record_cls=None, replace_init=False):
+    """
+    Class decorator that replaces the __init__ of a Record subclass with
+    one generated, and compiled, for it.
+
+    The generated __init__ takes the attributes declared in __slots__
+    (those of parent classes first) as positional arguments, followed by
+    the record as keyword arguments, like a typical subclass __init__.
+    Attributes are set directly, the checks for non_null_fields and
+    fields are inlined, values of field_types are passed straight to the
+    function that coerces them, and the record storage is constructed
+    directly, rather than using the generic code in Record.__init__.
+    Records are validated in the same way, and raise the same errors.
+
+    N.B. an __init__ defined by the class, or a parent class, would be
+    replaced, so TypeError is raised unless replace_init is True, i.e.
+    compile_record(replace_init=True) is used, which is only suitable
+    if those __init__ methods just set attributes. TypeError is also
+    raised if a slot name can't be used as a parameter (e.g. args).
+    Subclasses of the decorated class use the generic code unless they
+    are also decorated. The source is available as _init_source.
+
+    :Example:
+
+    >>> @compile_record
+    ... class Building(Record):
+    ...     __slots__ = ['source']
+    ...     fields = ('name', 'address')
+    ...     non_null_fields = ('name',)
+    >>> Building('api', name='Acme HQ')
+    <Building, {'name': 'Acme HQ', 'address': None}>
+
+    :param record_cls: Record subclass
+    :param replace_init: replace any existing __init__
+    :type replace_init: bool
+    """
+    # pylint:disable=protected-access
+    if record_cls is None:
+        return functools.partial(compile_record, replace_init=replace_init)
+    if not (isinstance(record_cls, type) and
+            issubclass(record_cls, Record)):
+        raise TypeError("compile_record can only be used on Record classes")
+    if not replace_init:
+        _check_init(record_cls)
+    schema = record_cls._schema
+    source = _init_source(record_cls)
+    namespace = {
+        '_cls': record_cls,
+        '_schema': schema,
+        '_set_attr': object.__setattr__,
+        '_record_init': Record.__init__,
+        '_field_set': schema.field_set,
+        '_ordered_cls': schema.ordered_cls,
+        '_unordered_cls': schema.unordered_cls,
+    }
+    if schema.compact:
+        namespace['_make'] = schema.ordered_cls._make
+    for idx, coerce in schema.coerce_index:
+        namespace['_c{}'.format(idx)] = coerce
+    exec(compile(source, '<{} __init__>'.format(record_cls.__name__), 'exec'),
+         namespace)
+    init = namespace['__init__']
+    init.__doc__ = 'Generated by compile_record'
+    init.__module__ = record_cls.__module__
+    record_cls.__init__ = init
+    record_cls._init_source = source
+    return record_cls
@@ -0,0 +1,370 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+copyright (c) 2016-2017 Earth Advantage. All rights reserved.
+..codeauthor::Paul Munday <paul@paulmunday.net>
+
+Containers for large numbers of records.
+"""
+
+# Imports from Standard Library
+from array import array
+
+# Imports from Third Party Modules
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Local Imports
+from dubplate import _ORDERED_DICT_BASE as OrderedDict
+
+# Constants
+
+
+# Private Functions
+def _remove_from_index(index, key, record_id):
+    """Remove record_id from index, and key if empty"""
+    records = index[key]
+    del records[record_id]
+    if not records:
+        del index[key]
+
+
+# Public Classes
+class RecordTable(object):
+    """
+    A columnar container for records of a single Record subclass.
+
+    Rather than storing a list of records, the values of each field in
+    the subclasses fields are stored together in a column. Scanning a single
+    field is then just a matter of iterating over its column.
+    Records are only created (materialized) when rows are accessed.
+
+    By default columns are lists. column_types can be used to map numeric
+    fields to array typecodes (e.g. 'd' for float, 'l' for int), these
+    columns are then stored in an array.array. N.B. These can't contain None.
+    If NumPy is installed to_numpy can be used to return a column as a
+    NumPy array.
+
+    Rows are validated, and coerced to field_types, in the same way as the
+    record_cls constructor.
+    As with Record.from_rows, records are created without calling
+    __init__ and attrs is an optional dict of attributes to set on each
+    record, these are not stored per row: only the data itself is stored.
+
+    :Example:
+
+    >>> table = RecordTable(Building, column_types={'score': 'l'})
+    >>> table.append({'name': 'Acme HQ', 'score': 75})
+    >>> table.append(('Bob Tower', 90))
+    >>> sum(table.column('score'))
+    165
+    >>> high_scores = table.filter(lambda score: score > 80, field='score')
+    >>> high_scores[0]
+    <Building, {'name': 'Bob Tower', 'score': 90}>
+    """
+
+    def __init__(self, record_cls, rows=None, attrs=None, column_types=None):
+        # pylint:disable=protected-access
+        schema = record_cls._schema
+        if not schema.fields:
+            raise ValueError(
+                "{} does not define fields".format(record_cls.__name__)
+            )
+        self.record_cls = record_cls
+        self.attrs = attrs
+        self.column_types = column_types or {}
+        unknown = set(self.column_types) - schema.field_set
+        if unknown:
+            raise KeyError(
+                "Unknown column(s): {}".format(", ".join(sorted(unknown)))
+            )
+        self._schema = schema
+        self._columns = [
+            array(self.column_types[field])
+            if field in self.column_types else []
+            for field in schema.fields
+        ]
+        self._length = 0
+        if rows:
+            self.extend(rows)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        """Return the record at index"""
+        if isinstance(index, slice):
+            return self.take(range(*index.indices(self._length)))
+        values = [column[index] for column in self._columns]
+        # pylint:disable=protected-access
+        return self.record_cls._from_record(
+            self._schema.from_values(values), self.attrs
+        )
+
+    def __iter__(self):
+        """Iterate over records"""
+        # pylint:disable=protected-access
+        from_values = self._schema.from_values
+        from_record = self.record_cls._from_record
+        attrs = self.attrs
+        for values in zip(*self._columns):
+            yield from_record(from_values(values), attrs)
+
+    def __repr__(self):
+        return "<{}, {}, {} rows>".format(
+            self.__class__.__name__, self.record_cls.__name__, self._length
+        )
+
+    @property
+    def fields(self):
+        """Return the fields (i.e. columns) of the table"""
+        return self._schema.fields
+
+    def _append_values(self, values):
+        """Append a row of validated values to the columns"""
+        try:
+            for column, value in zip(self._columns, values):
+                column.append(value)
+        except (TypeError, OverflowError, ValueError) as err:
+            # ensure columns remain the same length
+            for column in self._columns:
+                del column[self._length:]
+            raise ValueError(
+                "Row can not be stored in table: {}".format(err)
+            )
+        self._length += 1
+
+    def append(self, row):
+        """
+        Add a row to the table.
+
+        row can be a record, a dict or a tuple of values in the order
+        of fields.
+        """
+        if isinstance(row, self.record_cls):
+            get = row.get
+            values = [get(field) for field in self._schema.fields]
+        else:
+            schema = self._schema
+            values = schema.row_values(row, schema.require_all_fields)
+            if schema.coerce_index:
+                values = schema.coerce_values(values)
+        self._append_values(values)
+
+    def extend(self, rows):
+        """Add rows (see append) to the table"""
+        for row in rows:
+            self.append(row)
+
+    def column(self, field):
+        """
+        Return the column (a list or array) for field.
+
+        N.B. This is not a copy, it must not be altered.
+        """
+        try:
+            return self._columns[self._schema.field_index[field]]
+        except KeyError:
+            raise KeyError(field)
+
+    def to_numpy(self, field):
+        """Return the column for field as a NumPy array"""
+        if numpy is None:
+            raise ImportError("to_numpy requires NumPy")
+        return numpy.array(self.column(field))
+
+    def take(self, indexes):
+        """Return a new table containing the rows at indexes"""
+        table = self.__class__(
+            self.record_cls, attrs=self.attrs, column_types=self.column_types
+        )
+        indexes = list(indexes)
+        for new_column, column in zip(table._columns, self._columns):
+            new_column.extend([column[idx] for idx in indexes])
+        table._length = len(indexes)
+        return table
+
+    def filter(self, predicate, field=None):
+        """
+        Return a new table containing the rows for which predicate is True.
+
+        If field is supplied predicate is called with the value of field for
+        each row, this avoids creating records. Otherwise it is called
+        with each record.
+        """
+        if field is not None:
+            column = self.column(field)
+            indexes = [
+                idx for idx, value in enumerate(column) if predicate(value)
+            ]
+        else:
+            indexes = [
+                idx for idx, record in enumerate(self) if predicate(record)
+            ]
+        return self.take(indexes)
+
+
+class RecordCollection(object):
+    """
+    A collection of records with secondary indexes.
+
+    Records are indexed on index_fields and, if hash_index is True,
+    by get_hash_index_key(). Indexes are updated as records are added
+    and removed, so find(field=value, ...) only needs to check records
+    in the smallest matching index rather than every record in the
+    collection. Criteria on fields that aren't indexed still work,
+    but if none of them are indexed every record is checked.
+
+    The collection can hold records of more than one type. Records are
+    held by identity, so two records that compare equal (e.g. that have
+    different attributes) can both be added.
+    Results are returned in the order records were added.
+
+    :Example:
+
+    >>> stock = RecordCollection(
+    ...     [book1, book2, book3], index_fields=('title', 'type')
+    ... )
+    >>> stock.find(title='Moshi Moshi', type='hardback')
+    [<Book, ...>, <Book, ...>]
+    >>> stock.find_equal(
+    ...     {'author': None, 'title': 'Moshi Moshi', 'type': 'hardback'}
+    ... )
+    []
+    >>> stock.remove(book1)
+    """
+
+    def __init__(self, records=None, index_fields=(), hash_index=False):
+        self.index_fields = tuple(index_fields)
+        self.hash_index = hash_index
+        self._records = OrderedDict()
+        self._indexes = {field: {} for field in self.index_fields}
+        # records with unhashable values for an index field
+        self._unhashable = {
+            field: OrderedDict() for field in self.index_fields
+        }
+        self._hash_index = {}
+        if records:
+            self.extend(records)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(list(self._records.values()))
+
+    def __contains__(self, record):
+        return id(record) in self._records
+
+    def __repr__(self):
+        return "<{}, {} records>".format(
+            self.__class__.__name__, len(self._records)
+        )
+
+    def add(self, record):
+        """Add record to the collection, and its indexes"""
+        record_id = id(record)
+        if record_id in self._records:
+            return
+        # do this first as it may raise an error
+        hash_index_key = (
+            record.get_hash_index_key() if self.hash_index else None
+        )
+        self._records[record_id] = record
+        for field in self.index_fields:
+            value = record.get(field)
+            try:
+                self._indexes[field].setdefault(
+                    value, OrderedDict()
+                )[record_id] = record
+            except TypeError:
+                self._unhashable[field][record_id] = record
+        if hash_index_key is not None:
+            self._hash_index.setdefault(
+                hash_index_key, OrderedDict()
+            )[record_id] = record
+
+    def extend(self, records):
+        """Add records to the collection"""
+        for record in records:
+            self.add(record)
+
+    def remove(self, record):
+        """
+        Remove record from the collection, and its indexes.
+
+        Raises ValueError if record is not in the collection.
+        N.B. this must be the same record, not just one that is equal to it.
+        """
+        record_id = id(record)
+        if record_id not in self._records:
+            raise ValueError("record is not in collection")
+        del self._records[record_id]
+        for field in self.index_fields:
+            unhashable = self._unhashable[field]
+            if record_id in unhashable:
+                del unhashable[record_id]
+            else:
+                _remove_from_index(
+                    self._indexes[field], record.get(field), record_id
+                )
+        if self.hash_index:
+            hash_index_key = record.get_hash_index_key()
+            if hash_index_key is not None:
+                _remove_from_index(
+                    self._hash_index, hash_index_key, record_id
+                )
+
+    def discard(self, record):
+        """Remove record from the collection if present"""
+        if id(record) in self._records:
+            self.remove(record)
+
+    def _candidates(self, criteria):
+        """
+        Return the smallest dict of records (by id) that could match
+        criteria based on the indexes.
+        """
+        candidates = None
+        for field, value in criteria.items():
+            index = self._indexes.get(field)
+            if index is None:
+                continue
+            try:
+                matches = index.get(value, {})
+            except TypeError:
+                continue
+            unhashable = self._unhashable[field]
+            if unhashable:
+                matches = OrderedDict(matches)
+                matches.update(
+                    (record_id, record)
+                    for record_id, record in unhashable.items()
+                    if record.get(field) == value
+                )
+            if candidates is None or len(matches) < len(candidates):
+                candidates = matches
+        return self._records if candidates is None else candidates
+
+    def find(self, **criteria):
+        """Return list of records where record[field] == value"""
+        candidates = self._candidates(criteria)
+        criteria = list(criteria.items())
+        return [
+            record for record in list(candidates.values())
+            if all(record.get(field) == value for field, value in criteria)
+        ]
+
+    def find_equal(self, mapping):
+        """Return list of records equal to mapping (e.g. a dict)"""
+        return [
+            record for record in self.find(**mapping) if record == mapping
+        ]
+
+    def find_by_hash_index_key(self, hash_index_key):
+        """Return list of records with hash_index_key"""
+        if not self.hash_index:
+            raise ValueError("Collection does not have a hash index")
+        return list(self._hash_index.get(hash_index_key, {}).values())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+copyright (c) 2016-2017 Earth Advantage. All rights reserved.
+..codeauthor::Paul Munday <paul@paulmunday.net>
+
+Process records in parallel.
+"""
+
+# Imports from Standard Library
+import multiprocessing
+
+# Imports from Third Party Modules
+
+# Local Imports
+
+# Constants
+# below this number of records, records are processed in-process
+MIN_RECORDS = 10000
+# number of chunks per worker, if chunksize is not supplied
+CHUNKS_PER_WORKER = 4
+
+
+# Private Functions
+def _cpu_count():
+    """Return the number of CPUs, or 1 if this can't be determined"""
+    try:
+        return multiprocessing.cpu_count()
+    except NotImplementedError:
+        return 1
+
+
+def _map_chunk(args):
+    """Apply func to each record in chunk, run in a worker process"""
+    func, chunk = args
+    return [func(record) for record in chunk]
+
+
+def _chunks(records, chunksize):
+    """Yield successive chunks of records"""
+    for start in range(0, len(records), chunksize):
+        yield records[start:start + chunksize]
+
+
+# Public Functions
+def map_records(func, records, workers=None, chunksize=None,
+                min_records=MIN_RECORDS, pool=None):
+    """
+    Return a list of the results of applying func to each record,
+    using a pool of worker processes.
+
+    Records are sent to the workers in chunks, so each worker is
+    passed a list of records at a time. They are pickled in their
+    compact form (see Record.__reduce__) and recreated in the worker
+    without being revalidated, as are any records func returns.
+    Results are returned in the same order as records.
+
+    func must be picklable, i.e. a function defined at module level,
+    and should not rely on side effects, as it runs in other processes.
+
+    If there are fewer than min_records records, or only one worker
+    would be used (and pool is not supplied), func is called in this
+    process instead, avoiding the cost of starting workers and sending
+    records to them.
+
+    :param func: function to apply to each record
+    :param records: iterable of records
+    :param workers: number of worker processes, defaults to the number
+        of CPUs
+    :type workers: int
+    :param chunksize: number of records sent to a worker at a time,
+        by default records are split into CHUNKS_PER_WORKER chunks per
+        worker
+    :type chunksize: int
+    :param min_records: minimum number of records to use workers for
+    :type min_records: int
+    :param pool: optional, existing multiprocessing Pool to use
+    :return: list of results
+    :rtype: list
+    """
+    records = list(records)
+    if workers is None:
+        workers = _cpu_count()
+    if len(records) < min_records or (pool is None and workers < 2):
+        return [func(record) for record in records]
+    if not chunksize:
+        chunksize = -(-len(records) // (max(workers, 1) * CHUNKS_PER_WORKER))
+    tasks = [(func, chunk) for chunk in _chunks(records, chunksize)]
+    if pool is not None:
+        chunk_results = pool.map(_map_chunk, tasks, chunksize=1)
+    else:
+        pool = multiprocessing.Pool(workers)
+        try:
+            chunk_results = pool.map(_map_chunk, tasks, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+    results = []
+    for chunk_result in chunk_results:
+        results.extend(chunk_result)
+    return results
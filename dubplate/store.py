@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+copyright (c) 2016-2017 Earth Advantage. All rights reserved.
+..codeauthor::Paul Munday <paul@paulmunday.net>
+
+Memory mapped, random access, record files.
+
+A store file consists of the header and records of the binary format
+(see dubplate.binary), followed by an index of the offset of each record,
+then a fixed size footer giving the position of the index and the number
+of records. Opening a store only reads the header and footer, records are
+decoded on demand.
+"""
+
+# Imports from Standard Library
+import itertools
+import mmap
+import struct
+
+# Imports from Third Party Modules
+
+# Local Imports
+from dubplate.binary import (
+    _LENGTH, _decoder, _encode_header, _encode_payload, _read_header,
+    _record_fields
+)
+
+# Constants
+STORE_MAGIC = b'DUBI'
+_OFFSET = struct.Struct('>Q')
+_FOOTER = struct.Struct('>QQ4s')
+
+
+# Private Functions
+def _write_index(fileobj, offsets):
+    """Write offsets, and the footer, return the index position"""
+    index_offset = fileobj.tell()
+    pack = _OFFSET.pack
+    fileobj.write(b''.join([pack(offset) for offset in offsets]))
+    fileobj.write(_FOOTER.pack(index_offset, len(offsets), STORE_MAGIC))
+    return index_offset
+
+
+# Public Classes
+class RecordStore(object):
+    """
+    Read only, random access to records of record_cls in a store file,
+    as written by write_store.
+
+    The file is memory mapped, so opening it is fast regardless of its
+    size, only the parts of it that are used are read, and the pages are
+    shared (via the OS page cache) between processes that open the
+    same file. Records are decoded each time they are accessed,
+    store[idx] decodes a single record.
+
+    Records are validated, and created, as with Record.from_rows and
+    attrs is an optional dict of attributes to set on each record.
+
+    :Example:
+
+    >>> write_store(buildings, 'buildings.dub')
+    >>> with RecordStore(Building, 'buildings.dub') as store:
+    ...     len(store)
+    ...     store[1000]
+    1000000
+    <Building, {...}>
+    """
+
+    def __init__(self, record_cls, path, attrs=None):
+        self.record_cls = record_cls
+        self.path = path
+        self.attrs = attrs
+        with open(path, 'rb') as fileobj:
+            self._mmap = mmap.mmap(
+                fileobj.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        try:
+            if len(self._mmap) < _FOOTER.size:
+                raise ValueError("Not a record store file")
+            self._index_offset, self._length, magic = _FOOTER.unpack_from(
+                self._mmap, len(self._mmap) - _FOOTER.size
+            )
+            if magic != STORE_MAGIC:
+                raise ValueError("Not a record store file")
+            self._mmap.seek(0)
+            self.fields = _read_header(self._mmap)
+        except Exception:
+            self._mmap.close()
+            raise
+        self._decode = _decoder(record_cls, self.fields, attrs)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        """Return the record at index, or a list of records for a slice"""
+        if isinstance(index, slice):
+            return [
+                self._record(idx)
+                for idx in range(*index.indices(self._length))
+            ]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("store index out of range")
+        return self._record(index)
+
+    def __iter__(self):
+        """Iterate over records, reading them in order"""
+        mm = self._mmap
+        decode = self._decode
+        unpack_length = _LENGTH.unpack_from
+        length_size = _LENGTH.size
+        pos = self._offset(0) if self._length else 0
+        for _ in range(self._length):
+            start = pos + length_size
+            pos = start + unpack_length(mm, pos)[0]
+            yield decode(bytearray(mm[start:pos]))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __repr__(self):
+        return "<{}, {}, {} records>".format(
+            self.__class__.__name__, self.record_cls.__name__, self._length
+        )
+
+    def _offset(self, index):
+        """Return the offset of the record at index"""
+        return _OFFSET.unpack_from(
+            self._mmap, self._index_offset + index * _OFFSET.size
+        )[0]
+
+    def _record(self, index):
+        """Decode the record at index"""
+        mm = self._mmap
+        pos = self._offset(index)
+        start = pos + _LENGTH.size
+        end = start + _LENGTH.unpack_from(mm, pos)[0]
+        return self._decode(bytearray(mm[start:end]))
+
+    def close(self):
+        """Close the store, records can no longer be accessed"""
+        self._mmap.close()
+
+
+# Public Functions
+def write_store(records, path, fields=None):
+    """
+    Write records to a store file at path, that can be read with
+    RecordStore.
+
+    The fields stored are taken from the first record unless supplied.
+    All records should be of the same class.
+
+    :param records: iterable of records
+    :param path: path of the file to write
+    :type path: str
+    :param fields: fields to store
+    :type fields: Sequence
+    :return: number of records written
+    :rtype: int
+    """
+    records = iter(records)
+    first = None
+    if fields is None:
+        first = next(records, None)
+        fields = _record_fields(first) if first is not None else ()
+    fields = tuple(fields)
+    offsets = []
+    with open(path, 'wb') as fileobj:
+        write = fileobj.write
+        write(_encode_header(fields))
+        pos = fileobj.tell()
+        pack_length = _LENGTH.pack
+        if first is not None:
+            records = itertools.chain([first], records)
+        for record in records:
+            payload = _encode_payload(record, fields)
+            offsets.append(pos)
+            write(pack_length(len(payload)))
+            write(payload)
+            pos += _LENGTH.size + len(payload)
+        _write_index(fileobj, offsets)
+    return len(offsets)
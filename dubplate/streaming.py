@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+copyright (c) 2016-2017 Earth Advantage. All rights reserved.
+..codeauthor::Paul Munday <paul@paulmunday.net>
+
+Stream records to and from files.
+"""
+
+# Imports from Standard Library
+import csv
+import gzip
+import json
+
+# Imports from Third Party Modules
+
+# Local Imports
+from dubplate import FastRecordJSONEncoder
+
+# Constants
+READ_FORMATS = ('jsonl', 'csv')
+WRITE_FORMATS = ('jsonl', 'array')
+ERROR_POLICIES = ('raise', 'skip', 'collect')
+CHUNK_SIZE = 1000
+
+
+# Private Functions
+def _write_chunks(records, write, fmt, chunk_size):
+    """Encode records and pass them to write in chunks"""
+    encode = FastRecordJSONEncoder().encode
+    count = 0
+    chunk = []
+    if fmt == 'array':
+        write('[')
+    for record in records:
+        chunk.append(encode(record))
+        count += 1
+        if len(chunk) == chunk_size:
+            _write_chunk(chunk, write, fmt, count > chunk_size)
+            chunk = []
+    if chunk:
+        _write_chunk(chunk, write, fmt, count > len(chunk))
+    if fmt == 'array':
+        write(']')
+    return count
+
+
+def _write_chunk(chunk, write, fmt, follows):
+    """Write encoded records, follows is True if not the first chunk"""
+    if fmt == 'jsonl':
+        write('\n'.join(chunk) + '\n')
+    else:
+        write((', ' if follows else '') + ', '.join(chunk))
+
+
+def _iter_jsonl(fileobj):
+    """
+    Yield (line number, line) from a JSON lines file, skipping blank
+    lines. Lines are decoded by the caller, so errors can be reported
+    with the line number.
+    """
+    for line_num, line in enumerate(fileobj, 1):
+        line = line.strip()
+        if line:
+            yield line_num, line
+
+
+def _iter_csv(fileobj, fieldnames=None):
+    """Yield (line number, dict) from a csv file, converting '' to None"""
+    reader = csv.DictReader(fileobj, fieldnames=fieldnames)
+    for row in reader:
+        yield reader.line_num, {
+            key: (None if val == '' else val) for key, val in row.items()
+        }
+
+
+# Public Classes
+class RecordReader(object):
+    """
+    Iterate over records of record_cls read from a file object.
+
+    Each row is read, validated and turned into a record one at a time
+    so memory use does not depend on the size of the input. Rows are
+    validated using the same rules as the record_cls constructor
+    (fields, non_null_fields & require_all_fields).
+
+    fmt is 'jsonl' (one JSON object per line) or 'csv'. For csv, fieldnames
+    are read from the first row unless supplied and empty values are
+    treated as None.
+
+    errors determines what happens when a row can not be parsed or fails
+    validation:
+    'raise': raise the error (a ValueError or KeyError)
+    'skip': ignore the row
+    'collect': ignore the row but record the error in the errors attribute,
+    a dict mapping line number to the error.
+
+    N.B. As with Record.from_rows, records are created without calling
+    __init__, attrs is an optional dict of attributes to set on each record.
+
+    :Example:
+
+    >>> with open('buildings.jsonl') as fileobj:
+    ...     reader = RecordReader(Building, fileobj, errors='collect')
+    ...     for building in reader:
+    ...         process(building)
+    >>> reader.errors
+    {3: KeyError('The following field is required: address')}
+    """
+
+    def __init__(self, record_cls, fileobj, fmt='jsonl', attrs=None,
+                 errors='raise', fieldnames=None):
+        if fmt not in READ_FORMATS:
+            raise ValueError(
+                "fmt must be one of: {}".format(", ".join(READ_FORMATS))
+            )
+        if errors not in ERROR_POLICIES:
+            raise ValueError(
+                "errors must be one of: {}".format(", ".join(ERROR_POLICIES))
+            )
+        self.record_cls = record_cls
+        self.fileobj = fileobj
+        self.fmt = fmt
+        self.attrs = attrs
+        self.error_policy = errors
+        self.fieldnames = fieldnames
+        self.errors = {}
+
+    def _iter_rows(self):
+        """Yield (line number, row) pairs, row may be a str to decode"""
+        if self.fmt == 'csv':
+            return _iter_csv(self.fileobj, self.fieldnames)
+        return _iter_jsonl(self.fileobj)
+
+    def __iter__(self):
+        # pylint:disable=protected-access
+        record_cls = self.record_cls
+        schema = record_cls._schema
+        build = schema.build
+        require_all_fields = schema.require_all_fields
+        from_record = record_cls._from_record
+        attrs = self.attrs
+        policy = self.error_policy
+        for line_num, row in self._iter_rows():
+            try:
+                if not isinstance(row, dict):
+                    row = json.loads(row)
+                    if not isinstance(row, dict):
+                        raise ValueError("Expected a JSON object")
+                elif None in row:
+                    # csv.DictReader puts extra values under None
+                    raise ValueError("Row has more values than fieldnames")
+                record = build(row, require_all_fields)
+            except (KeyError, ValueError) as err:
+                if policy == 'raise':
+                    raise
+                elif policy == 'collect':
+                    self.errors[line_num] = err
+                continue
+            yield from_record(record, attrs)
+
+
+# Public Functions
+def load_records(record_cls, fileobj, fmt='jsonl', attrs=None,
+                 errors='raise', fieldnames=None):
+    """
+    Return a RecordReader that lazily loads records of record_cls
+    from fileobj. See RecordReader.
+    """
+    return RecordReader(
+        record_cls, fileobj, fmt=fmt, attrs=attrs, errors=errors,
+        fieldnames=fieldnames
+    )
+
+
+def dump_records(records, fileobj, fmt='jsonl', compress=False,
+                 chunk_size=CHUNK_SIZE):
+    """
+    Write records to fileobj as JSON.
+
+    fmt is 'jsonl' (one JSON object per line) or 'array' (a JSON array).
+    Records are encoded the same way as Record.json(), converting dates,
+    datetimes and nested records, with a single encoder and written
+    chunk_size records at a time.
+
+    If compress is True the output is gzipped, fileobj must then be opened
+    in binary mode.
+
+    :param records: iterable of records
+    :param fileobj: file like object to write to
+    :param fmt: 'jsonl' or 'array'
+    :type fmt: str
+    :param compress: gzip output
+    :type compress: bool
+    :param chunk_size: number of records per write
+    :type chunk_size: int
+    :return: number of records written
+    :rtype: int
+    """
+    if fmt not in WRITE_FORMATS:
+        raise ValueError(
+            "fmt must be one of: {}".format(", ".join(WRITE_FORMATS))
+        )
+    if not compress:
+        return _write_chunks(records, fileobj.write, fmt, chunk_size)
+    gzip_file = gzip.GzipFile(fileobj=fileobj, mode='wb')
+    try:
+        return _write_chunks(
+            records, lambda data: gzip_file.write(data.encode('utf-8')),
+            fmt, chunk_size
+        )
+    finally:
+        gzip_file.close()
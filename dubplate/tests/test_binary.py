@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+copyright (c) 2016-2017 Earth Advantage. All rights reserved.
+..codeauthor::Paul Munday <paul@paulmunday.net>
+
+Unit tests for dubplate.binary.
+"""
+# Imports from Standard Library
+import datetime
+import decimal
+import unittest
+
+# Imports from Third Party Modules
+from six import BytesIO
+
+# Local Imports
+from dubplate import Record
+from dubplate.binary import (
+    decode_record, dump_records, encode_record, load_records
+)
+
+
+class TstRecord(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    __slots__ = ['service']
+    fields = ('a', 'b', 'c')
+    non_null_fields = ('a',)
+
+    def __init__(self, service, *args, **kwargs):
+        self.service = service
+        super(TstRecord, self).__init__(*args, **kwargs)
+
+
+class ReorderedRecord(TstRecord):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = ('c', 'b', 'a')
+
+
+class NoFieldsRecord(TstRecord):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = None
+    record_backend = 'native'
+
+
+class OwnerRecord(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = ('name',)
+
+
+class TypedRecord(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = ('a', 'owner')
+    field_types = {'a': int, 'owner': OwnerRecord}
+
+
+class ReorderedTypedRecord(TypedRecord):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = ('owner', 'a')
+
+
+class BinaryTests(unittest.TestCase):
+    """Test encoding and decoding records"""
+
+    def setUp(self):
+        self.values = [
+            None, True, False, 0, -1, 2 ** 62, 2 ** 70, -2 ** 70, 1.5,
+            decimal.Decimal('1.10'), decimal.Decimal('-1E+30'),
+            u'text', u'été', u'', b'\x00bytes',
+            datetime.date(2017, 1, 31),
+            datetime.datetime(2017, 1, 31, 12, 30, 15, 500),
+            [1, u'a', None], (1, (2, 3)), {u'key': [u'value']},
+        ]
+
+    def test_round_trip(self):
+        for value in self.values:
+            record = TstRecord('service', a=1, b=value)
+            new = decode_record(
+                TstRecord, encode_record(record), attrs={'service': 'other'}
+            )
+            self.assertEqual(new, record)
+            self.assertEqual(type(new['b']), type(record['b']))
+            self.assertIsInstance(new, TstRecord)
+            self.assertEqual(new.service, 'other')
+
+    def test_decimal(self):
+        value = decimal.Decimal('0.1000000000000000000000000001')
+        record = TstRecord('service', a=value, b=decimal.Decimal('1.10'))
+        new = decode_record(TstRecord, encode_record(record))
+        self.assertEqual(new['a'], value)
+        # exponents, and so trailing zeros, are kept
+        self.assertEqual(str(new['b']), '1.10')
+        new = decode_record(
+            TstRecord, encode_record(
+                TstRecord('service', a=1, b=decimal.Decimal('-Infinity'))
+            )
+        )
+        self.assertEqual(new['b'], decimal.Decimal('-Infinity'))
+
+    def test_nested(self):
+        nested = TstRecord('service', a=1, b=u'b')
+        record = TstRecord('service', a=nested)
+        new = decode_record(TstRecord, encode_record(record))
+        self.assertEqual(new['a'], {u'a': 1, u'b': u'b', u'c': None})
+
+    def test_field_types(self):
+        record = TypedRecord(a=1, owner=OwnerRecord(name=u'Acme'))
+        data = encode_record(record)
+        # header in the same order as the class fields, and reordered
+        for record_cls in (TypedRecord, ReorderedTypedRecord):
+            new = decode_record(record_cls, data)
+            self.assertIsInstance(new['owner'], OwnerRecord)
+            self.assertEqual(new['owner'], record['owner'])
+            self.assertEqual(new['a'], 1)
+
+    def test_stream(self):
+        records = [
+            TstRecord('service', a=idx, b=value)
+            for idx, value in enumerate(self.values)
+        ]
+        fileobj = BytesIO()
+        self.assertEqual(dump_records(records, fileobj), len(records))
+        fileobj.seek(0)
+        self.assertEqual(list(load_records(TstRecord, fileobj)), records)
+
+        # fields are matched by name
+        fileobj.seek(0)
+        new = list(load_records(ReorderedRecord, fileobj))
+        self.assertEqual(new, records)
+        self.assertEqual(list(new[0].keys()), ['c', 'b', 'a'])
+
+        # empty
+        fileobj = BytesIO()
+        self.assertEqual(dump_records([], fileobj), 0)
+        fileobj.seek(0)
+        self.assertEqual(list(load_records(TstRecord, fileobj)), [])
+
+    def test_no_fields(self):
+        records = [
+            NoFieldsRecord('service', a=1, b=datetime.date(2017, 1, 1)),
+            NoFieldsRecord('service', a=2, d=u'd'),
+        ]
+        fileobj = BytesIO()
+        dump_records(records, fileobj)
+        fileobj.seek(0)
+        self.assertEqual(list(load_records(NoFieldsRecord, fileobj)), records)
+
+    def test_validation(self):
+        records = [TstRecord('service', a=1, b=2)]
+        fileobj = BytesIO()
+        dump_records(records, fileobj, fields=('b',))
+        fileobj.seek(0)
+        with self.assertRaises(KeyError) as conm:
+            list(load_records(TstRecord, fileobj))
+        self.assertEqual(
+            str(conm.exception), "'The following field is required: a'"
+        )
+
+    def test_errors(self):
+        data = encode_record(TstRecord('service', a=1, b=u'text'))
+        self.assertRaises(ValueError, decode_record, TstRecord, data[:-1])
+        self.assertRaises(ValueError, decode_record, TstRecord, b'JSON')
+        self.assertRaises(ValueError, decode_record, TstRecord, data + data)
+        self.assertRaises(
+            TypeError, encode_record, TstRecord('service', a=object())
+        )
@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+copyright (c) 2016-2017 Earth Advantage. All rights reserved.
+..codeauthor::Paul Munday <paul@paulmunday.net>
+
+Unit tests for dubplate.codegen.
+"""
+# Imports from Standard Library
+import unittest
+
+# Imports from Third Party Modules
+from frozendict import FrozenOrderedDict, frozendict
+
+# Local Imports
+from dubplate import INTERN_POOL, ImmutableDict, Record, RecordTuple
+from dubplate.codegen import compile_record
+
+
+class TstRecord(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    __slots__ = ['service', 'test']
+
+    def __init__(self, service, test, *args, **kwargs):
+        self.service = service
+        self.test = test
+        super(TstRecord, self).__init__(*args, **kwargs)
+
+
+class FieldRecord(TstRecord):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = ('a', 'b', 'c')
+    non_null_fields = ('a', 'b')
+
+
+class RequiredFieldRecord(TstRecord):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    non_null_fields = ('a', 'b')
+
+
+class RequireAllFieldsRecord(FieldRecord):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    require_all_fields = True
+
+
+class TypedFieldRecord(FieldRecord):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    field_types = {'a': int, 'c': float}
+
+
+class TypedRecord(TstRecord):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    field_types = {'a': int}
+
+
+class CompileRecordTests(unittest.TestCase):
+    """Test compile_record"""
+
+    def compiled(self, record_cls, **attrs):
+        """Return a compiled subclass of record_cls"""
+        attrs['__slots__'] = ()
+        return compile_record(
+            type('Compiled' + record_cls.__name__, (record_cls,), attrs),
+            replace_init=True
+        )
+
+    def assert_same(self, record_cls, compiled_cls, *args, **kwargs):
+        """Assert both classes create equal records or raise the same error"""
+        try:
+            expected = record_cls(*args, **kwargs)
+        except KeyError as err:
+            with self.assertRaises(KeyError) as conm:
+                compiled_cls(*args, **kwargs)
+            self.assertEqual(str(conm.exception), str(err))
+            return
+        record = compiled_cls(*args, **kwargs)
+        self.assertEqual(record, expected)
+        self.assertEqual(list(record.keys()), list(expected.keys()))
+        self.assertIs(
+            type(record._Record__record), type(expected._Record__record)
+        )
+        self.assertEqual(record.require_all_fields,
+                         expected.require_all_fields)
+        for slot in TstRecord.__slots__:
+            self.assertEqual(getattr(record, slot), getattr(expected, slot))
+        with self.assertRaises(TypeError):
+            record.service = 'other'
+
+    def test_compile_record(self):
+        rows = [
+            {'a': 1, 'b': 2, 'c': 3}, {'a': 1, 'b': 2}, {'a': 1},
+            {'a': 1, 'b': None}, {'a': 1, 'b': 2, 'c': 3, 'd': 4}, {},
+            {'b': 2, 'c': 3, 'd': 4, 'e': 5}
+        ]
+        for record_cls in (FieldRecord, RequiredFieldRecord,
+                           RequireAllFieldsRecord, TstRecord):
+            for backend in ('frozendict', 'native', 'tuple'):
+                base_cls = type(record_cls.__name__, (record_cls,), {
+                    '__slots__': (), 'record_backend': backend
+                })
+                compiled_cls = self.compiled(base_cls)
+                for row in rows:
+                    self.assert_same(
+                        base_cls, compiled_cls, 'service', 'test', **row
+                    )
+
+    def test_field_types(self):
+        rows = [
+            {'a': '1', 'b': 2, 'c': '3.5'}, {'a': 1, 'b': '2'},
+            {'a': 'x', 'b': 2}, {'a': None, 'b': 2}, {'b': 2, 'c': 'y'}
+        ]
+        for record_cls in (TypedFieldRecord, TypedRecord):
+            for backend in ('frozendict', 'tuple'):
+                base_cls = type(record_cls.__name__, (record_cls,), {
+                    '__slots__': (), 'record_backend': backend
+                })
+                compiled_cls = self.compiled(base_cls)
+                for row in rows:
+                    self.assert_same(
+                        base_cls, compiled_cls, 'service', 'test', **row
+                    )
+        record = self.compiled(TypedFieldRecord)('service', 'test', a='1', b=2)
+        self.assertEqual(record['a'], 1)
+
+    def test_intern_fields(self):
+        for record_cls in (FieldRecord, TstRecord):
+            for backend in ('frozendict', 'tuple'):
+                compiled_cls = self.compiled(
+                    record_cls, record_backend=backend, intern_fields=('c',)
+                )
+                INTERN_POOL.clear()
+                records = [
+                    compiled_cls(
+                        'service', 'test', a=1, b=2,
+                        c=''.join(list('Portland'))
+                    )
+                    for _ in range(2)
+                ]
+                self.assertEqual(records[0]['c'], 'Portland')
+                self.assertIs(records[0]['c'], records[1]['c'])
+                self.assertEqual(len(INTERN_POOL), 1)
+                self.assert_same(
+                    type(record_cls.__name__, (record_cls,), {
+                        '__slots__': (), 'record_backend': backend,
+                        'intern_fields': ('c',)
+                    }),
+                    compiled_cls, 'service', 'test', a=1, b=2, c='x'
+                )
+
+    def test_storage(self):
+        record = self.compiled(FieldRecord)('service', 'test', a=1, b=2)
+        self.assertIsInstance(record._Record__record, FrozenOrderedDict)
+        record = self.compiled(RequiredFieldRecord)(
+            'service', 'test', a=1, b=2
+        )
+        self.assertIsInstance(record._Record__record, frozendict)
+        record = self.compiled(FieldRecord, record_backend='native')(
+            'service', 'test', a=1, b=2
+        )
+        self.assertIsInstance(record._Record__record, ImmutableDict)
+        record = self.compiled(FieldRecord, record_backend='tuple')(
+            'service', 'test', a=1, b=2
+        )
+        self.assertIsInstance(record._Record__record, RecordTuple)
+
+    def test_slots(self):
+        @compile_record(replace_init=True)
+        class SlotsRecord(FieldRecord):
+            # pylint:disable=slots-on-old-class,too-few-public-methods
+            __slots__ = ['extra', '__private']
+
+        record = SlotsRecord('service', 'test', 'extra', 'private', a=1, b=2)
+        self.assertEqual(record.service, 'service')
+        self.assertEqual(record.extra, 'extra')
+        self.assertEqual(record._SlotsRecord__private, 'private')
+        self.assertIn('def __init__(self, service, test, extra, __private',
+                      SlotsRecord._init_source)
+
+    def test_subclass(self):
+        compiled_cls = self.compiled(FieldRecord)
+
+        class SubRecord(compiled_cls):
+            # pylint:disable=slots-on-old-class,too-few-public-methods
+            fields = ('a', 'b', 'c', 'd')
+
+        record = SubRecord('service', 'test', a=1, b=2, d=4)
+        self.assertEqual(record, {'a': 1, 'b': 2, 'c': None, 'd': 4})
+        self.assertEqual(record.service, 'service')
+        self.assertRaises(KeyError, SubRecord, 'service', 'test', a=1)
+
+    def test_existing_init(self):
+        """An existing __init__ is only replaced if replace_init is set"""
+        with self.assertRaises(TypeError) as conm:
+            compile_record(type('Sub', (FieldRecord,), {'__slots__': ()}))
+        self.assertIn('TstRecord', str(conm.exception))
+
+        class InitRecord(Record):
+            # pylint:disable=slots-on-old-class,too-few-public-methods
+            fields = ('a',)
+
+            def __init__(self, *args, **kwargs):
+                kwargs.setdefault('a', 1)
+                super(InitRecord, self).__init__(*args, **kwargs)
+
+        self.assertRaises(TypeError, compile_record, InitRecord)
+
+        # no __init__, or a generated one, is fine
+        compiled_cls = compile_record(
+            type('NoInit', (Record,), {'__slots__': (), 'fields': ('a',)})
+        )
+        self.assertEqual(compiled_cls(a=1), {'a': 1})
+        sub_cls = compile_record(
+            type('Sub', (compiled_cls,), {'__slots__': ['x']})
+        )
+        self.assertEqual(sub_cls('x', a=2).x, 'x')
+
+    def test_bad_slot_names(self):
+        for name in ('args', 'kwargs', 'self', '_v0', '_c1', '_schema',
+                     '_get', 'class'):
+            record_cls = type('BadSlot', (Record,), {'__slots__': [name]})
+            with self.assertRaises(TypeError) as conm:
+                compile_record(record_cls)
+            self.assertIn(repr(name), str(conm.exception))
+        record_cls = type('Redeclared', (TstRecord,), {'__slots__': ['test']})
+        self.assertRaises(
+            TypeError, compile_record, record_cls, replace_init=True
+        )
+
+    def test_not_record(self):
+        self.assertRaises(TypeError, compile_record, dict)
+        self.assertRaises(TypeError, compile_record, object())
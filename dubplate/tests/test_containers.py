@@ -0,0 +1,270 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+copyright (c) 2016-2017 Earth Advantage. All rights reserved.
+..codeauthor::Paul Munday <paul@paulmunday.net>
+
+Unit tests for dubplate.containers.
+"""
+# Imports from Standard Library
+import unittest
+from array import array
+
+# Imports from Third Party Modules
+
+# Local Imports
+from dubplate import Record
+from dubplate.containers import RecordCollection, RecordTable
+
+# Constants
+
+
+class TstRecord(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    __slots__ = ['service']
+    fields = ('name', 'city', 'score')
+    non_null_fields = ('name',)
+
+    def __init__(self, service, *args, **kwargs):
+        self.service = service
+        super(TstRecord, self).__init__(*args, **kwargs)
+
+
+class TupleRecord(TstRecord):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    record_backend = 'tuple'
+
+
+class TypedRecord(TstRecord):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    non_null_fields = ('name', 'score')
+    field_types = {'score': float, 'city': str}
+
+
+class RecordTableTests(unittest.TestCase):
+    """Test RecordTable"""
+
+    def setUp(self):
+        self.rows = [
+            TstRecord('api', name='a', city='Portland', score=75),
+            {'name': 'b', 'city': 'Bend', 'score': 90},
+            ('c', None, 60),
+        ]
+        self.table = RecordTable(
+            TstRecord, self.rows, attrs={'service': 'table'},
+            column_types={'score': 'l'}
+        )
+
+    def test_columns(self):
+        self.assertEqual(len(self.table), 3)
+        self.assertEqual(self.table.fields, ('name', 'city', 'score'))
+        self.assertEqual(self.table.column('name'), ['a', 'b', 'c'])
+        self.assertEqual(
+            self.table.column('city'), ['Portland', 'Bend', None]
+        )
+        self.assertEqual(self.table.column('score'), array('l', [75, 90, 60]))
+        self.assertRaises(KeyError, self.table.column, 'other')
+
+    def test_rows(self):
+        record = self.table[1]
+        self.assertIsInstance(record, TstRecord)
+        self.assertEqual(record, {'name': 'b', 'city': 'Bend', 'score': 90})
+        self.assertEqual(record.service, 'table')
+        self.assertEqual(self.table[-1]['name'], 'c')
+        self.assertRaises(IndexError, self.table.__getitem__, 3)
+        self.assertEqual(
+            [record['name'] for record in self.table], ['a', 'b', 'c']
+        )
+        sliced = self.table[1:]
+        self.assertIsInstance(sliced, RecordTable)
+        self.assertEqual(sliced.column('name'), ['b', 'c'])
+
+        # uses the record_cls backend
+        table = RecordTable(TupleRecord, self.rows[1:])
+        self.assertEqual(
+            table[0], TupleRecord(None, name='b', city='Bend', score=90)
+        )
+
+    def test_validation(self):
+        self.assertRaises(KeyError, self.table.append, {'city': 'Bend'})
+        self.assertRaises(KeyError, self.table.append, ('d', 'Bend'))
+        # None can't be stored in array columns
+        with self.assertRaises(ValueError):
+            self.table.append({'name': 'd', 'score': None})
+        self.assertEqual(len(self.table), 3)
+        self.assertEqual(
+            [len(self.table.column(field)) for field in self.table.fields],
+            [3, 3, 3]
+        )
+        # values too large for an array column
+        with self.assertRaises(ValueError):
+            self.table.append(('d', 'Bend', 2 ** 70))
+        self.assertEqual(
+            [len(self.table.column(field)) for field in self.table.fields],
+            [3, 3, 3]
+        )
+        self.table.append(('e', 'Salem', 3))
+        self.assertEqual(
+            self.table[3], {'name': 'e', 'city': 'Salem', 'score': 3}
+        )
+        self.assertRaises(KeyError, RecordTable, TstRecord, column_types={
+            'other': 'l'
+        })
+
+        class NoFieldsRecord(Record):
+            # pylint:disable=slots-on-old-class,too-few-public-methods
+            pass
+
+        self.assertRaises(ValueError, RecordTable, NoFieldsRecord)
+
+    def test_filter(self):
+        result = self.table.filter(lambda score: score > 70, field='score')
+        self.assertEqual(result.column('name'), ['a', 'b'])
+        self.assertEqual(result.column('score'), array('l', [75, 90]))
+        result = self.table.filter(lambda record: record['city'] is None)
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0]['name'], 'c')
+        self.assertEqual(result[0].service, 'table')
+
+    def test_to_numpy(self):
+        try:
+            import numpy  # pylint:disable=unused-variable
+        except ImportError:
+            self.assertRaises(ImportError, self.table.to_numpy, 'score')
+        else:
+            self.assertEqual(list(self.table.to_numpy('score')), [75, 90, 60])
+
+
+class TypedRecordTableTests(unittest.TestCase):
+    """Test RecordTable with field_types"""
+
+    def test_field_types(self):
+        table = RecordTable(TypedRecord, [
+            {'name': 'a', 'score': '75'}, ('b', 'Bend', 90)
+        ])
+        # array columns are only used if requested
+        self.assertEqual(table.column_types, {})
+        self.assertEqual(table.column('score'), [75.0, 90.0])
+        self.assertEqual(table[0]['score'], 75.0)
+        self.assertRaises(KeyError, table.append, {'name': 'c', 'score': 'x'})
+        self.assertEqual(len(table), 2)
+        table = RecordTable(TypedRecord, column_types={'score': 'd'})
+        table.append({'name': 'a', 'score': '75'})
+        self.assertEqual(table.column('score'), array('d', [75.0]))
+
+
+class Book(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    __slots__ = ['supplier', 'price']
+    fields = ('author', 'title', 'type')
+    non_null_fields = ('title',)
+    hash_index_fields = ('title', 'type')
+
+    def __init__(self, supplier, price, *args, **kwargs):
+        self.supplier = supplier
+        self.price = price
+        kwargs.setdefault('type', 'paperback')
+        super(Book, self).__init__(*args, **kwargs)
+
+
+class RecordCollectionTests(unittest.TestCase):
+    """Test RecordCollection"""
+
+    def setUp(self):
+        self.book1 = Book(
+            'Acme Inc', 25, author='Banana Yoshimoto', title='Moshi Moshi',
+            type='hardback'
+        )
+        self.book2 = Book(
+            "Bob's Books", 20, author='Banana Yoshimoto', title='Moshi Moshi',
+            type='hardback'
+        )
+        self.book3 = Book(
+            'Acme Inc', 14.95, author='Barbara Comyns',
+            title='Our Spoons Came From Woolworths'
+        )
+        self.stock = RecordCollection(
+            [self.book1, self.book2, self.book3],
+            index_fields=('title', 'type'), hash_index=True
+        )
+
+    def test_find(self):
+        self.assertEqual(len(self.stock), 3)
+        books = self.stock.find(title='Moshi Moshi', type='hardback')
+        self.assertEqual(len(books), 2)
+        self.assertIs(books[0], self.book1)
+        self.assertIs(books[1], self.book2)
+        self.assertEqual(self.stock.find(type='paperback'), [self.book3])
+        # non-indexed fields
+        self.assertEqual(
+            self.stock.find(author='Barbara Comyns'), [self.book3]
+        )
+        self.assertEqual(
+            self.stock.find(author='Barbara Comyns', type='hardback'), []
+        )
+        self.assertEqual(self.stock.find(title='Other'), [])
+        self.assertEqual(len(self.stock.find()), 3)
+
+    def test_find_uses_index(self):
+        # only records in the smallest index are checked
+        # pylint:disable=protected-access
+        candidates = self.stock._candidates(
+            {'title': 'Moshi Moshi', 'type': 'paperback'}
+        )
+        self.assertEqual(list(candidates.values()), [self.book3])
+
+    def test_find_equal(self):
+        book = {
+            'author': 'Banana Yoshimoto', 'title': 'Moshi Moshi',
+            'type': 'hardback'
+        }
+        self.assertEqual(
+            self.stock.find_equal(book), [self.book1, self.book2]
+        )
+        book['author'] = None
+        self.assertEqual(self.stock.find_equal(book), [])
+
+    def test_hash_index(self):
+        key = self.book1.get_hash_index_key()
+        self.assertEqual(key, 'Book:title:Moshi Moshi:type:hardback')
+        self.assertEqual(
+            self.stock.find_by_hash_index_key(key), [self.book1, self.book2]
+        )
+        self.assertEqual(self.stock.find_by_hash_index_key('Book:other'), [])
+        self.assertRaises(
+            ValueError, RecordCollection().find_by_hash_index_key, key
+        )
+
+    def test_add_remove(self):
+        self.stock.remove(self.book1)
+        self.assertNotIn(self.book1, self.stock)
+        self.assertIn(self.book2, self.stock)
+        self.assertEqual(
+            self.stock.find(title='Moshi Moshi'), [self.book2]
+        )
+        self.assertEqual(
+            self.stock.find_by_hash_index_key(
+                self.book1.get_hash_index_key()
+            ),
+            [self.book2]
+        )
+        self.assertRaises(ValueError, self.stock.remove, self.book1)
+        self.stock.discard(self.book1)
+
+        self.stock.remove(self.book2)
+        self.assertEqual(self.stock.find(title='Moshi Moshi'), [])
+        self.assertNotIn('Moshi Moshi', self.stock._indexes['title'])
+
+        # adding the same record twice has no effect
+        self.stock.add(self.book3)
+        self.assertEqual(len(self.stock), 1)
+        self.stock.add(self.book1)
+        self.assertEqual(list(self.stock), [self.book3, self.book1])
+
+    def test_unhashable_values(self):
+        record = TstRecord('api', name=['a', 'b'], score=1)
+        collection = RecordCollection([record], index_fields=('name',))
+        self.assertEqual(collection.find(name=['a', 'b']), [record])
+        self.assertEqual(collection.find(name=('a', 'b')), [])
+        collection.remove(record)
+        self.assertEqual(len(collection), 0)
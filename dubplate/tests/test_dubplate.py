@@ -7,17 +7,26 @@ copyright (c) 2016-2017 Earth Advantage. All rights reserved.
 Unit tests for dubplate.
 """
 # Imports from Standard Library
+import copy
 import datetime
+import decimal
 import json
+import pickle
 import sys
 import six
 import unittest
 
 # Imports from Third Party Modules
-from frozendict import frozendict
+from frozendict import FrozenOrderedDict, frozendict
 
 # Local Imports
-from dubplate import Record, empty_slot
+import dubplate
+from dubplate import (
+    INTERN_POOL, BatchValidationError, FastRecordJSONEncoder, ImmutableDict,
+    InternPool, Record, RecordCache,
+    RecordJSONEncoder, RecordPatch, RecordSchema, RecordTuple, empty_slot,
+    generate_hash_index_key, generate_hash_index_keys
+)
 
 PY3 = sys.version_info[0] == 3
 if PY3:
@@ -46,6 +55,45 @@ class FieldRecord(TstRecord):
     non_null_fields = ('a', 'b')
 
 
+class OwnerRecord(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = ('name', 'since')
+    non_null_fields = ('name',)
+    field_types = {'since': datetime.date}
+
+
+class TypedRecord(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    __slots__ = ['source']
+    fields = ('name', 'created', 'built', 'owner', 'owners', 'dates')
+    non_null_fields = ('name',)
+    field_types = {
+        'created': datetime.datetime, 'built': datetime.date,
+        'owner': OwnerRecord, 'owners': [OwnerRecord],
+        'dates': [datetime.date], 'name': six.text_type
+    }
+
+
+class CoercedRecord(TstRecord):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = ('count', 'price', 'ratio', 'active', 'opened', 'label')
+    non_null_fields = ('count',)
+    field_types = {
+        'count': int, 'price': decimal.Decimal, 'ratio': float,
+        'active': bool, 'opened': datetime.date, 'label': six.text_type
+    }
+
+
+class CoercedDictRecord(TstRecord):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    field_types = {'count': int}
+
+
+class ConvertFieldRecord(FieldRecord):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    convert_fields = ('a', 'c')
+
+
 class RequiredFieldRecord(TstRecord):
     # pylint:disable=slots-on-old-class,too-few-public-methods
     non_null_fields = ('a', 'b')
@@ -68,6 +116,21 @@ class HashIndexSlotsRecord(TstRecord):
     hash_index_fields = ('test', 'a', 'b')
 
 
+class NativeRecord(TstRecord):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    record_backend = 'native'
+
+
+class NativeFieldRecord(FieldRecord):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    record_backend = 'native'
+
+
+class TupleFieldRecord(FieldRecord):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    record_backend = 'tuple'
+
+
 class RecordTests(unittest.TestCase):
     """Test base record class"""
 
@@ -441,3 +504,1161 @@ class RecordTests(unittest.TestCase):
             slot_rec.__class__.__name__, slot_rec.hash_index_fields,
             expected_val_dict
         )
+
+    def test_schema(self):
+        """Test schema is computed once per class"""
+        schema = FieldRecord._schema
+        self.assertIsInstance(schema, RecordSchema)
+        self.assertEqual(schema.fields, ('a', 'b', 'c'))
+        self.assertEqual(schema.field_set, frozenset(['a', 'b', 'c']))
+        self.assertEqual(schema.field_index, {'a': 0, 'b': 1, 'c': 2})
+        self.assertEqual(schema.non_null_fields, ('a', 'b'))
+        self.assertFalse(schema.dynamic)
+
+        # subclasses get their own schema
+        self.assertIsNot(RequireAllFieldsRecord._schema, schema)
+        self.assertEqual(RequiredFieldRecord._schema.fields, ())
+
+        # schema is shared by instances
+        rec = FieldRecord('red', 1, a=2, b=3)
+        self.assertIs(rec._schema, schema)
+
+        # fields not set as class variables may be set on the instance
+        self.assertEqual(
+            TstRecord._schema.dynamic, ('fields', 'non_null_fields')
+        )
+        # but the class schema is used unless they are
+        rec = TstRecord('red', 1, a=1)
+        self.assertIs(TstRecord._schema.for_instance(rec), TstRecord._schema)
+        fields_only = type('FieldsOnly', (TstRecord,), {'fields': ('a',)})
+        self.assertEqual(fields_only._schema.dynamic, ('non_null_fields',))
+        rec = fields_only('red', 1, a=1)
+        self.assertIs(
+            fields_only._schema.for_instance(rec), fields_only._schema
+        )
+
+        class InstanceFieldRecord(TstRecord):
+            # pylint:disable=slots-on-old-class,too-few-public-methods
+            def __init__(self, service, test, **kwargs):
+                self.fields = ('a', 'b')
+                super(InstanceFieldRecord, self).__init__(
+                    service, test, **kwargs
+                )
+
+        with self.assertRaises(KeyError):
+            InstanceFieldRecord('red', 1, a=1, b=2, d=3)
+        rec = InstanceFieldRecord('red', 1, b=2, a=1)
+        self.assertEqual(list(rec.keys()), ['a', 'b'])
+
+    def test_from_dict(self):
+        """Test from_dict classmethod"""
+        record = FieldRecord.from_dict(
+            {'a': 1, 'b': 2}, service='service', test='test'
+        )
+        self.assertIsInstance(record, FieldRecord)
+        self.assertEqual(record, FieldRecord('service', 'test', a=1, b=2))
+        self.assertEqual(record.service, 'service')
+        self.assertEqual(record.test, 'test')
+        self.assertEqual(record.require_all_fields, False)
+        with self.assertRaises(TypeError):
+            record.service = 'other'
+        with self.assertRaises(KeyError) as conm:
+            FieldRecord.from_dict({'a': 1, 'b': None})
+        self.assertEqual(
+            str(conm.exception), "'The following field can not be None: b'"
+        )
+        self.assertRaises(
+            KeyError, RequireAllFieldsRecord.from_dict, {'a': 1, 'b': 2}
+        )
+        self.assertRaises(
+            KeyError, TstRecord.from_dict, {'a': 1, 'b': 2},
+            require_all_fields=True, fields=('a', 'b', 'c')
+        )
+
+        # fields etc. can be set as attributes
+        record = TstRecord.from_dict(
+            {'a': 1}, fields=('a', 'b'), non_null_fields=('a',)
+        )
+        self.assertEqual(list(record.keys()), ['a', 'b'])
+        self.assertRaises(
+            KeyError, TstRecord.from_dict, {'b': 1}, non_null_fields=('a',)
+        )
+
+    def test_from_rows(self):
+        """Test from_rows classmethod"""
+        rows = [(1, 2, 3), {'a': 4, 'b': 5}, [6, 7, None]]
+        records = FieldRecord.from_rows(
+            rows, attrs={'service': 'service', 'test': 'test'}
+        )
+        self.assertEqual(len(records), 3)
+        for record in records:
+            self.assertIsInstance(record, FieldRecord)
+            self.assertEqual(record.service, 'service')
+            self.assertEqual(list(record.keys()), ['a', 'b', 'c'])
+        self.assertEqual(
+            records[0], FieldRecord('service', 'test', a=1, b=2, c=3)
+        )
+        self.assertEqual(records[1], {'a': 4, 'b': 5, 'c': None})
+        self.assertEqual(records[2], {'a': 6, 'b': 7, 'c': None})
+
+        # records are immutable
+        with self.assertRaises(TypeError):
+            records[0].service = 'other'
+
+        # all failures are reported
+        rows = [
+            (1, 2, 3), (1, None, 3), {'a': 1, 'b': 2, 'c': 3, 'd': 4},
+            (1, 2), {'a': 1, 'b': 2}
+        ]
+        with self.assertRaises(BatchValidationError) as conm:
+            FieldRecord.from_rows(rows)
+        self.assertIsInstance(conm.exception, KeyError)
+        self.assertEqual(sorted(conm.exception.errors), [1, 2, 3])
+        # records from valid rows are kept
+        self.assertEqual(
+            conm.exception.records,
+            [{'a': 1, 'b': 2, 'c': 3}, {'a': 1, 'b': 2, 'c': None}]
+        )
+        self.assertEqual(
+            str(conm.exception.errors[1]),
+            "'The following field can not be None: b'"
+        )
+        self.assertEqual(
+            str(conm.exception), "'Validation failed for rows: 1, 2, 3'"
+        )
+
+        # valid records are still yielded when lazy
+        records = RequireAllFieldsRecord.from_rows(
+            [(1, 2, 3), {'a': 1, 'b': 2}], lazy=True
+        )
+        self.assertEqual(next(records), {'a': 1, 'b': 2, 'c': 3})
+        with self.assertRaises(BatchValidationError) as conm:
+            next(records)
+        self.assertEqual(list(conm.exception.errors), [1])
+        self.assertIsNone(conm.exception.records)
+
+        # rows must be dicts if fields is not set
+        self.assertRaises(TypeError, TstRecord.from_rows, [(1, 2)])
+        records = TstRecord.from_rows([{'x': 1}])
+        self.assertEqual(records[0], {'x': 1})
+
+    def test_record_json_encoder(self):
+        """Test RecordJSONEncoder only converts what it needs to"""
+        dtime = datetime.datetime(2001, 1, 1, 1, 1, 1, 100)
+        date = datetime.date(2001, 1, 1)
+        encoder = RecordJSONEncoder()
+        # nothing to convert, record data is used as it is
+        record = FieldRecord('service', 'test', a=1, b=[1, 'x'], c=1.5)
+        self.assertIs(encoder.default(record), record._as_dict())
+        lst = [1, (2, 3), {'x': None}]
+        record = FieldRecord('service', 'test', a=1, b=lst)
+        self.assertIs(encoder.default(record)['b'], lst)
+        # nested values are only copied if they contain dates
+        record = FieldRecord(
+            'service', 'test', a=1, b=[1, {'x': date}, 3], c={'x': 1}
+        )
+        result = encoder.default(record)
+        self.assertIsNot(result, record._as_dict())
+        self.assertEqual(result['b'], [1, {'x': '2001-01-01'}, 3])
+        self.assertIs(result['c'], record['c'])
+        self.assertEqual(record['b'], [1, {'x': date}, 3])
+        nested = TstRecord('service', 'test', record=record)
+        self.assertEqual(
+            json.loads(encoder.encode(nested)),
+            {'record': {'a': 1, 'b': [1, {'x': '2001-01-01'}, 3],
+                        'c': {'x': 1}}}
+        )
+        # only convert_fields are checked
+        record = ConvertFieldRecord(
+            'service', 'test', a=dtime, b=2, c=[date]
+        )
+        self.assertEqual(
+            encoder.default(record),
+            {'a': '2001-01-01T01:01:01', 'b': 2, 'c': ['2001-01-01']}
+        )
+        record = ConvertFieldRecord('service', 'test', a=1, b=date)
+        self.assertIs(encoder.default(record), record._as_dict())
+        self.assertEqual(ConvertFieldRecord._schema.convert_fields, ('a', 'c'))
+        self.assertIsNone(FieldRecord._schema.convert_fields)
+
+    def test_from_json(self):
+        """Test from_json restores dates, datetimes and nested records"""
+        dtime = datetime.datetime(2001, 1, 1, 1, 1, 1)
+        date = datetime.date(2001, 1, 1)
+        owner = OwnerRecord(name='Acme', since=date)
+        record = TypedRecord(
+            name='Tower', created=dtime, built=date, owner=owner,
+            owners=[owner, OwnerRecord(name='Other')], dates=[date, None]
+        )
+        result = TypedRecord.from_json(record.json(), source='test')
+        self.assertEqual(result, record)
+        self.assertIsInstance(result, TypedRecord)
+        self.assertEqual(result.source, 'test')
+        self.assertIsInstance(result['owner'], OwnerRecord)
+        self.assertEqual(result['owner']['since'], date)
+        self.assertIsInstance(result['owners'][1], OwnerRecord)
+        self.assertIs(type(result['built']), datetime.date)
+        self.assertIs(type(result['created']), datetime.datetime)
+
+        # missing and null values are left as they are
+        result = TypedRecord.from_json('{"name": "Tower", "built": null}')
+        self.assertEqual(result, {
+            'name': 'Tower', 'created': None, 'built': None, 'owner': None,
+            'owners': None, 'dates': None
+        })
+        # microseconds and dates are accepted for datetimes
+        result = TypedRecord.from_json(
+            '{"name": "x", "created": "2001-01-01T01:01:01.000100"}'
+        )
+        self.assertEqual(result['created'], dtime.replace(microsecond=100))
+        result = TypedRecord.from_json(
+            '{"name": "x", "created": "2001-01-01"}'
+        )
+        self.assertEqual(result['created'], datetime.datetime(2001, 1, 1))
+
+        # UTC offsets are kept, including by the fallback parser
+        aware = TypedRecord(
+            name='x', created=dtime.replace(tzinfo=dubplate._timezone(
+                datetime.timedelta(hours=-2, minutes=-30)
+            ))
+        )
+        result = TypedRecord.from_json(aware.json())
+        self.assertEqual(result['created'], aware['created'])
+        self.assertEqual(
+            result['created'].utcoffset(), aware['created'].utcoffset()
+        )
+        for val, offset in (('2001-01-01T01:01:01+02:00', 120),
+                            ('2001-01-01T01:01:01.000100-00:30', -30),
+                            ('2001-01-01T01:01:01', None),
+                            ('2001-01-01', None)):
+            parsed = dubplate._strptime_datetime(val)
+            self.assertEqual(parsed, dubplate._parse_datetime(val))
+            if offset is not None:
+                offset = datetime.timedelta(minutes=offset)
+            self.assertEqual(parsed.utcoffset(), offset)
+        self.assertEqual(
+            dubplate._FixedOffset(datetime.timedelta(hours=2)).tzname(None),
+            'UTC+02:00'
+        )
+
+        # records are validated
+        self.assertRaises(KeyError, TypedRecord.from_json, '{"x": 1}')
+        self.assertRaises(
+            KeyError, TypedRecord.from_json, '{"name": "x", "owner": {}}'
+        )
+        self.assertRaises(KeyError, TypedRecord.from_json,
+                          '{"name": "x", "built": "June"}')
+        self.assertRaises(TypeError, TypedRecord.from_json, '[1]')
+
+        # records without field_types
+        record = FieldRecord('service', 'test', a=1, b='2', c=[3])
+        self.assertEqual(FieldRecord.from_json(record.json()), record)
+
+    def test_field_types(self):
+        """Test field_types are compiled to functions that coerce values"""
+        self.assertEqual(
+            [field for field, _ in TypedRecord._schema.coercers],
+            ['built', 'created', 'dates', 'name', 'owner', 'owners']
+        )
+        self.assertEqual(
+            [idx for idx, _ in TypedRecord._schema.coerce_index],
+            [2, 1, 5, 0, 3, 4]
+        )
+        self.assertEqual(FieldRecord._schema.coercers, ())
+        for field_type in ([int, str], 'int', [None], int()):
+            with self.assertRaises(TypeError):
+                type('BadRecord', (Record,), {
+                    '__slots__': (), 'field_types': {'a': field_type}
+                })
+
+    def test_coerce(self):
+        """Test values are coerced to field_types"""
+        record = CoercedRecord(
+            'service', 'test', count='3', price='1.10', ratio=1,
+            active='False', opened='2001-01-01', label=5
+        )
+        self.assertEqual(record, {
+            'count': 3, 'price': decimal.Decimal('1.10'), 'ratio': 1.0,
+            'active': False, 'opened': datetime.date(2001, 1, 1),
+            'label': u'5'
+        })
+        self.assertIs(type(record['ratio']), float)
+        # None and values of the right type are left as they are
+        date = datetime.date(2001, 1, 1)
+        record = CoercedRecord('service', 'test', count=3, opened=date)
+        self.assertIs(record['opened'], date)
+        self.assertIsNone(record['price'])
+        # but not subclasses of int and date
+        record = CoercedRecord(
+            'service', 'test', count=True,
+            opened=datetime.datetime(2001, 1, 1, 1, 1)
+        )
+        self.assertIs(type(record['count']), int)
+        self.assertEqual(record['count'], 1)
+        self.assertIs(type(record['opened']), datetime.date)
+        self.assertEqual(record['opened'], date)
+        self.assertEqual(json.loads(record.json())['opened'], '2001-01-01')
+        records = CoercedRecord.from_columns({'count': [True, False]})
+        self.assertEqual([type(rec['count']) for rec in records], [int, int])
+        for active, expected in ((1, True), ('0', False), (' yes', True)):
+            record = CoercedRecord('service', 'test', count=1, active=active)
+            self.assertIs(record['active'], expected)
+
+        # floats are converted to Decimal via their repr
+        record = CoercedRecord('service', 'test', count=1, price=19.99)
+        self.assertEqual(record['price'], decimal.Decimal('19.99'))
+        record = CoercedRecord.from_json('{"count": 1, "price": 19.99}')
+        self.assertEqual(record['price'], decimal.Decimal('19.99'))
+        records = CoercedRecord.from_columns(
+            {'count': [1, 2, 3], 'price': [19.99, '0.10', None]}
+        )
+        self.assertEqual(
+            [rec['price'] for rec in records],
+            [decimal.Decimal('19.99'), decimal.Decimal('0.10'), None]
+        )
+        records = CoercedRecord.from_columns(
+            {'count': [1], 'price': [0.1]}
+        )
+        self.assertEqual(records[0]['price'], decimal.Decimal('0.1'))
+
+        # whole numbers are accepted for int fields
+        for count in (3.0, decimal.Decimal('3'), '3', 3):
+            record = CoercedRecord('service', 'test', count=count)
+            self.assertIs(type(record['count']), int)
+            self.assertEqual(record['count'], 3)
+
+        # values that can't be coerced, or would be truncated
+        for kwargs in ({'count': 'x'}, {'count': 1, 'price': 'x'},
+                       {'count': 3.9}, {'count': decimal.Decimal('1.5')},
+                       {'count': float('inf')}, {'count': '3.0'},
+                       {'count': 1, 'active': 'maybe'},
+                       {'count': 1, 'opened': 20010101},
+                       {'count': [1]}):
+            with self.assertRaises(KeyError) as conm:
+                CoercedRecord('service', 'test', **kwargs)
+            self.assertIn('can not be converted', str(conm.exception))
+        # non null fields are checked first
+        self.assertRaises(KeyError, CoercedRecord, 'service', 'test')
+
+        # replace, from_dict, from_rows and records without fields
+        record = CoercedRecord('service', 'test', count=1)
+        self.assertEqual(record.replace(count='2')['count'], 2)
+        self.assertEqual(
+            CoercedRecord.from_dict({'count': '2'})['count'], 2
+        )
+        records = CoercedRecord.from_rows(
+            [('1', '2.5', None, 'true', None, None), {'count': '3'}]
+        )
+        self.assertEqual([rec['count'] for rec in records], [1, 3])
+        self.assertEqual(records[0]['price'], decimal.Decimal('2.5'))
+        with self.assertRaises(BatchValidationError) as conm:
+            CoercedRecord.from_rows([{'count': '1'}, {'count': 'x'}])
+        self.assertEqual(list(conm.exception.errors), [1])
+        record = CoercedDictRecord('service', 'test', count='1', other='2')
+        self.assertEqual(record, {'count': 1, 'other': '2'})
+        self.assertEqual(record.replace(count='5')['count'], 5)
+
+    def test_from_columns(self):
+        """Test from_columns"""
+        records = CoercedRecord.from_columns({
+            'count': ['1', '2', 3], 'price': ['1.5', None, '2'],
+            'active': ['true', 'false', None]
+        }, attrs={'service': 'service'})
+        self.assertEqual(records, [
+            CoercedRecord.from_rows([row])[0] for row in (
+                (1, decimal.Decimal('1.5'), None, True, None, None),
+                (2, None, None, False, None, None),
+                (3, decimal.Decimal('2'), None, None, None, None),
+            )
+        ])
+        self.assertEqual(records[0].service, 'service')
+        # None is left as None in str columns, as in the constructor
+        records = CoercedRecord.from_columns(
+            {'count': [1, 2, 3], 'label': [None, 'x', 5]}
+        )
+        self.assertEqual(
+            [rec['label'] for rec in records], [None, u'x', u'5']
+        )
+        self.assertEqual(CoercedRecord.from_columns({}), [])
+        records = CoercedRecord.from_columns({'count': [1]}, lazy=True)
+        self.assertEqual(next(records), {
+            'count': 1, 'price': None, 'ratio': None, 'active': None,
+            'opened': None, 'label': None
+        })
+
+        with self.assertRaises(BatchValidationError) as conm:
+            CoercedRecord.from_columns({'count': ['1', 'x', None, '4']})
+        self.assertEqual(sorted(conm.exception.errors), [1, 2])
+        self.assertEqual(
+            [rec['count'] for rec in conm.exception.records], [1, 4]
+        )
+        with self.assertRaises(BatchValidationError) as conm:
+            CoercedRecord.from_columns({'count': [1, 2.0, 3.9]})
+        self.assertEqual(sorted(conm.exception.errors), [2])
+        records = CoercedRecord.from_columns({'count': ['1', 2.0]})
+        self.assertEqual([rec['count'] for rec in records], [1, 2])
+        self.assertRaises(
+            KeyError, CoercedRecord.from_columns, {'count': [1], 'x': [1]}
+        )
+        self.assertRaises(
+            ValueError, CoercedRecord.from_columns,
+            {'count': [1], 'price': [1, 2]}
+        )
+        self.assertRaises(ValueError, TstRecord.from_columns, {'a': [1]})
+
+    def test_from_json_bulk(self):
+        """Test from_json_array and from_json_lines"""
+        date = datetime.date(2001, 1, 1)
+        records = [
+            OwnerRecord(name='Owner {}'.format(idx), since=date)
+            for idx in range(3)
+        ]
+        data = '[{}]'.format(', '.join(record.json() for record in records))
+        self.assertEqual(OwnerRecord.from_json_array(data), records)
+        lines = [record.json() + '\n' for record in records]
+        lines.insert(1, '\n')
+        result = OwnerRecord.from_json_lines(lines)
+        self.assertEqual(result, records)
+        result = OwnerRecord.from_json_lines(lines, lazy=True)
+        self.assertEqual(next(result), records[0])
+        self.assertEqual(OwnerRecord.from_json_array('[]'), [])
+        self.assertRaises(TypeError, OwnerRecord.from_json_array, '{}')
+
+        # failing rows are reported together
+        lines = ['{"name": "x"}', '{"since": "2001-01-01"}', '{}']
+        with self.assertRaises(BatchValidationError) as conm:
+            OwnerRecord.from_json_lines(lines)
+        self.assertEqual(sorted(conm.exception.errors), [1, 2])
+        self.assertEqual(len(conm.exception.records), 1)
+
+    def test_fast_json_encoder(self):
+        """Test FastRecordJSONEncoder"""
+        dtime = datetime.datetime(2001, 1, 1, 1, 1, 1, 100)
+        date = datetime.date(2001, 1, 1)
+        json_record = FieldRecord(
+            'service', 'test', a=dtime, b=(date, 1), c={'date': date}
+        )
+        nested = TstRecord(
+            'service', 'test', record=json_record,
+            frozen=frozendict(date=date), lst=[{'datetime': dtime}]
+        )
+
+        # output matches RecordJSONEncoder
+        self.assertEqual(
+            json.loads(json_record.json()),
+            json.loads(RecordJSONEncoder().encode(json_record))
+        )
+        # field order is preserved
+        self.assertEqual(
+            json_record.json(),
+            '{"a": "2001-01-01T01:01:01", "b": ["2001-01-01", 1], '
+            '"c": {"date": "2001-01-01"}}'
+        )
+
+        result = json.loads(json.dumps(nested, cls=FastRecordJSONEncoder))
+        self.assertEqual(result['record'], json.loads(json_record.json()))
+        self.assertEqual(result['frozen'], {'date': '2001-01-01'})
+        self.assertEqual(result['lst'], [{'datetime': '2001-01-01T01:01:01'}])
+
+        # unknown types still raise TypeError
+        self.assertRaises(
+            TypeError, FastRecordJSONEncoder().encode, set([1])
+        )
+
+    def test_hash_cached(self):
+        """Test hash is computed once and cached"""
+        rec = FieldRecord('service', 'test', a=1, b=2)
+        with mock.patch.object(
+                FrozenOrderedDict, '__hash__', return_value=42) as mock_hash:
+            self.assertEqual(hash(rec), 42)
+            self.assertEqual(hash(rec), 42)
+            self.assertEqual(mock_hash.call_count, 1)
+        self.assertEqual(rec._hash, 42)
+
+        # records with unhashable values can still be compared
+        rec1 = TstRecord('service', 'test', lst=[1, 2])
+        rec2 = TstRecord('service', 'other', lst=[1, 2])
+        self.assertRaises(TypeError, hash, rec1)
+        self.assertEqual(rec1, rec2)
+
+    def test_eq(self):
+        """Test comparing records"""
+        rec1 = FieldRecord('service', 'test', a=1, b=2)
+        rec2 = RequireAllFieldsRecord('other', 'test', a=1, b=2, c=None)
+        rec3 = FieldRecord('service', 'test', a=1, b=3)
+        self.assertEqual(rec1, rec2)
+        self.assertFalse(rec1 != rec2)
+        self.assertNotEqual(rec1, rec3)
+        self.assertEqual(len({rec1, rec2, rec3}), 2)
+
+        # short circuits on hash mismatch once hashes are known
+        hash(rec1)
+        hash(rec3)
+        with mock.patch.object(Record, '_as_dict') as mock_as_dict:
+            self.assertNotEqual(rec1, rec3)
+            self.assertFalse(mock_as_dict.called)
+
+        # still compares against dicts
+        self.assertEqual(rec1, {'a': 1, 'b': 2, 'c': None})
+        self.assertNotEqual(rec1, {'a': 1, 'b': 2})
+
+    def test_get_hash_index_key_cached(self):
+        """Test get_hash_index_key values and caching"""
+        rec = HashIndexSlotsRecord('service', 'test', a=1, b='b', c=3)
+        self.assertEqual(
+            rec.get_hash_index_key(), 'HashIndexSlotsRecord:test:test:a:1:b:b'
+        )
+        self.assertEqual(
+            HashIndexSlotsRecord._schema.hash_slot_fields, ('test',)
+        )
+        with mock.patch('dubplate.generate_hash_index_key') as mock_key:
+            self.assertEqual(
+                rec.get_hash_index_key(),
+                'HashIndexSlotsRecord:test:test:a:1:b:b'
+            )
+            self.assertFalse(mock_key.called)
+
+        # slot values are included for records with fields
+        class FieldSlotRecord(FieldRecord):
+            # pylint:disable=slots-on-old-class,too-few-public-methods
+            hash_index_fields = ('service', 'a')
+
+        rec = FieldSlotRecord('service', 'test', a=1, b=2)
+        self.assertEqual(
+            rec.get_hash_index_key(), 'FieldSlotRecord:service:service:a:1'
+        )
+
+        # None is cached too
+        rec = FieldRecord('service', 'test', a=0, b='')
+        self.assertIsNone(rec.get_hash_index_key())
+        self.assertIsNone(rec._hash_index_key)
+
+
+class GenerateHashIndexKeyTests(unittest.TestCase):
+    """Test generate_hash_index_key(s)"""
+
+    def test_generate_hash_index_key(self):
+        self.assertEqual(
+            generate_hash_index_key(
+                'Obj', ('a', 'b', 'c'), {'a': 'x', 'b': 0, 'c': (1, 2)}, 3
+            ),
+            'Obj:3:a:x:c:(1, 2)'
+        )
+        self.assertIsNone(generate_hash_index_key('Obj', ('a',), {'b': 1}))
+        self.assertIsNone(generate_hash_index_key('Obj', (), {'a': 1}))
+        with self.assertRaises(ValueError) as conm:
+            generate_hash_index_key('Obj', ('a',), {'a': {1: 2}})
+        self.assertEqual(
+            str(conm.exception),
+            "Fields that return unordered value types cannot be used "
+            "to create hash keys. field: a"
+        )
+
+    def test_generate_hash_index_keys(self):
+        fields = ('a', 'b', '{c}')
+        rows = [
+            {'a': 'x', 'b': 1, '{c}': [1]}, {'a': None, 'b': 2}, {'d': 1},
+            {}
+        ]
+        expected = [
+            generate_hash_index_key('Obj', fields, row) for row in rows
+        ]
+        self.assertEqual(
+            expected, ['Obj:a:x:b:1:{c}:[1]', 'Obj:b:2', None, None]
+        )
+        self.assertEqual(
+            generate_hash_index_keys('Obj', fields, rows), expected
+        )
+        self.assertEqual(
+            generate_hash_index_keys('Obj', fields, iter(rows)), expected
+        )
+
+        # columnar
+        columns = {'a': ['x', None, None, None], 'b': [1, 2, None, None]}
+        self.assertEqual(
+            generate_hash_index_keys('Obj', ('a', 'b'), columns),
+            ['Obj:a:x:b:1', 'Obj:b:2', None, None]
+        )
+
+        # ids
+        self.assertEqual(
+            generate_hash_index_keys(
+                'Obj', ('a', 'b'), columns, obj_ids=[1, 2, 3, None]
+            ),
+            ['Obj:1:a:x:b:1', 'Obj:2:b:2', None, None]
+        )
+        self.assertRaises(
+            ValueError, generate_hash_index_keys, 'Obj', ('a',), rows, [1]
+        )
+        # columns of different lengths
+        self.assertRaises(
+            ValueError, generate_hash_index_keys, 'Obj', ('a', 'b'),
+            {'a': ['1', '2', '3'], 'b': ['x']}
+        )
+        self.assertEqual(
+            generate_hash_index_keys(
+                'Obj', ('a', 'b'), {'a': ['1', '2'], 'b': []}
+            ),
+            ['Obj:a:1', 'Obj:a:2']
+        )
+
+        # no fields
+        self.assertEqual(
+            generate_hash_index_keys('Obj', (), rows), [None] * 4
+        )
+
+        # unordered values
+        self.assertRaises(
+            ValueError, generate_hash_index_keys, 'Obj', ('a',),
+            [{'a': 1}, {'a': set([1])}]
+        )
+
+    def test_native_backend(self):
+        """Test record_backend = 'native'"""
+        # pylint:disable=protected-access
+        rec = NativeFieldRecord('service', 'test', c=3, a=1, b=2)
+        self.assertIsInstance(rec._as_dict(), ImmutableDict)
+        self.assertIsInstance(rec._as_dict(), dict)
+        self.assertEqual(list(rec.keys()), ['a', 'b', 'c'])
+        self.assertEqual(list(rec.values()), [1, 2, 3])
+        self.assertEqual(rec['b'], 2)
+        self.assertEqual(rec.get('d', 4), 4)
+
+        # equal and hashes the same as the default backend
+        default = FieldRecord('service', 'test', a=1, b=2, c=3)
+        self.assertEqual(rec, default)
+        self.assertEqual(hash(rec), hash(default))
+        self.assertEqual(rec.json(), default.json())
+
+        # validation still applies
+        self.assertRaises(KeyError, rec.copy_record, b=None)
+        copy = rec.copy_record(c=4)
+        self.assertIsInstance(copy, ImmutableDict)
+        self.assertEqual(copy, {'a': 1, 'b': 2, 'c': 4})
+
+        records = NativeFieldRecord.from_rows([(1, 2, 3)])
+        self.assertIsInstance(records[0]._as_dict(), ImmutableDict)
+
+        unordered = NativeRecord('service', 'test', x=1)
+        self.assertIsInstance(unordered._as_dict(), ImmutableDict)
+
+        # invalid backends are rejected when the class is created
+        with self.assertRaises(ValueError):
+            type('BadRecord', (Record,), {'record_backend': 'other'})
+
+
+class ImmutableDictTests(unittest.TestCase):
+    """Test ImmutableDict"""
+
+    def test_immutable(self):
+        idict = ImmutableDict([('b', 1), ('a', 2)])
+        self.assertEqual(list(idict), ['b', 'a'])
+        with self.assertRaises(TypeError) as conm:
+            idict['c'] = 3
+        self.assertEqual(
+            str(conm.exception),
+            "'ImmutableDict' object does not support item assignment"
+        )
+        with self.assertRaises(TypeError) as conm:
+            del idict['a']
+        self.assertEqual(
+            str(conm.exception),
+            "'ImmutableDict' object does not support item deletion"
+        )
+        for method, args in (
+                ('clear', ()), ('pop', ('a',)), ('popitem', ()),
+                ('setdefault', ('c', 3)), ('update', ({'c': 3},))):
+            self.assertRaises(TypeError, getattr(idict, method), *args)
+        self.assertEqual(idict, {'b': 1, 'a': 2})
+
+    def test_hash_and_copy(self):
+        idict = ImmutableDict(a=1, b=2)
+        self.assertEqual(hash(idict), hash(frozendict(a=1, b=2)))
+        self.assertEqual(idict.copy(b=3), {'a': 1, 'b': 3})
+        self.assertIsInstance(idict.copy(), ImmutableDict)
+        self.assertEqual(ImmutableDict.fromkeys('ab'), {'a': None, 'b': None})
+        self.assertEqual(pickle.loads(pickle.dumps(idict)), idict)
+        self.assertIsInstance(pickle.loads(pickle.dumps(idict)), ImmutableDict)
+
+
+class TupleBackendTests(unittest.TestCase):
+    """Test record_backend = 'tuple'"""
+
+    def test_tuple_backend(self):
+        # pylint:disable=protected-access
+        rec = TupleFieldRecord('service', 'test', c=3, a=1, b=2)
+        self.assertIsInstance(rec._Record__record, RecordTuple)
+        self.assertEqual(tuple.__len__(rec._Record__record), 3)
+        self.assertEqual(list(rec), ['a', 'b', 'c'])
+        self.assertEqual(list(rec.keys()), ['a', 'b', 'c'])
+        self.assertEqual(list(rec.values()), [1, 2, 3])
+        self.assertEqual(list(rec.items()), [('a', 1), ('b', 2), ('c', 3)])
+        self.assertEqual(len(rec), 3)
+        self.assertEqual(rec['b'], 2)
+        self.assertIn('c', rec)
+        self.assertNotIn('d', rec)
+        self.assertEqual(rec.get('c'), 3)
+        self.assertEqual(rec.get('d', 4), 4)
+        with self.assertRaises(KeyError) as conm:
+            # pylint:disable=pointless-statement
+            rec['d']
+        self.assertEqual(str(conm.exception), "'d'")
+
+        # equal and hashes the same as the default backend
+        default = FieldRecord('service', 'test', a=1, b=2, c=3)
+        self.assertEqual(rec, default)
+        self.assertEqual(default, rec)
+        self.assertEqual(hash(rec), hash(default))
+        self.assertEqual(rec, {'a': 1, 'b': 2, 'c': 3})
+        self.assertNotEqual(rec, {'a': 1, 'b': 2})
+        self.assertEqual(
+            rec, TupleFieldRecord('other', 'test', a=1, b=2, c=3)
+        )
+        self.assertNotEqual(
+            rec, TupleFieldRecord('service', 'test', a=1, b=2, c=4)
+        )
+        self.assertEqual(rec.json(), default.json())
+        self.assertEqual(
+            json.loads(RecordJSONEncoder().encode(rec)),
+            json.loads(default.json())
+        )
+
+        # validation still applies
+        self.assertRaises(KeyError, rec.copy_record, b=None)
+        self.assertRaises(KeyError, rec.copy_record, a=1, d=1)
+        copy = rec.copy_record(c=4)
+        self.assertIsInstance(copy, ImmutableDict)
+        self.assertEqual(copy, {'a': 1, 'b': 2, 'c': 4})
+        self.assertEqual(list(copy), ['a', 'b', 'c'])
+        self.assertEqual(
+            json.loads(json.dumps(copy)), {'a': 1, 'b': 2, 'c': 4}
+        )
+        self.assertEqual(hash(copy), hash(rec.copy_record(c=4)))
+
+        records = TupleFieldRecord.from_rows([(1, 2, 3), {'a': 1, 'b': 2}])
+        self.assertEqual(records[0], rec)
+        self.assertEqual(records[1], {'a': 1, 'b': 2, 'c': None})
+
+        # records without fields use ImmutableDict
+        class TupleRecord(TstRecord):
+            # pylint:disable=slots-on-old-class,too-few-public-methods
+            record_backend = 'tuple'
+
+        rec = TupleRecord('service', 'test', x=1)
+        self.assertIsInstance(rec._Record__record, ImmutableDict)
+
+    def test_record_tuple(self):
+        tuple_cls = RecordTuple.for_fields(('a', 'b'))
+        self.assertIs(RecordTuple.for_fields(['a', 'b']), tuple_cls)
+        rtuple = tuple_cls(b=2)
+        self.assertEqual(rtuple, {'a': None, 'b': 2})
+        self.assertEqual(tuple_cls._make((1, 2)), {'a': 1, 'b': 2})
+        self.assertRaises(KeyError, tuple_cls, c=1)
+        self.assertEqual(rtuple.copy(a=1), {'a': 1, 'b': 2})
+        self.assertEqual(pickle.loads(pickle.dumps(rtuple)), rtuple)
+        self.assertIs(type(pickle.loads(pickle.dumps(rtuple))), tuple_cls)
+        # keys() is a view, supporting set operations
+        self.assertEqual(rtuple.keys() & {'a', 'c'}, {'a'})
+        self.assertEqual(list(rtuple.keys()), ['a', 'b'])
+        self.assertIn('b', rtuple.keys())
+        self.assertEqual(len(rtuple.keys()), 2)
+        rec = TupleFieldRecord('service', 'test', a=1, b=2)
+        self.assertEqual(rec.keys() & {'a', 'x'}, {'a'})
+
+    def test_record_tuple_not_equal_to_tuple(self):
+        """Records using the tuple backend are not equal to tuples"""
+        for backend in ('frozendict', 'native', 'tuple'):
+            record_cls = type('BackendRecord', (FieldRecord,), {
+                '__slots__': (), 'record_backend': backend
+            })
+            rec = record_cls('service', 'test', a=1, b=2, c=3)
+            for other in ((1, 2, 3), [1, 2, 3], 'abc', 1, None):
+                self.assertFalse(rec == other)
+                self.assertTrue(rec != other)
+                self.assertFalse(rec.copy_record() == other)
+                self.assertTrue(rec.copy_record() != other)
+            self.assertEqual(rec, {'a': 1, 'b': 2, 'c': 3})
+
+
+class ReplaceTests(unittest.TestCase):
+    """Test Record.replace"""
+
+    def test_replace(self):
+        value = ('shared',)
+        for record_cls in (FieldRecord, NativeFieldRecord, TupleFieldRecord):
+            rec = record_cls('service', 'test', a=1, b=2, c=value)
+            hash(rec)
+            new = rec.replace(b=3)
+            self.assertIs(type(new), record_cls)
+            self.assertIs(
+                type(new._Record__record), type(rec._Record__record)
+            )
+            self.assertEqual(new, {'a': 1, 'b': 3, 'c': ('shared',)})
+            self.assertEqual(list(new.keys()), ['a', 'b', 'c'])
+            self.assertIs(new['c'], value)
+            self.assertEqual(new.service, 'service')
+            self.assertEqual(new.test, 'test')
+            self.assertEqual(new.require_all_fields, False)
+            self.assertNotEqual(new, rec)
+            self.assertEqual(rec, {'a': 1, 'b': 2, 'c': ('shared',)})
+            self.assertNotEqual(hash(new), hash(rec))
+            with self.assertRaises(TypeError):
+                new.test = 1
+
+            # only changes are validated
+            with self.assertRaises(KeyError) as conm:
+                rec.replace(d=1, b=3)
+            self.assertEqual(
+                str(conm.exception),
+                "'Extra keys: d. "
+                "Only the following keys can be used in the record: a, b, c'"
+            )
+            with self.assertRaises(KeyError) as conm:
+                rec.replace(b=None, a=None)
+            self.assertEqual(
+                str(conm.exception),
+                "'The following fields can not be None: a, b'"
+            )
+            self.assertEqual(rec.replace(), rec)
+
+    def test_replace_no_fields(self):
+        rec = RequiredFieldRecord('service', 'test', a=1, b=2)
+        new = rec.replace(c=3)
+        self.assertEqual(new, {'a': 1, 'b': 2, 'c': 3})
+        self.assertIsInstance(new._Record__record, frozendict)
+        self.assertRaises(KeyError, rec.replace, a=None)
+
+    def test_replace_attributes(self):
+        class DictRecord(Record):
+            # pylint:disable=too-few-public-methods
+            require_all_fields = False
+
+            def __init__(self, meta, **kwargs):
+                self.meta = meta
+                super(DictRecord, self).__init__(**kwargs)
+
+        rec = DictRecord('meta', a=1)
+        new = rec.replace(a=2)
+        self.assertEqual(new.meta, 'meta')
+        self.assertEqual(new['a'], 2)
+
+        # unset slots are left unset
+        rec = TstRecord.from_rows([{'a': 1}], attrs={'service': 'service'})[0]
+        new = rec.replace(a=2)
+        self.assertEqual(new.service, 'service')
+        self.assertFalse(hasattr(new, 'test'))
+
+
+class DiffTests(unittest.TestCase):
+    """Test Record.diff and RecordPatch"""
+
+    def test_diff(self):
+        for record_cls in (FieldRecord, NativeFieldRecord, TupleFieldRecord):
+            old = record_cls('service', 'test', a=1, b=2, c=3)
+            new = record_cls('other', 'test', a=1, b=4, c=None)
+            patch = old.diff(new)
+            self.assertIsInstance(patch, RecordPatch)
+            self.assertEqual(patch.changes, {'b': 4, 'c': None})
+            self.assertEqual(patch.removed, ())
+            self.assertEqual(len(patch), 2)
+            self.assertTrue(patch)
+            patched = patch.apply(old)
+            self.assertIs(type(patched), record_cls)
+            self.assertEqual(patched, new)
+            # attributes are not part of the diff
+            self.assertEqual(patched.service, 'service')
+
+            # no changes
+            same = record_cls('other', 'test', a=1, b=2, c=3)
+            hash(old)
+            hash(same)
+            self.assertFalse(old.diff(same))
+            self.assertFalse(old.diff(old))
+            self.assertEqual(old.diff(same), RecordPatch())
+            self.assertEqual(len(old.diff(same)), 0)
+            self.assertFalse(patch.apply(old).diff(new))
+
+            # hashes differ
+            hash(new)
+            self.assertEqual(old.diff(new), patch)
+
+    def test_diff_mapping(self):
+        old = FieldRecord('service', 'test', a=1, b=2, c=3)
+        # missing fields are None
+        patch = old.diff({'a': 1, 'b': 2})
+        self.assertEqual(patch.changes, {'c': None})
+        self.assertEqual(patch.removed, ())
+
+        # records of another type
+        other = TupleFieldRecord('service', 'test', a=1, b=5, c=3)
+        self.assertEqual(old.diff(other).changes, {'b': 5})
+        self.assertEqual(other.diff(old).changes, {'b': 2})
+
+        # extra keys are included but fail validation when applied
+        patch = old.diff({'a': 1, 'b': 2, 'c': 3, 'd': 4})
+        self.assertEqual(patch.changes, {'d': 4})
+        self.assertRaises(KeyError, patch.apply, old)
+
+    def test_diff_no_fields(self):
+        old = RequiredFieldRecord('service', 'test', a=1, b=2, c=3)
+        new = RequiredFieldRecord('service', 'test', a=1, b=2, d=4)
+        patch = old.diff(new)
+        self.assertEqual(patch.changes, {'d': 4})
+        self.assertEqual(patch.removed, ('c',))
+        self.assertEqual(len(patch), 2)
+        patched = patch.apply(old)
+        self.assertEqual(patched, new)
+        self.assertEqual(patched.service, 'service')
+        self.assertNotEqual(patch, RecordPatch({'d': 4}))
+
+        # changes are validated
+        patch = RecordPatch(removed=['b'])
+        self.assertRaises(KeyError, patch.apply, old)
+
+
+class DictRecord(Record):
+    # pylint:disable=too-few-public-methods
+    require_all_fields = False
+
+    def __init__(self, meta, **kwargs):
+        self.meta = meta
+        super(DictRecord, self).__init__(**kwargs)
+
+
+class PickleTests(unittest.TestCase):
+    """Test pickling records"""
+
+    def assert_round_trip(self, record):
+        """Assert record is the same after pickling"""
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            new = pickle.loads(pickle.dumps(record, protocol))
+            self.assertIs(type(new), type(record))
+            self.assertEqual(new, record)
+            self.assertEqual(list(new.keys()), list(record.keys()))
+            self.assertIs(
+                type(new._Record__record), type(record._Record__record)
+            )
+            self.assertEqual(hash(new), hash(record))
+            self.assertEqual(new.require_all_fields, record.require_all_fields)
+            with self.assertRaises(TypeError):
+                new.test = 'other'
+        return new
+
+    def test_pickle(self):
+        for record_cls in (FieldRecord, NativeFieldRecord, TupleFieldRecord,
+                           RequiredFieldRecord, NativeRecord):
+            record = record_cls(
+                'service', 'test', a=1, b=datetime.date(2001, 1, 1)
+            )
+            hash(record)
+            new = self.assert_round_trip(record)
+            self.assertEqual(new.service, 'service')
+            self.assertEqual(new.test, 'test')
+
+    def test_pickle_attributes(self):
+        # unset slots are left unset
+        record = FieldRecord.from_rows([(1, 2, 3)], attrs={'test': 'test'})[0]
+        new = self.assert_round_trip(record)
+        self.assertFalse(hasattr(new, 'service'))
+
+        # fields set on the instance
+        record = TstRecord.from_dict({'b': 1, 'a': 2}, fields=('b', 'a'))
+        new = self.assert_round_trip(record)
+        self.assertEqual(new.fields, ('b', 'a'))
+
+        # attributes in __dict__
+        new = self.assert_round_trip(DictRecord('meta', a=1))
+        self.assertEqual(new.meta, 'meta')
+
+    def test_copy(self):
+        record = FieldRecord('service', 'test', a=1, b=[2])
+        new = copy.copy(record)
+        self.assertEqual(new, record)
+        self.assertIs(new['b'], record['b'])
+        new = copy.deepcopy(record)
+        self.assertEqual(new, record)
+        self.assertIsNot(new['b'], record['b'])
+
+
+class InternFieldRecord(FieldRecord):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    intern_fields = ('b', 'c')
+
+
+class InternTests(unittest.TestCase):
+    """Test InternPool and intern_fields"""
+
+    def setUp(self):
+        INTERN_POOL.clear()
+
+    def tearDown(self):
+        INTERN_POOL.clear()
+
+    def test_intern_pool(self):
+        pool = InternPool(maxsize=2)
+        value = u''.join([u'Port', u'land'])
+        self.assertIs(pool.intern(value), value)
+        self.assertIs(pool.intern(u''.join([u'Port', u'land'])), value)
+        self.assertEqual(pool.hits, 1)
+        self.assertEqual(pool.misses, 1)
+        self.assertEqual(pool.hit_rate, 0.5)
+        # pooled by type
+        self.assertIs(pool.intern(1), 1)
+        self.assertIs(pool.intern(True), True)
+        self.assertEqual(len(pool), 2)
+        # full
+        other = u''.join([u'Sal', u'em'])
+        self.assertIs(pool.intern(other), other)
+        self.assertIsNot(pool.intern(u''.join([u'Sal', u'em'])), other)
+        # unhashable and None values are ignored
+        value = [1]
+        self.assertIs(pool.intern(value), value)
+        self.assertIs(pool.intern(None), None)
+        self.assertEqual(
+            pool.stats(),
+            {'size': 2, 'maxsize': 2, 'hits': 1, 'misses': 5,
+             'hit_rate': 1.0 / 6}
+        )
+        pool.clear()
+        self.assertEqual(len(pool), 0)
+        self.assertEqual(pool.hit_rate, 0.0)
+
+    def test_intern_fields(self):
+        def value():
+            return u''.join([u'Port', u'land'])
+
+        for backend in ('frozendict', 'native', 'tuple'):
+            record_cls = type('Record', (InternFieldRecord,), {
+                '__slots__': (), 'record_backend': backend
+            })
+            first = record_cls('service', 'test', a=value(), b=value())
+            second = record_cls('service', 'test', a=value(), b=value())
+            self.assertIs(first['b'], second['b'])
+            self.assertIsNot(first['a'], second['a'])
+            row = record_cls.from_rows([(value(), value(), value())])[0]
+            self.assertIs(row['b'], first['b'])
+            self.assertIs(row['c'], first['b'])
+            new = first.replace(c=value())
+            self.assertIs(new['c'], first['b'])
+            self.assertEqual(new, {'a': value(), 'b': value(), 'c': value()})
+        self.assertGreater(INTERN_POOL.hits, 0)
+
+    def test_intern_no_fields(self):
+        class NoFieldsRecord(TstRecord):
+            # pylint:disable=slots-on-old-class,too-few-public-methods
+            intern_fields = ('a',)
+
+        first = NoFieldsRecord('service', 'test', a=u''.join([u'a', u'b']))
+        second = NoFieldsRecord('service', 'test', a=u''.join([u'a', u'b']))
+        self.assertIs(first['a'], second['a'])
+        self.assertEqual(second, {'a': u'ab'})
+
+
+class CachedRecord(FieldRecord):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    record_cache = RecordCache(maxsize=2)
+
+
+class UncachedRecord(CachedRecord):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    record_cache = None
+
+
+class RecordCacheTests(unittest.TestCase):
+    """Test RecordCache"""
+
+    def setUp(self):
+        CachedRecord.record_cache.clear()
+
+    def test_opt_out(self):
+        """Subclasses can set record_cache = None"""
+        first = UncachedRecord('service', 'test', a=1, b=2)
+        second = UncachedRecord('service', 'test', a=1, b=2)
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        self.assertIs(type(UncachedRecord), type(FieldRecord))
+        self.assertIsNot(type(CachedRecord), type(FieldRecord))
+
+    def test_custom_metaclass(self):
+        """Custom metaclasses are kept when a class has a record_cache"""
+        class CustomMeta(type(Record)):
+            # pylint:disable=too-few-public-methods
+            def describe(cls):
+                """Custom metaclass method"""
+                return 'custom ' + cls.__name__
+
+        cached_cls = CustomMeta('Custom', (FieldRecord,), {
+            '__slots__': (), 'record_cache': RecordCache()
+        })
+        self.assertIsInstance(cached_cls, CustomMeta)
+        self.assertEqual(cached_cls.describe(), 'custom Custom')
+        first = cached_cls('service', 'test', a=1, b=2)
+        self.assertIs(cached_cls('service', 'test', a=1, b=2), first)
+        other_cls = CustomMeta('Other', (FieldRecord,), {
+            '__slots__': (), 'record_cache': RecordCache()
+        })
+        self.assertIs(type(other_cls), type(cached_cls))
+
+        # opting out returns to the custom metaclass
+        uncached_cls = type(cached_cls)('Uncached', (cached_cls,), {
+            '__slots__': (), 'record_cache': None
+        })
+        self.assertIs(type(uncached_cls), CustomMeta)
+        self.assertEqual(uncached_cls.describe(), 'custom Uncached')
+        self.assertIsNot(
+            uncached_cls('service', 'test', a=1, b=2),
+            uncached_cls('service', 'test', a=1, b=2)
+        )
+
+    def test_record_cache(self):
+        cache = CachedRecord.record_cache
+        first = CachedRecord('service', 'test', a=1, b=2)
+        self.assertIs(CachedRecord('service', 'test', a=1, b=2), first)
+        self.assertIs(CachedRecord('service', 'test', a=1, b=2, c=None), first)
+        # attributes must match
+        other = CachedRecord('other', 'test', a=1, b=2)
+        self.assertIsNot(other, first)
+        self.assertEqual(other, first)
+        self.assertEqual(cache.stats(), {
+            'size': 2, 'maxsize': 2, 'hits': 2, 'misses': 2, 'evictions': 0
+        })
+        # least recently used is evicted
+        self.assertIs(CachedRecord('service', 'test', a=1, b=2), first)
+        CachedRecord('service', 'test', a=3, b=4)
+        self.assertEqual(cache.evictions, 1)
+        self.assertIs(CachedRecord('service', 'test', a=1, b=2), first)
+        self.assertIsNot(CachedRecord('other', 'test', a=1, b=2), other)
+        self.assertEqual(len(cache), 2)
+
+        # validation still applies
+        self.assertRaises(KeyError, CachedRecord, 'service', 'test', a=1)
+
+        # unhashable records are not cached
+        unhashable = CachedRecord('service', 'test', a=1, b=[2])
+        self.assertIsNot(CachedRecord('service', 'test', a=1, b=[2]),
+                         unhashable)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.hits, 0)
+
+    def test_subclass(self):
+        class SubRecord(CachedRecord):
+            # pylint:disable=slots-on-old-class,too-few-public-methods
+            pass
+
+        first = CachedRecord('service', 'test', a=1, b=2)
+        sub = SubRecord('service', 'test', a=1, b=2)
+        self.assertIsNot(sub, first)
+        self.assertIs(type(sub), SubRecord)
+        self.assertIs(SubRecord('service', 'test', a=1, b=2), sub)
+
+    def test_canonical(self):
+        records = CachedRecord.from_rows(
+            [(1, 2, 3), (1, 2, 3)], attrs={'service': 's', 'test': 't'}
+        )
+        self.assertIsNot(records[0], records[1])
+        cache = CachedRecord.record_cache
+        canonical = [cache.canonical(record) for record in records]
+        self.assertIs(canonical[0], records[0])
+        self.assertIs(canonical[1], records[0])
+        self.assertIs(CachedRecord('s', 't', a=1, b=2, c=3), records[0])
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+copyright (c) 2016-2017 Earth Advantage. All rights reserved.
+..codeauthor::Paul Munday <paul@paulmunday.net>
+
+Unit tests for dubplate.parallel.
+"""
+# Imports from Standard Library
+import multiprocessing
+import os
+import unittest
+
+# Imports from Third Party Modules
+
+# Local Imports
+from dubplate import Record
+from dubplate.parallel import map_records
+
+
+class TstRecord(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    __slots__ = ['service']
+    fields = ('a', 'b')
+    non_null_fields = ('a',)
+    record_backend = 'tuple'
+
+    def __init__(self, service, *args, **kwargs):
+        self.service = service
+        super(TstRecord, self).__init__(*args, **kwargs)
+
+
+def double(record):
+    """Return a new record with b doubled, and the pid of the process"""
+    return record.replace(b=record['b'] * 2), os.getpid()
+
+
+class MapRecordsTests(unittest.TestCase):
+    """Test map_records"""
+
+    def setUp(self):
+        self.records = [
+            TstRecord('service', a=idx, b=idx) for idx in range(50)
+        ]
+        self.expected = [
+            {'a': idx, 'b': idx * 2} for idx in range(50)
+        ]
+
+    def assert_results(self, results):
+        """Check results are in order and attributes are preserved"""
+        records = [record for record, _ in results]
+        self.assertEqual(records, self.expected)
+        for record in records:
+            self.assertIsInstance(record, TstRecord)
+            self.assertEqual(record.service, 'service')
+        return set(pid for _, pid in results)
+
+    def test_in_process(self):
+        # too few records
+        pids = self.assert_results(map_records(double, self.records))
+        self.assertEqual(pids, set([os.getpid()]))
+        # one worker
+        pids = self.assert_results(
+            map_records(double, self.records, workers=1, min_records=0)
+        )
+        self.assertEqual(pids, set([os.getpid()]))
+        self.assertEqual(map_records(double, []), [])
+        # func does not need to be picklable
+        self.assertEqual(
+            map_records(lambda record: record['a'], iter(self.records)),
+            list(range(50))
+        )
+
+    def test_workers(self):
+        pids = self.assert_results(
+            map_records(
+                double, self.records, workers=2, chunksize=7, min_records=0
+            )
+        )
+        self.assertNotIn(os.getpid(), pids)
+
+    def test_pool(self):
+        pool = multiprocessing.Pool(2)
+        try:
+            for chunksize in (None, 1, 100):
+                pids = self.assert_results(
+                    map_records(
+                        double, self.records, chunksize=chunksize,
+                        min_records=0, pool=pool
+                    )
+                )
+                self.assertNotIn(os.getpid(), pids)
+        finally:
+            pool.close()
+            pool.join()
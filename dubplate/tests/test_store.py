@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+copyright (c) 2016-2017 Earth Advantage. All rights reserved.
+..codeauthor::Paul Munday <paul@paulmunday.net>
+
+Unit tests for dubplate.store.
+"""
+# Imports from Standard Library
+import datetime
+import decimal
+import os
+import shutil
+import tempfile
+import unittest
+
+# Imports from Third Party Modules
+
+# Local Imports
+from dubplate import Record
+from dubplate.store import RecordStore, write_store
+
+
+class TstRecord(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    __slots__ = ['service']
+    fields = ('a', 'b', 'c')
+    non_null_fields = ('a',)
+    record_backend = 'tuple'
+
+    def __init__(self, service, *args, **kwargs):
+        self.service = service
+        super(TstRecord, self).__init__(*args, **kwargs)
+
+
+class OwnerRecord(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = ('name',)
+
+
+class TypedRecord(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    fields = ('a', 'owner')
+    field_types = {'owner': OwnerRecord}
+
+
+class RecordStoreTests(unittest.TestCase):
+    """Test RecordStore and write_store"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'records.dub')
+        self.records = [
+            TstRecord(
+                'service', a=idx, b=u'b' * idx,
+                c=datetime.date(2017, 1, 1) + datetime.timedelta(idx)
+            )
+            for idx in range(100)
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_store(self):
+        self.assertEqual(write_store(self.records, self.path), 100)
+        with RecordStore(TstRecord, self.path, {'service': 'api'}) as store:
+            self.assertEqual(len(store), 100)
+            self.assertEqual(store.fields, ('a', 'b', 'c'))
+            self.assertEqual(store[0], self.records[0])
+            self.assertEqual(store[57], self.records[57])
+            self.assertEqual(store[-1], self.records[-1])
+            self.assertIsInstance(store[3], TstRecord)
+            self.assertEqual(store[3].service, 'api')
+            self.assertEqual(store[10:20:3], self.records[10:20:3])
+            self.assertEqual(list(store), self.records)
+            self.assertRaises(IndexError, store.__getitem__, 100)
+            self.assertRaises(IndexError, store.__getitem__, -101)
+
+    def test_field_types(self):
+        record = TypedRecord(a=1, owner=OwnerRecord(name=u'Acme'))
+        write_store([record], self.path)
+        with RecordStore(TypedRecord, self.path) as store:
+            self.assertIsInstance(store[0]['owner'], OwnerRecord)
+            self.assertIsInstance(list(store)[0]['owner'], OwnerRecord)
+            self.assertEqual(store[0], record)
+        record = TypedRecord(a=decimal.Decimal('2.50'))
+        write_store([record], self.path)
+        with RecordStore(TypedRecord, self.path) as store:
+            self.assertEqual(store[0], record)
+            self.assertEqual(str(store[0]['a']), '2.50')
+
+    def test_empty(self):
+        self.assertEqual(write_store([], self.path), 0)
+        with RecordStore(TstRecord, self.path) as store:
+            self.assertEqual(len(store), 0)
+            self.assertEqual(list(store), [])
+
+    def test_fields(self):
+        write_store(self.records, self.path, fields=('b', 'a'))
+        with RecordStore(TstRecord, self.path) as store:
+            self.assertEqual(store.fields, ('b', 'a'))
+            self.assertEqual(store[5], {'a': 5, 'b': u'bbbbb', 'c': None})
+
+    def test_invalid(self):
+        with open(self.path, 'wb') as fileobj:
+            fileobj.write(b'not a record store file')
+        self.assertRaises(ValueError, RecordStore, TstRecord, self.path)
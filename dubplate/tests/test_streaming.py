@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# encoding: utf-8
+"""
+copyright (c) 2016-2017 Earth Advantage. All rights reserved.
+..codeauthor::Paul Munday <paul@paulmunday.net>
+
+Unit tests for dubplate.streaming.
+"""
+# Imports from Standard Library
+import datetime
+import gzip
+import json
+import unittest
+
+# Imports from Third Party Modules
+from six import BytesIO, StringIO
+
+# Local Imports
+from dubplate import Record
+from dubplate.streaming import RecordReader, dump_records, load_records
+
+# Constants
+JSONL = u"""{"a": 1, "b": 2, "c": 3}
+{"a": 4, "b": null}
+
+{"a": 5, "b": 6, "d": 7, "c": 8}
+not json
+{"a": 9, "b": 10}
+"""
+
+CSV = u"""a,b,c
+1,2,3
+4,,6
+7,8,
+"""
+
+
+class TstRecord(Record):
+    # pylint:disable=slots-on-old-class,too-few-public-methods
+    __slots__ = ['service']
+    fields = ('a', 'b', 'c')
+    non_null_fields = ('a', 'b')
+
+    def __init__(self, service, *args, **kwargs):
+        self.service = service
+        super(TstRecord, self).__init__(*args, **kwargs)
+
+
+class RecordReaderTests(unittest.TestCase):
+    """Test RecordReader"""
+
+    def test_raise(self):
+        reader = load_records(TstRecord, StringIO(JSONL))
+        self.assertIsInstance(reader, RecordReader)
+        records = iter(reader)
+        record = next(records)
+        self.assertIsInstance(record, TstRecord)
+        self.assertEqual(record, {'a': 1, 'b': 2, 'c': 3})
+        with self.assertRaises(KeyError) as conm:
+            next(records)
+        self.assertEqual(
+            str(conm.exception), "'The following field can not be None: b'"
+        )
+
+    def test_skip(self):
+        reader = load_records(
+            TstRecord, StringIO(JSONL), attrs={'service': 'api'},
+            errors='skip'
+        )
+        records = list(reader)
+        self.assertEqual(
+            records, [{'a': 1, 'b': 2, 'c': 3}, {'a': 9, 'b': 10, 'c': None}]
+        )
+        self.assertEqual(records[0].service, 'api')
+        self.assertEqual(reader.errors, {})
+
+    def test_collect(self):
+        reader = load_records(TstRecord, StringIO(JSONL), errors='collect')
+        records = list(reader)
+        self.assertEqual(len(records), 2)
+        self.assertEqual(sorted(reader.errors), [2, 4, 5])
+        self.assertIsInstance(reader.errors[2], KeyError)
+        self.assertIsInstance(reader.errors[4], KeyError)
+        self.assertIsInstance(reader.errors[5], ValueError)
+
+    def test_csv(self):
+        reader = load_records(
+            TstRecord, StringIO(CSV), fmt='csv', errors='collect'
+        )
+        records = list(reader)
+        self.assertEqual(
+            records,
+            [{'a': '1', 'b': '2', 'c': '3'}, {'a': '7', 'b': '8', 'c': None}]
+        )
+        self.assertEqual(list(reader.errors), [3])
+
+        # fieldnames can be supplied for files without a header
+        reader = load_records(
+            TstRecord, StringIO(u"1,2,3\n"), fmt='csv',
+            fieldnames=TstRecord.fields
+        )
+        self.assertEqual(list(reader), [{'a': '1', 'b': '2', 'c': '3'}])
+
+    def test_csv_row_length(self):
+        csv_data = u"a,b,c\n1,2,3,4\n5,6\n7\n8,9,10\n"
+        for policy in ('skip', 'collect'):
+            reader = load_records(
+                TstRecord, StringIO(csv_data), fmt='csv', errors=policy
+            )
+            records = list(reader)
+            self.assertEqual(
+                records, [
+                    {'a': '5', 'b': '6', 'c': None},
+                    {'a': '8', 'b': '9', 'c': '10'}
+                ]
+            )
+        self.assertEqual(sorted(reader.errors), [2, 4])
+        self.assertIsInstance(reader.errors[2], ValueError)
+        self.assertIsInstance(reader.errors[4], KeyError)
+        reader = load_records(TstRecord, StringIO(csv_data), fmt='csv')
+        self.assertRaises(ValueError, list, reader)
+
+    def test_invalid_options(self):
+        self.assertRaises(
+            ValueError, RecordReader, TstRecord, StringIO(JSONL), fmt='xml'
+        )
+        self.assertRaises(
+            ValueError, RecordReader, TstRecord, StringIO(JSONL),
+            errors='ignore'
+        )
+
+
+class DumpRecordsTests(unittest.TestCase):
+    """Test dump_records"""
+
+    def setUp(self):
+        self.records = [
+            TstRecord('api', a=idx, b=datetime.date(2001, 1, idx), c=None)
+            for idx in range(1, 6)
+        ]
+        self.expected = [
+            {'a': idx, 'b': '2001-01-0{}'.format(idx), 'c': None}
+            for idx in range(1, 6)
+        ]
+
+    def test_jsonl(self):
+        for chunk_size in (1, 2, 5, 10):
+            fileobj = StringIO()
+            count = dump_records(
+                self.records, fileobj, chunk_size=chunk_size
+            )
+            self.assertEqual(count, 5)
+            lines = fileobj.getvalue().splitlines()
+            self.assertEqual(
+                [json.loads(line) for line in lines], self.expected
+            )
+
+        # output can be read back
+        fileobj = StringIO()
+        dump_records(self.records[:1], fileobj)
+        fileobj.seek(0)
+        self.assertEqual(
+            list(load_records(TstRecord, fileobj)),
+            [{'a': 1, 'b': '2001-01-01', 'c': None}]
+        )
+
+    def test_array(self):
+        for chunk_size in (1, 2, 5, 10):
+            fileobj = StringIO()
+            dump_records(
+                self.records, fileobj, fmt='array', chunk_size=chunk_size
+            )
+            self.assertEqual(json.loads(fileobj.getvalue()), self.expected)
+
+        fileobj = StringIO()
+        self.assertEqual(dump_records([], fileobj, fmt='array'), 0)
+        self.assertEqual(fileobj.getvalue(), '[]')
+
+    def test_nested(self):
+        nested = TstRecord('api', a=1, b=self.records[0])
+        fileobj = StringIO()
+        dump_records([nested], fileobj)
+        self.assertEqual(
+            json.loads(fileobj.getvalue()),
+            {'a': 1, 'b': self.expected[0], 'c': None}
+        )
+
+    def test_compress(self):
+        fileobj = BytesIO()
+        dump_records(self.records, fileobj, fmt='array', compress=True)
+        fileobj.seek(0)
+        data = gzip.GzipFile(fileobj=fileobj).read().decode('utf-8')
+        self.assertEqual(json.loads(data), self.expected)
+
+    def test_invalid_fmt(self):
+        self.assertRaises(
+            ValueError, dump_records, self.records, StringIO(), fmt='csv'
+        )